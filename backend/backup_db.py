@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Online backup / restore of the backend database.
+
+SQLite is copied with the online backup API in small page batches, so
+requests keep writing while the backup runs; PostgreSQL is streamed
+table by table with COPY inside one REPEATABLE READ snapshot.
+
+Usage:
+  python backup_db.py backup [--out PATH.gz] [--no-compress] [--pages N] [--sleep S]
+  python backup_db.py restore PATH [--yes]
+
+Files ending in ``.gz`` are (de)compressed transparently. The target is
+the database in $DATABASE_URL (default: sqlite:///app.db).
+"""
+import argparse
+import sys
+
+from database import engine
+from utils import backup
+
+
+def cmd_backup(args) -> None:
+    result = backup.create_backup(
+        engine,
+        args.out,
+        compress=not args.no_compress,
+        pages=args.pages,
+        sleep=args.sleep,
+    )
+    print(f"💾 Backup written: {result.path} ({result.bytes} bytes, {result.seconds}s)")
+
+
+def cmd_restore(args) -> None:
+    if not args.yes:
+        answer = input(f"{engine.url.render_as_string(hide_password=True)} を {args.path} で上書きします。続けますか? [y/N] ")
+        if answer.strip().lower() != "y":
+            print("中止しました")
+            sys.exit(1)
+    seconds = backup.restore_backup(engine, args.path)
+    print(f"✅ Restored {args.path} in {seconds}s")
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    b = sub.add_parser("backup")
+    b.add_argument("--out", default=None, help="output path (default: BACKUP_DIR/app-<timestamp>...)")
+    b.add_argument("--no-compress", action="store_true")
+    b.add_argument("--pages", type=int, default=backup.BACKUP_PAGES_PER_STEP, help="SQLite pages copied per step")
+    b.add_argument("--sleep", type=float, default=backup.BACKUP_STEP_SLEEP, help="seconds to pause between SQLite steps")
+    b.set_defaults(func=cmd_backup)
+
+    r = sub.add_parser("restore")
+    r.add_argument("path")
+    r.add_argument("--yes", action="store_true", help="do not ask for confirmation")
+    r.set_defaults(func=cmd_restore)
+
+    args = parser.parse_args(argv)
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,15 +1,59 @@
 from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import StaticPool
 import os
 
 
 # DATABASE_URL environment variable is required.
 SQLALCHEMY_DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///app.db")
 # If DATABASE_URL is not set, use SQLite as fallback
+# 읽기 전용 복제본 (콤마 구분). 비어 있으면 모든 요청이 프라이머리로 감
+DATABASE_REPLICA_URLS = [url.strip() for url in os.getenv("DATABASE_REPLICA_URLS", "").split(",") if url.strip()]
+
+
+def _connect_args(url: str) -> dict:
+    if url.startswith("sqlite"):
+        return {"check_same_thread": False}
+    if url.startswith("postgresql"):
+        # 죽은 복제본에 붙으려다 요청이 오래 묶이지 않도록
+        return {"connect_timeout": 3}
+    return {}
+
+
+def _engine_args(url: str) -> dict:
+    # 인메모리 SQLite (테스트용 "sqlite://") 는 연결마다 DB 가 따로 생기므로 연결 하나를 모든 스레드가 공유
+    if url in ("sqlite://", "sqlite:///:memory:"):
+        return {"poolclass": StaticPool}
+    return {}
+
 
 connect_args = {"check_same_thread": False} if SQLALCHEMY_DATABASE_URL.startswith("sqlite") else {}
-engine = create_engine(SQLALCHEMY_DATABASE_URL, connect_args=connect_args)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+engine = create_engine(SQLALCHEMY_DATABASE_URL, connect_args=connect_args, **_engine_args(SQLALCHEMY_DATABASE_URL))
+replica_engines = [
+    create_engine(url, connect_args=_connect_args(url), pool_pre_ping=True) for url in DATABASE_REPLICA_URLS
+]
+
+
+class RoutingSession(Session):
+    """Session that reads from ``info["replica"]`` when one was assigned (see utils.replicas).
+
+    Anything that is not a plain SELECT goes to the primary, and once the
+    session has written it stays on the primary so the rest of the
+    request reads its own writes.
+    """
+
+    def get_bind(self, mapper=None, clause=None, **kw):
+        replica = self.info.get("replica")
+        if replica is None:
+            return super().get_bind(mapper=mapper, clause=clause, **kw)
+        if self._flushing or (clause is not None and not getattr(clause, "is_select", False)):
+            self.info["replica"] = None
+            self.info["wrote"] = True
+            return super().get_bind(mapper=mapper, clause=clause, **kw)
+        return replica
+
+
+SessionLocal = sessionmaker(class_=RoutingSession, autocommit=False, autoflush=False, bind=engine)
 
 
 def get_db():
@@ -17,4 +61,4 @@ def get_db():
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
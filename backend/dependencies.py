@@ -1,41 +1,18 @@
-from fastapi import Depends, HTTPException, status
-from fastapi.security import OAuth2PasswordBearer
+from fastapi import Depends, HTTPException, Request, status
 from sqlalchemy.orm import Session
-from database import SessionLocal
-from datetime import datetime
+from database import get_db  # noqa: F401  (기존 import 경로 호환)
+from models.role import ADMIN_ROLE, Role
 from models.user import User
-from models.role import Role
+from utils.security import get_current_user as _session_user
 
-oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
+def get_current_user(request: Request, db: Session = Depends(get_db)) -> User:
+    # 로그인은 세션 토큰(Authorization: Bearer 또는 쿠키) 기반 (utils.security)
+    return _session_user(request, db)
 
-oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
 
-def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
-    credentials_exception = HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="Invalid authentication credentials",
-        headers={"WWW-Authenticate": "Bearer"},
-    )
-    user = db.query(User).filter(User.token == token).first()
-    if not user:
-        raise credentials_exception
-    if user.token_expires and user.token_expires < datetime.utcnow():
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Token has expired",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
-    return user
-
-def get_admin_user(current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
-    role = db.query(Role).filter(Role.user_id == current_user.user_id).first()
-    if not role or role.admin_role != 1:
-        raise HTTPException(status_code=403, detail="Not enough permissions")
+def get_admin_user(current_user: User = Depends(get_current_user), db: Session = Depends(get_db)) -> User:
+    role = db.get(Role, current_user.id)
+    if not role or role.admin_role != ADMIN_ROLE:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="権限がありません")
     return current_user
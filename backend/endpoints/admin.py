@@ -0,0 +1,76 @@
+import hmac
+import os
+from datetime import timedelta
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, status
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from database import engine, get_db
+from dependencies import get_admin_user, get_current_user
+from models.analytics import DailyTaskStats
+from models.types import utcnow
+from schemas.analytics import AnalyticsOut, AnalyticsTotals, DailyStatsOut, ratio
+from utils.analytics import refresh_rollups
+from utils.backup import create_backup
+
+
+router = APIRouter(prefix="/admin", tags=["admin"])
+
+# 자동화(cron 등)용 관리자 API 토큰. 설정하면 X-Admin-Token 으로도 관리자 엔드포인트를 호출할 수 있음
+ADMIN_API_TOKEN = os.getenv("ADMIN_API_TOKEN")
+
+
+def require_admin(request: Request, db: Session = Depends(get_db), x_admin_token: Optional[str] = Header(None)) -> None:
+    """Admin-role users (roles.admin_role = 1), or callers presenting ADMIN_API_TOKEN."""
+    if x_admin_token is not None:
+        if ADMIN_API_TOKEN and hmac.compare_digest(x_admin_token, ADMIN_API_TOKEN):
+            return
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="権限がありません")
+    get_admin_user(get_current_user(request, db), db)
+
+
+@router.post("/backup", dependencies=[Depends(require_admin)])
+def backup_database(compress: bool = Query(True, description="gzip the backup file")):
+    """Take an online backup into BACKUP_DIR without blocking writers."""
+    try:
+        result = create_backup(engine, compress=compress)
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc))
+    print(f"💾 Backup written: {result.path} ({result.bytes} bytes, {result.seconds}s)")
+    return result.to_dict()
+
+
+@router.get("/analytics", response_model=AnalyticsOut, dependencies=[Depends(require_admin)])
+def analytics(
+    db: Session = Depends(get_db),
+    days: int = Query(30, ge=1, le=366, description="number of UTC days up to today"),
+):
+    """Cross-user daily activity, read from the daily_task_stats rollup (never from tasks)."""
+    today = utcnow().date()
+    # 워커가 아직 한 번도 돌지 않았으면 (기동 직후 등) 여기서 한 번 채움
+    if db.get(DailyTaskStats, today) is None:
+        refresh_rollups()
+    rows = db.scalars(
+        select(DailyTaskStats)
+        .where(DailyTaskStats.day > today - timedelta(days=days))
+        .order_by(DailyTaskStats.day)
+    ).all()
+
+    created = sum(row.tasks_created for row in rows)
+    completed = sum(row.tasks_completed for row in rows)
+    late = sum(row.completed_late for row in rows)
+    latest = next((row for row in reversed(rows) if row.open_tasks is not None), None)
+    return AnalyticsOut(
+        days=[DailyStatsOut.from_row(row) for row in rows],
+        totals=AnalyticsTotals(
+            tasks_created=created,
+            tasks_completed=completed,
+            completed_late=late,
+            completed_late_ratio=ratio(late, completed),
+            peak_active_users=max((row.active_users for row in rows), default=0),
+        ),
+        overdue_ratio=ratio(latest.overdue_open, latest.open_tasks) if latest else None,
+        refreshed_at=max((row.refreshed_at for row in rows), default=None),
+    )
@@ -0,0 +1,46 @@
+from fastapi import APIRouter, Request
+from fastapi.responses import Response
+from starlette.concurrency import run_in_threadpool
+
+from schemas.batch import BatchRequest
+from utils.batch import SHARED_SESSION_KEY, SHARED_USER_KEY, dispatch, encode_part
+from utils.replicas import open_read_session
+from utils.security import get_current_user
+
+
+router = APIRouter(tags=["batch"])
+
+
+def _begin(request: Request, db):
+    # PostgreSQL 은 문장마다 스냅샷이 바뀌므로 묶음 전체가 같은 시점을 보도록 격리 수준을 올림
+    if db.get_bind().dialect.name == "postgresql":
+        db.connection(execution_options={"isolation_level": "REPEATABLE READ"})
+    return get_current_user(request, db)
+
+
+@router.post("/batch")
+async def batch(payload: BatchRequest, request: Request):
+    """Run several read-only GETs in one round trip.
+
+    The session is looked up once and every sub-request shares one DB
+    session (one transaction, one snapshot). Sub-requests run in order,
+    never concurrently, because a Session is not thread-safe. Each entry
+    of ``responses`` carries the sub-request's own status, so one 404
+    does not fail the batch.
+    """
+    db = open_read_session(request)
+    try:
+        user = await run_in_threadpool(_begin, request, db)
+        shared = {SHARED_SESSION_KEY: db, SHARED_USER_KEY: user}
+        parts = []
+        for item in payload.requests:
+            try:
+                status, headers, body = await dispatch(request.app.router, request.scope, item.path, shared)
+            except Exception as exc:
+                print(f"❌ Batch sub-request {item.path} failed: {exc}")
+                await run_in_threadpool(db.rollback)
+                status, headers, body = 500, {}, b""
+            parts.append(encode_part(item.id, status, headers, body))
+    finally:
+        await run_in_threadpool(db.close)
+    return Response(b'{"responses":[' + b",".join(parts) + b"]}", media_type="application/json")
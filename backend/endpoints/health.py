@@ -0,0 +1,50 @@
+import anyio
+from fastapi import APIRouter
+from fastapi.responses import JSONResponse
+
+from database import engine
+from utils.health import DbProbe, pool_stats, readiness, threadpool_stats
+from utils.gates import gate_stats
+from utils.reminders import reminder_engine
+from utils.replicas import replica_pool
+from utils.singleflight import list_flight
+
+
+router = APIRouter(prefix="/health", tags=["health"])
+
+db_probe = DbProbe(engine)
+# 프로브 전용 스레드 한 개. 요청 처리용 스레드풀이 꽉 차도 그 뒤에 줄 서지 않음
+_probe_limiter = anyio.CapacityLimiter(1)
+
+
+@router.get("/live")
+async def live():
+    """The process is up and its event loop answers (no dependencies are touched)."""
+    return {"status": "alive"}
+
+
+@router.get("/ready")
+async def ready():
+    """503 while this worker cannot take more traffic: DB down/slow, pool or threadpool exhausted.
+
+    Gate usage is reported under ``checks`` for dashboards only.
+    """
+    database = await anyio.to_thread.run_sync(db_probe.check, limiter=_probe_limiter)
+    pool = pool_stats(engine)
+    threads = threadpool_stats()
+    gates = gate_stats()
+    reasons = readiness(database, pool, threads)
+    body = {
+        "status": "not_ready" if reasons else "ready",
+        "reasons": reasons,
+        "checks": {
+            "database": database,
+            "db_pool": pool,
+            "threadpool": threads,
+            "gates": gates,
+            "replicas": replica_pool.stats(),
+            "reminders": reminder_engine.stats(),
+            "list_coalescing": list_flight.stats(),
+        },
+    }
+    return JSONResponse(body, status_code=503 if reasons else 200)
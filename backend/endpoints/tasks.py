@@ -1,38 +1,46 @@
+import asyncio
+import json
+
 from fastapi import APIRouter, Depends, HTTPException, Query, status, Request, Response
-from sqlalchemy.orm import Session
+from fastapi.responses import StreamingResponse
+from pydantic import TypeAdapter
+from sqlalchemy import select, union_all, update
+from sqlalchemy.orm import Session, aliased, noload
+from sqlalchemy.orm.exc import StaleDataError
+from starlette.concurrency import run_in_threadpool
 from typing import List, Optional
+from itertools import groupby
 
 from database import get_db
-from models.task import Task
-from schemas.task import TaskCreate, TaskUpdate, TaskOut
+from models.activity import TaskActivity
+from models.task import Task, TaskStatus
+from models.task_archive import tasks_archive
+from models.types import as_utc, utcnow
+from schemas.task import TaskCreate, TaskUpdate, TaskMove, TaskOut, TaskTree, TaskHistory, TagCount, CalendarDay, CalendarOut
+from utils.activity import activity_log, field_changes, snapshot
+from utils.idempotency import idempotency_guard
+from utils.recurrence import MAX_OCCURRENCES, align_start, next_occurrence, occurrences, parse_rule
+from utils.reminders import reminder_engine, sse_sink
+from utils.replicas import get_read_db
 from utils.security import get_current_user_optional, SESSION_COOKIE_NAME
+from utils.singleflight import list_flight, task_generations
+from utils.subtasks import MAX_SUBTASK_DEPTH, ancestor_ids, subtree_height, subtree_query, with_progress
+from utils.tags import attach_tags, parse_tag_list, resolve_tags, tag_counts, tagged_task_ids
+from utils.task_rank import NeighborOrderError, rank_between, rebalance_user
 from models.user import User
+from dataclasses import replace
 from datetime import datetime
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 
 
 router = APIRouter(prefix="/tasks", tags=["tasks"])
 
-
-@router.get("/ping")
-def ping():
-    return {"ok": True}
+_task_list_adapter = TypeAdapter(List[TaskOut])
 
 
-@router.get("/", response_model=List[TaskOut])
-def list_tasks(
-    request: Request,
-    response: Response,
-    db: Session = Depends(get_db),
-    skip: int = 0,
-    limit: int = 50,
-    status_in: Optional[str] = Query(None, description="comma-separated statuses: todo,in_progress,done"),
-    q: Optional[str] = Query(None, description="search in title/description"),
-    sort: Optional[str] = Query(
-        None, description="created_desc|created_asc|due_desc|due_asc|priority_desc|priority_asc"
-    ),
-):
+def _current_user(request: Request, response: Response, db: Session) -> User:
     current_user, new_session_id = get_current_user_optional(request, db)
-    
+
     # Set session cookie if this is a new anonymous user
     if new_session_id:
         response.set_cookie(
@@ -44,134 +52,616 @@ def list_tasks(
             secure=False,
             path="/"
         )
-    query = db.query(Task).filter(Task.user_id == str(current_user.id))
-    if status_in:
-        statuses = [s.strip() for s in status_in.split(",") if s.strip()]
-        if statuses:
-            query = query.filter(Task.status.in_(statuses))
-    if q:
-        like = f"%{q}%"
-        query = query.filter((Task.title.ilike(like)) | (Task.description.ilike(like)))
+    return current_user
+
+
+def _with_archive():
+    """Task entity over ``tasks UNION ALL tasks_archive`` (same columns, disjoint ids)."""
+    columns = [column.name for column in Task.__table__.columns]
+    combined = union_all(
+        select(*[Task.__table__.c[name] for name in columns]),
+        select(*[tasks_archive.c[name] for name in columns]),
+    ).subquery("tasks_all")
+    return aliased(Task, combined)
 
+
+def _future_occurrences(task: Task, window_from: datetime, window_to: datetime, limit: int) -> List[TaskOut]:
+    """Virtual (not yet stored) occurrences of a recurring task after its current one."""
+    current = task.due_date
+    base = TaskOut.model_validate(task)
+    return [
+        base.model_copy(update={"due_date": due, "status": TaskStatus.todo.value, "is_occurrence": True})
+        for due in occurrences(parse_rule(task.recurrence), current, max(window_from, current), window_to, limit + 1)
+        if due > current
+    ][:limit]
+
+
+def _sort_items(items: List[TaskOut], sort: Optional[str]) -> None:
+    """In-memory equivalent of the ORDER BY used by list_tasks."""
     if sort == "created_asc":
-        query = query.order_by(Task.created_at.asc())
+        items.sort(key=lambda t: t.created_at)
     elif sort == "due_desc":
-        query = query.order_by(Task.due_date.desc().nullslast())
+        items.sort(key=lambda t: (t.due_date is None, -t.due_date.timestamp() if t.due_date else 0))
     elif sort == "due_asc":
-        query = query.order_by(Task.due_date.asc().nullsfirst())
+        items.sort(key=lambda t: (t.due_date is not None, t.due_date.timestamp() if t.due_date else 0))
     elif sort == "priority_desc":
-        query = query.order_by(Task.priority.desc())
+        items.sort(key=lambda t: -t.priority)
     elif sort == "priority_asc":
-        query = query.order_by(Task.priority.asc())
+        items.sort(key=lambda t: t.priority)
+    elif sort == "manual":
+        items.sort(key=lambda t: (t.rank is None, t.rank or ""))
     else:
-        query = query.order_by(Task.created_at.desc())
+        items.sort(key=lambda t: t.created_at, reverse=True)
+
+
+def _recurring_series(db: Session, user_id: str, before: datetime):
+    return db.query(Task).filter(
+        Task.user_id == user_id, Task.recurrence.isnot(None), Task.due_date < before
+    )
+
+
+def _align_recurrence(task: Task) -> None:
+    """Keep ``due_date`` on an actual occurrence of the task's rule."""
+    if not task.recurrence:
+        return
+    if task.due_date is None:
+        raise HTTPException(status_code=422, detail="繰り返しタスクには期限が必要です")
+    first = align_start(parse_rule(task.recurrence), task.due_date)
+    if first is None:
+        raise HTTPException(status_code=422, detail="繰り返しルールに該当する日付がありません")
+    task.due_date = first
+
+
+def _check_parent(db: Session, task: Task, user_id: str) -> None:
+    """Reject a ``parent_id`` that is missing, would create a cycle or nests too deep."""
+    if task.parent_id is None:
+        return
+    parent = db.query(Task.id).filter(Task.id == task.parent_id, Task.user_id == user_id).first()
+    if not parent:
+        raise HTTPException(status_code=422, detail="親タスクが見つかりません")
+    chain = ancestor_ids(db, task.parent_id)
+    if task.id is not None and task.id in chain:
+        raise HTTPException(status_code=422, detail="自分自身やサブタスクを親にはできません")
+    # 옮기는 태스크 아래에 달린 서브트리 높이까지 더해서 판단
+    height = subtree_height(db, task.id, user_id) if task.id is not None else 0
+    if len(chain) + height >= MAX_SUBTASK_DEPTH:
+        raise HTTPException(status_code=422, detail="サブタスクの階層が深すぎます")
+
+
+def _complete_occurrence(db: Session, task: Task) -> Optional[Task]:
+    """Store the finished occurrence as its own done task and move the series to the next one.
+
+    Returns the materialized task, or None when this was the last occurrence
+    (the series row itself then stays done).
+    """
+    rule = parse_rule(task.recurrence)
+    current = task.due_date
+    upcoming = next_occurrence(rule, current, current)
+    if upcoming is None:
+        return None
+    done = Task(
+        title=task.title,
+        description=task.description,
+        status=TaskStatus.done.value,
+        priority=task.priority,
+        due_date=current,
+        user_id=task.user_id,
+        parent_id=task.parent_id,
+        tags=list(task.tags),
+    )
+    db.add(done)
+    task.status = TaskStatus.todo.value
+    task.due_date = upcoming
+    if rule.count is not None:
+        # 시작 회차가 한 칸 뒤로 가므로 남은 횟수도 하나 줄임
+        task.recurrence = str(replace(rule, count=rule.count - 1))
+    return done
+
+
+def _created_changes(task: Task) -> dict:
+    changes = snapshot(task)
+    if task.tags:
+        changes["tags"] = [None, [tag.name for tag in task.tags]]
+    return changes
+
+
+def _reload_with_progress(db: Session, task_id: int) -> Task:
+    # refresh() 는 query_expression 을 기본값(0)으로 되돌리므로 진행도까지 다시 읽음
+    return with_progress(db.query(Task)).populate_existing().filter(Task.id == task_id).one()
+
+
+def _etag(version: int) -> str:
+    return f'"{version}"'
 
-    return query.offset(skip).limit(limit).all()
+
+def _parse_if_match(value: Optional[str]) -> Optional[int]:
+    """Accept ``"3"``, ``W/"3"`` or a bare ``3``; ``*`` means no precondition."""
+    if not value or value.strip() == "*":
+        return None
+    value = value.strip()
+    if value.startswith("W/"):
+        value = value[2:]
+    try:
+        return int(value.strip('"'))
+    except ValueError:
+        raise HTTPException(status_code=400, detail="If-Match must be a task version")
+
+
+def _version_conflict(current_version: Optional[int]) -> HTTPException:
+    headers = {"ETag": _etag(current_version)} if current_version is not None else None
+    return HTTPException(
+        status_code=status.HTTP_409_CONFLICT,
+        detail="タスクが他の画面で更新されました。再読み込みしてください",
+        headers=headers,
+    )
+
+
+@router.get("/ping")
+def ping():
+    return {"ok": True}
+
+
+@router.get("/", response_model=List[TaskOut])
+def list_tasks(
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_read_db),
+    skip: int = 0,
+    limit: int = 50,
+    status_in: Optional[str] = Query(None, description="comma-separated statuses: todo,in_progress,done"),
+    q: Optional[str] = Query(None, description="search in title/description"),
+    sort: Optional[str] = Query(
+        None, description="created_desc|created_asc|due_desc|due_asc|priority_desc|priority_asc|manual"
+    ),
+    due_from: Optional[datetime] = Query(
+        None, description="due_date >= due_from (naive = UTC); with due_to, expands recurring tasks"
+    ),
+    due_to: Optional[datetime] = Query(None, description="due_date < due_to (naive = UTC)"),
+    include_archived: bool = Query(False, description="also return archived (old done) tasks"),
+    tags: Optional[str] = Query(None, description="comma-separated tag names; tasks with any of them"),
+    tags_all: Optional[str] = Query(None, description="comma-separated tag names; tasks with all of them"),
+):
+    current_user = _current_user(request, response, db)
+    statuses = sorted({s.strip() for s in status_in.split(",") if s.strip()}) if status_in else []
+    user_id = str(current_user.id)
+    tags_any = parse_tag_list(tags)
+    tags_every = parse_tag_list(tags_all)
+    due_from = as_utc(due_from) if due_from else None
+    due_to = as_utc(due_to) if due_to else None
+    # 아카이브는 done 만 들어있으므로 done 을 명시적으로 조회할 때만 합쳐서 읽음
+    include_archived = include_archived or TaskStatus.done.value in statuses
+    # 같은 조건의 동시 요청은 한 번만 조회/직렬화하고 결과 바이트를 공유.
+    # 세대(generation)는 쓰기마다 올라가므로 쓰기 이후의 요청이 이전 결과를 받는 일은 없음
+    key = (
+        user_id, skip, limit, tuple(statuses), q or None, sort or None,
+        due_from.isoformat() if due_from else None,
+        due_to.isoformat() if due_to else None,
+        include_archived,
+        tuple(tags_any),
+        tuple(tags_every),
+        task_generations.get(user_id),
+    )
+
+    def run() -> bytes:
+        source = _with_archive() if include_archived else Task
+        # 서브태스크 진행도도 같은 SELECT 에서 같이 읽음 (부모마다 쿼리하지 않음)
+        query = with_progress(db.query(source), source).filter(source.user_id == user_id)
+        if include_archived:
+            # 아카이브 행의 태그는 관계 로더가 못 읽으므로 attach_tags 로 채움
+            query = query.options(noload(source.tags))
+        if due_from is not None:
+            query = query.filter(source.due_date >= due_from)
+        if due_to is not None:
+            query = query.filter(source.due_date < due_to)
+        if statuses:
+            query = query.filter(source.status.in_(statuses))
+        if q:
+            like = f"%{q}%"
+            query = query.filter((source.title.ilike(like)) | (source.description.ilike(like)))
+        # 태그 조건은 Task.id IN (태그 인덱스에서 뽑은 id) 세미조인으로 먼저 좁힘
+        tag_filters = tagged_task_ids(user_id, tags_any, tags_every)
+        for task_ids in tag_filters:
+            query = query.filter(source.id.in_(task_ids))
+
+        if sort == "created_asc":
+            query = query.order_by(source.created_at.asc())
+        elif sort == "due_desc":
+            query = query.order_by(source.due_date.desc().nullslast())
+        elif sort == "due_asc":
+            query = query.order_by(source.due_date.asc().nullsfirst())
+        elif sort == "priority_desc":
+            query = query.order_by(source.priority.desc())
+        elif sort == "priority_asc":
+            query = query.order_by(source.priority.asc())
+        elif sort == "manual":
+            # (user_id, rank) 인덱스 순서 그대로 읽음
+            query = query.order_by(source.rank.asc(), source.id.asc())
+        else:
+            query = query.order_by(source.created_at.desc())
+
+        if due_from is None or due_to is None:
+            rows = query.offset(skip).limit(limit).all()
+            return _task_list_adapter.dump_json(attach_tags(db, rows) if include_archived else rows)
+
+        # 구간이 지정되면 반복 태스크의 이후 회차를 그 구간 안에서만 펼쳐서 합침.
+        # 저장된 행은 앞에서 skip + limit 개만 있으면 충분
+        window = skip + limit
+        rows = query.limit(window).all()
+        items = [TaskOut.model_validate(task) for task in (attach_tags(db, rows) if include_archived else rows)]
+        if not statuses or TaskStatus.todo.value in statuses:
+            series = _recurring_series(db, user_id, due_to)
+            if q:
+                series = series.filter((Task.title.ilike(f"%{q}%")) | (Task.description.ilike(f"%{q}%")))
+            for task_ids in tag_filters:
+                series = series.filter(Task.id.in_(task_ids))
+            for task in series:
+                items.extend(_future_occurrences(task, due_from, due_to, window))
+        _sort_items(items, sort)
+        return _task_list_adapter.dump_json(items[skip:window])
+
+    body, shared = list_flight.do(key, run)
+    result = Response(content=body, media_type="application/json")
+    result.raw_headers.extend((k, v) for k, v in response.raw_headers if k == b"set-cookie")
+    if shared:
+        result.headers["X-Coalesced"] = "1"
+    return result
+
+
+@router.get("/next", response_model=List[TaskOut])
+def next_tasks(
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_read_db),
+    limit: int = Query(5, ge=1, le=50, description="number of tasks to return"),
+):
+    """Open tasks ranked by priority, due date proximity and age (most urgent first)."""
+    current_user = _current_user(request, response, db)
+    # (user_id, urgency) 인덱스를 순서대로 읽다가 limit 개에서 멈춤
+    return (
+        with_progress(db.query(Task))
+        .filter(Task.user_id == str(current_user.id), Task.status != TaskStatus.done.value)
+        .order_by(Task.urgency.asc())
+        .limit(limit)
+        .all()
+    )
+
+
+@router.get("/calendar", response_model=CalendarOut)
+def task_calendar(
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_read_db),
+    month: str = Query(..., pattern=r"^\d{4}-(0[1-9]|1[0-2])$", description="YYYY-MM"),
+    tz: str = Query("UTC", description="IANA timezone used for day boundaries, e.g. Asia/Tokyo"),
+    include_tasks: bool = Query(True, description="false returns per-day counts only"),
+):
+    """Tasks due in ``month`` grouped by day, read with one (user_id, due_date) range scan."""
+    current_user = _current_user(request, response, db)
+    try:
+        zone = ZoneInfo(tz)
+    except (ZoneInfoNotFoundError, ValueError):
+        raise HTTPException(status_code=422, detail=f"Unknown timezone: {tz}")
+    year, mon = (int(part) for part in month.split("-"))
+    start = datetime(year, mon, 1, tzinfo=zone)
+    end = datetime(year + 1, 1, 1, tzinfo=zone) if mon == 12 else datetime(year, mon + 1, 1, tzinfo=zone)
+    in_range = (
+        Task.user_id == str(current_user.id),
+        Task.due_date >= start,
+        Task.due_date < end,
+    )
+
+    def local_day(due):
+        return due.astimezone(zone).date()
+
+    # 인덱스 순서(due_date)대로 읽으므로 날짜별 그룹핑은 한 번의 순회로 끝남.
+    # 날짜 경계가 tz 에 따라 달라지므로 GROUP BY 대신 앱에서 묶음.
+    # 반복 태스크는 저장된 현재 회차 이후의 회차만 이 달 범위에서 펼쳐서 끼워 넣음
+    series = _recurring_series(db, str(current_user.id), end)
+    if not include_tasks:
+        # due_date 만 읽으면 (user_id, due_date) 인덱스만으로 끝남 (covering index)
+        dues = [row.due_date for row in db.query(Task.due_date).filter(*in_range).order_by(Task.due_date.asc())]
+        virtual = [
+            due
+            for row in series.with_entities(Task.due_date, Task.recurrence)
+            for due in occurrences(parse_rule(row.recurrence), row.due_date, max(start, row.due_date), end)
+            if due > row.due_date
+        ]
+        if virtual:
+            dues = sorted(dues + virtual)
+        days = [
+            CalendarDay(date=d.isoformat(), count=sum(1 for _ in group))
+            for d, group in groupby(dues, key=local_day)
+        ]
+    else:
+        tasks = db.query(Task).filter(*in_range).order_by(Task.due_date.asc()).all()
+        items = [TaskOut.model_validate(task) for task in tasks]
+        virtual = [item for task in series for item in _future_occurrences(task, start, end, MAX_OCCURRENCES)]
+        if virtual:
+            items = sorted(items + virtual, key=lambda t: t.due_date)
+        days = []
+        for d, group in groupby(items, key=lambda t: local_day(t.due_date)):
+            group = list(group)
+            days.append(CalendarDay(date=d.isoformat(), count=len(group), tasks=group))
+    return CalendarOut(month=month, days=days)
+
+
+@router.get("/tags", response_model=List[TagCount])
+def list_tags(request: Request, response: Response, db: Session = Depends(get_read_db)):
+    """Every tag of the user with its task count, aggregated from the (tag_id, task_id) index."""
+    current_user = _current_user(request, response, db)
+    return [TagCount(name=name, count=count) for name, count in tag_counts(db, str(current_user.id))]
+
+
+@router.get("/reminders/stream")
+async def reminder_stream(request: Request, response: Response, db: Session = Depends(get_db)):
+    """Server-sent events: one ``reminder`` event per task as its due date approaches."""
+    current_user = await run_in_threadpool(_current_user, request, response, db)
+    user_id = str(current_user.id)
+    # 스트림이 열려 있는 동안 DB 연결을 잡고 있지 않도록 바로 반환
+    db.close()
+
+    async def events():
+        subscriber = sse_sink.subscribe(user_id)
+        queue = subscriber[1]
+        try:
+            yield "retry: 5000\n\n"
+            while not await request.is_disconnected():
+                try:
+                    event = await asyncio.wait_for(queue.get(), timeout=15)
+                except asyncio.TimeoutError:
+                    # 프록시가 유휴 연결을 끊지 않도록 주기적으로 주석 행을 보냄
+                    yield ": keep-alive\n\n"
+                    continue
+                yield f"event: reminder\ndata: {json.dumps(event.to_dict(), ensure_ascii=False)}\n\n"
+        finally:
+            sse_sink.unsubscribe(user_id, subscriber)
+
+    result = StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+    result.raw_headers.extend((k, v) for k, v in response.raw_headers if k == b"set-cookie")
+    return result
 
 
 @router.post("/", response_model=TaskOut, status_code=status.HTTP_201_CREATED)
 def create_task(payload: TaskCreate, request: Request, response: Response, db: Session = Depends(get_db)):
-    current_user, new_session_id = get_current_user_optional(request, db)
-    
-    # Set session cookie if this is a new anonymous user
-    if new_session_id:
-        response.set_cookie(
-            key=SESSION_COOKIE_NAME,
-            value=new_session_id,
-            max_age=24*60*60,
-            httponly=False,
-            samesite="lax",
-            secure=False,
-            path="/"
+    current_user = _current_user(request, response, db)
+    # Idempotency-Key 가 같은 재시도는 INSERT 없이 첫 응답을 그대로 돌려줌
+    with idempotency_guard(request, response, current_user.id, payload) as guard:
+        if guard.replay:
+            return guard.replay
+        task = Task(
+            title=payload.title,
+            description=payload.description,
+            status=payload.status,
+            priority=payload.priority,
+            due_date=payload.due_date,
+            recurrence=payload.recurrence,
+            user_id=str(current_user.id),
+            parent_id=payload.parent_id,
+            tags=resolve_tags(db, str(current_user.id), payload.tags),
         )
-    due = payload.due_date
-    if isinstance(due, datetime):
-        if due.tzinfo is not None:
-            due = due.astimezone(tz=None).replace(tzinfo=None)
-    task = Task(
-        title=payload.title,
-        description=payload.description,
-        status=payload.status,
-        priority=payload.priority,
-        due_date=due,
-        user_id=str(current_user.id),
-    )
-    db.add(task)
-    db.commit()
-    db.refresh(task)
-    return task
+        _align_recurrence(task)
+        _check_parent(db, task, str(current_user.id))
+        db.add(task)
+        db.commit()
+        task_generations.bump(current_user.id)
+        db.refresh(task)
+        reminder_engine.schedule(task)
+        activity_log.record(task.id, current_user.id, "create", _created_changes(task))
+        return guard.respond(TaskOut.model_validate(task), status.HTTP_201_CREATED)
 
 
 @router.get("/{task_id}", response_model=TaskOut)
-def get_task(task_id: int, request: Request, response: Response, db: Session = Depends(get_db)):
-    current_user, new_session_id = get_current_user_optional(request, db)
-    
-    # Set session cookie if this is a new anonymous user
-    if new_session_id:
-        response.set_cookie(
-            key=SESSION_COOKIE_NAME,
-            value=new_session_id,
-            max_age=24*60*60,
-            httponly=False,
-            samesite="lax",
-            secure=False,
-            path="/"
-        )
-    task = db.query(Task).filter(Task.id == task_id, Task.user_id == str(current_user.id)).first()
+def get_task(task_id: int, request: Request, response: Response, db: Session = Depends(get_read_db)):
+    current_user = _current_user(request, response, db)
+    task = with_progress(db.query(Task)).filter(Task.id == task_id, Task.user_id == str(current_user.id)).first()
     if not task:
         raise HTTPException(status_code=404, detail="Task not found")
+    response.headers["ETag"] = _etag(task.version)
     return task
 
 
+@router.get("/{task_id}/tree", response_model=TaskTree)
+def get_task_tree(task_id: int, request: Request, response: Response, db: Session = Depends(get_read_db)):
+    """The task with all of its subtasks nested, read with one recursive CTE."""
+    current_user = _current_user(request, response, db)
+    nodes = {}
+    root = None
+    # 깊이 순으로 오므로 부모 노드가 항상 먼저 만들어짐
+    for task, depth in subtree_query(db, task_id, str(current_user.id)):
+        node = TaskTree.model_validate(task)
+        nodes[task.id] = node
+        if depth == 0:
+            root = node
+        elif task.parent_id in nodes:
+            nodes[task.parent_id].children.append(node)
+    if root is None:
+        raise HTTPException(status_code=404, detail="Task not found")
+    return root
+
+
+@router.get("/{task_id}/history", response_model=TaskHistory)
+def get_task_history(
+    task_id: int,
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_db),
+    limit: int = Query(50, ge=1, le=200),
+    before_id: Optional[int] = Query(None, description="return entries older than this id (next_before_id)"),
+):
+    """Change history of a task, newest first. Kept after the task is deleted, until retention."""
+    current_user = _current_user(request, response, db)
+    user_id = str(current_user.id)
+    # 아직 큐에 남아있는 이력도 보이도록 먼저 씀
+    activity_log.flush()
+    query = db.query(TaskActivity).filter(TaskActivity.task_id == task_id, TaskActivity.user_id == user_id)
+    if before_id is not None:
+        query = query.filter(TaskActivity.id < before_id)
+    # (task_id, id) 인덱스를 역순으로 limit + 1 개만 읽어서 다음 페이지 유무를 판단
+    rows = query.order_by(TaskActivity.id.desc()).limit(limit + 1).all()
+    if not rows and before_id is None:
+        if not db.query(Task.id).filter(Task.id == task_id, Task.user_id == user_id).first():
+            raise HTTPException(status_code=404, detail="Task not found")
+    next_before_id = rows[limit - 1].id if len(rows) > limit else None
+    return TaskHistory(items=rows[:limit], next_before_id=next_before_id)
+
+
 @router.patch("/{task_id}", response_model=TaskOut)
 def update_task(task_id: int, payload: TaskUpdate, request: Request, response: Response, db: Session = Depends(get_db)):
-    current_user, new_session_id = get_current_user_optional(request, db)
-    
-    # Set session cookie if this is a new anonymous user
-    if new_session_id:
-        response.set_cookie(
-            key=SESSION_COOKIE_NAME,
-            value=new_session_id,
-            max_age=24*60*60,
-            httponly=False,
-            samesite="lax",
-            secure=False,
-            path="/"
-        )
-    task = db.query(Task).filter(Task.id == task_id, Task.user_id == str(current_user.id)).first()
-    if not task:
-        raise HTTPException(status_code=404, detail="Task not found")
+    current_user = _current_user(request, response, db)
+    with idempotency_guard(request, response, current_user.id, payload) as guard:
+        if guard.replay:
+            return guard.replay
+        task = db.query(Task).filter(Task.id == task_id, Task.user_id == str(current_user.id)).first()
+        if not task:
+            raise HTTPException(status_code=404, detail="Task not found")
 
-    updates = payload.model_dump(exclude_unset=True)
-    for field_name, value in updates.items():
-        if field_name == 'due_date' and value is not None and getattr(value, 'tzinfo', None) is not None:
-            value = value.astimezone(tz=None).replace(tzinfo=None)
-        setattr(task, field_name, value)
+        updates = payload.model_dump(exclude_unset=True)
+        body_version = updates.pop("version", None)
+        tag_names = updates.pop("tags", None)
+        expected = _parse_if_match(request.headers.get("If-Match"))
+        if expected is None:
+            expected = body_version
+        # 클라이언트가 본 버전이 이미 낡았으면 UPDATE 를 보내기 전에 거절
+        if expected is not None and expected != task.version:
+            raise _version_conflict(task.version)
 
-    db.add(task)
-    db.commit()
-    db.refresh(task)
-    return task
+        old_tags = [tag.name for tag in task.tags]
+        # 태그 생성은 세이브포인트(flush)를 거치므로 필드를 바꾸기 전에 해둠 (flush 되면 diff 가 사라짐)
+        new_tags = resolve_tags(db, str(current_user.id), tag_names) if tag_names is not None else None
+        for field_name, value in updates.items():
+            setattr(task, field_name, value)
+        if new_tags is not None:
+            task.tags = new_tags
+            # 태그만 바뀌어도 tasks 행을 UPDATE 해서 version/updated_at 이 올라가게 함
+            task.updated_at = utcnow()
+        if "recurrence" in updates or "due_date" in updates:
+            _align_recurrence(task)
+        if "parent_id" in updates:
+            _check_parent(db, task, str(current_user.id))
+        # 반복 태스크를 완료하면 이번 회차만 별도 행으로 남기고 원본은 다음 회차로 넘어감
+        completed = None
+        if task.recurrence and updates.get("status") == TaskStatus.done.value:
+            completed = _complete_occurrence(db, task)
+        # 커밋하면 변경 이력이 사라지므로 그 전에 diff 를 떠둠
+        changes = field_changes(task)
+        tag_list = [tag.name for tag in task.tags]
+        if tag_list != old_tags:
+            changes["tags"] = [old_tags, tag_list]
+
+        db.add(task)
+        try:
+            # version_id_col 때문에 "UPDATE ... WHERE id=? AND version=?" 한 번으로 끝남.
+            # 읽은 뒤 다른 요청이 먼저 고쳤다면 0행이 갱신되어 StaleDataError 가 남
+            db.commit()
+        except StaleDataError:
+            db.rollback()
+            current = db.query(Task.version).filter(Task.id == task_id).scalar()
+            raise _version_conflict(current)
+        task_generations.bump(current_user.id)
+        if changes:
+            activity_log.record(task_id, current_user.id, "update", changes)
+        if completed is not None:
+            activity_log.record(completed.id, current_user.id, "create", _created_changes(completed))
+        task = _reload_with_progress(db, task_id)
+        reminder_engine.schedule(task)
+        result = guard.respond(TaskOut.model_validate(task))
+        result.headers["ETag"] = _etag(task.version)
+        return result
+
+
+@router.patch("/{task_id}/move", response_model=TaskOut)
+def move_task(task_id: int, payload: TaskMove, request: Request, response: Response, db: Session = Depends(get_db)):
+    """Drag-and-drop reorder: rewrites only this task's rank (no renumbering of the others)."""
+    current_user = _current_user(request, response, db)
+    with idempotency_guard(request, response, current_user.id, payload) as guard:
+        if guard.replay:
+            return guard.replay
+        user_id = str(current_user.id)
+        if payload.after_id is None and payload.before_id is None:
+            raise HTTPException(status_code=422, detail="after_id か before_id を指定してください")
+        if task_id in (payload.after_id, payload.before_id):
+            raise HTTPException(status_code=422, detail="移動先に自分自身は指定できません")
+        task = db.query(Task).filter(Task.id == task_id, Task.user_id == user_id).first()
+        if not task:
+            raise HTTPException(status_code=404, detail="Task not found")
+        expected = _parse_if_match(request.headers.get("If-Match"))
+        if expected is None:
+            expected = payload.version
+        if expected is not None and expected != task.version:
+            raise _version_conflict(task.version)
+
+        neighbors = {}
+        for key, neighbor_id in (("after", payload.after_id), ("before", payload.before_id)):
+            if neighbor_id is None:
+                neighbors[key] = None
+                continue
+            neighbor = db.query(Task).filter(Task.id == neighbor_id, Task.user_id == user_id).first()
+            if not neighbor:
+                raise HTTPException(status_code=404, detail="Task not found")
+            neighbors[key] = neighbor
+
+        try:
+            # 순서가 뒤바뀐 요청은 아무것도 잠그거나 쓰기 전에 422
+            rank = rank_between(db, user_id, neighbors["after"], neighbors["before"])
+            if rank is None:
+                # 동시에 만들어진 태스크끼리 키가 겹친 경우에만 전체를 다시 매긴 뒤 한 번 더 계산
+                # (다시 매기면 version 도 올라가므로 옮기는 태스크도 새로 읽음. If-Match 는 위에서 이미 확인함)
+                rebalance_user(db, user_id)
+                for loaded in (task, *neighbors.values()):
+                    if loaded is not None:
+                        db.refresh(loaded)
+                rank = rank_between(db, user_id, neighbors["after"], neighbors["before"])
+        except NeighborOrderError:
+            rank = None
+        if rank is None:
+            raise HTTPException(status_code=422, detail="after_id は before_id より前のタスクを指定してください")
+
+        task.rank = rank
+        changes = field_changes(task, ("rank",))
+        try:
+            db.commit()
+        except StaleDataError:
+            db.rollback()
+            raise _version_conflict(db.query(Task.version).filter(Task.id == task_id).scalar())
+        task_generations.bump(current_user.id)
+        activity_log.record(task_id, current_user.id, "move", changes)
+        task = _reload_with_progress(db, task_id)
+        result = guard.respond(TaskOut.model_validate(task))
+        result.headers["ETag"] = _etag(task.version)
+        return result
 
 
 @router.delete("/{task_id}", status_code=status.HTTP_204_NO_CONTENT)
 def delete_task(task_id: int, request: Request, response: Response, db: Session = Depends(get_db)):
-    current_user, new_session_id = get_current_user_optional(request, db)
-    
-    # Set session cookie if this is a new anonymous user
-    if new_session_id:
-        response.set_cookie(
-            key=SESSION_COOKIE_NAME,
-            value=new_session_id,
-            max_age=24*60*60,
-            httponly=False,
-            samesite="lax",
-            secure=False,
-            path="/"
+    current_user = _current_user(request, response, db)
+    with idempotency_guard(request, response, current_user.id) as guard:
+        if guard.replay:
+            return guard.replay
+        task = db.query(Task).filter(Task.id == task_id, Task.user_id == str(current_user.id)).first()
+        if not task:
+            raise HTTPException(status_code=404, detail="Task not found")
+        expected = _parse_if_match(request.headers.get("If-Match"))
+        if expected is not None and expected != task.version:
+            raise _version_conflict(task.version)
+        # 서브태스크는 지우지 않고 최상위로 올림 (SQLite 는 FK 의 SET NULL 이 동작하지 않으므로 직접)
+        db.execute(
+            update(Task)
+            .where(Task.parent_id == task_id)
+            .values(parent_id=None, version=Task.version + 1, updated_at=utcnow())
+            .execution_options(synchronize_session=False)
         )
-    task = db.query(Task).filter(Task.id == task_id, Task.user_id == str(current_user.id)).first()
-    if not task:
-        raise HTTPException(status_code=404, detail="Task not found")
-    db.delete(task)
-    db.commit()
-    return None
+        title = task.title
+        db.delete(task)
+        try:
+            db.commit()
+        except StaleDataError:
+            db.rollback()
+            raise _version_conflict(db.query(Task.version).filter(Task.id == task_id).scalar())
+        task_generations.bump(current_user.id)
+        activity_log.record(task_id, current_user.id, "delete", {"title": [title, None]})
+        reminder_engine.cancel(task_id)
+        return guard.respond(None, status.HTTP_204_NO_CONTENT)
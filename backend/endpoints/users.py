@@ -1,4 +1,5 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Request, Response
+from fastapi import APIRouter, Depends, File, HTTPException, status, Request, Response, UploadFile
+from fastapi.responses import FileResponse
 from pydantic import BaseModel, EmailStr, Field, field_validator
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
@@ -12,8 +13,17 @@ from utils.security import (
     verify_password,
     create_session_id,
     get_current_user,
+    get_session_id,
     SESSION_COOKIE_NAME,
 )
+from utils.avatars import AVATAR_MAX_UPLOAD_BYTES, InvalidImage, avatar_store, avatar_url, is_local_avatar_url
+from utils.gates import image_gate
+from utils.replicas import get_read_db
+from utils.sessions import session_store
+
+
+# 아바타 URL 은 내용 해시라서 내용이 바뀌면 URL 도 바뀜 → 브라우저/CDN 이 재검증 없이 계속 써도 됨
+AVATAR_CACHE_CONTROL = "public, max-age=31536000, immutable"
 
 
 class RegisterPayload(BaseModel):
@@ -101,9 +111,9 @@ def login(payload: LoginPayload, response: Response, db: Session = Depends(get_d
         print("❌ Invalid password")
         raise HTTPException(status_code=401, detail="メールまたはパスワードが正しくありません")
     
-    # Create session
+    # Create session (기존 기기의 세션은 그대로 유지)
     session_id = create_session_id()
-    user.session_id = session_id
+    session_store.create(db, user.id, session_id)
     db.commit()
     
     # Set session cookie (for cross-origin requests)
@@ -163,7 +173,7 @@ def guest_login(response: Response, db: Session = Depends(get_db)):
     
     # 세션 생성
     session_id = create_session_id()
-    user.session_id = session_id
+    session_store.create(db, user.id, session_id)
     db.commit()
     
     # 쿠키 설정
@@ -199,19 +209,12 @@ def guest_login(response: Response, db: Session = Depends(get_db)):
 @router.post("/logout")
 def logout(request: Request, response: Response, db: Session = Depends(get_db)):
     # 세션 ID를 헤더 또는 쿠키에서 가져오기
-    session_id = None
-    auth_header = request.headers.get("Authorization")
-    if auth_header and auth_header.startswith("Bearer "):
-        session_id = auth_header.replace("Bearer ", "")
-    else:
-        session_id = request.cookies.get(SESSION_COOKIE_NAME)
-    
+    session_id = get_session_id(request)
+
     if session_id:
-        # Clear session from database
-        user = db.query(User).filter(User.session_id == session_id).first()
-        if user:
-            user.session_id = None
-            db.commit()
+        # 이 기기의 세션만 삭제 (다른 기기는 로그인 유지)
+        session_store.revoke(db, session_id)
+        db.commit()
     
     # Clear session cookie
     import os
@@ -227,7 +230,7 @@ def logout(request: Request, response: Response, db: Session = Depends(get_db)):
 
 
 @router.get("/me", response_model=ProfileOut)
-def get_me(request: Request, db: Session = Depends(get_db)):
+def get_me(request: Request, db: Session = Depends(get_read_db)):
     current_user = get_current_user(request, db)
     # Return the user object directly, Pydantic's from_attributes handles conversion
     return current_user
@@ -248,8 +251,12 @@ def update_me(
     if payload.name is not None:
         current_user.name = payload.name
     if payload.avatar_url is not None:
-        # Basic validation for avatar_url
-        if payload.avatar_url.startswith("http://") or payload.avatar_url.startswith("https://"):
+        # Basic validation for avatar_url (업로드한 아바타의 URL 도 그대로 다시 저장할 수 있음)
+        if (
+            payload.avatar_url.startswith("http://")
+            or payload.avatar_url.startswith("https://")
+            or is_local_avatar_url(payload.avatar_url)
+        ):
             current_user.avatar_url = payload.avatar_url
         else:
             current_user.avatar_url = None
@@ -260,6 +267,43 @@ def update_me(
     return current_user
 
 
+@router.post("/me/avatar", response_model=ProfileOut)
+def upload_avatar(
+    request: Request,
+    file: UploadFile = File(...),
+    db: Session = Depends(get_db),
+):
+    """Upload a JPEG/PNG/WebP/GIF; it is cropped square and resized to every AVATAR_SIZES once."""
+    current_user = get_current_user(request, db)
+    data = file.file.read(AVATAR_MAX_UPLOAD_BYTES + 1)
+    if len(data) > AVATAR_MAX_UPLOAD_BYTES:
+        raise HTTPException(status_code=413, detail="画像ファイルが大きすぎます")
+    try:
+        with image_gate.slot():
+            digest = avatar_store.save(data)
+    except InvalidImage as exc:
+        print(f"❌ Avatar rejected: {exc}")
+        raise HTTPException(status_code=422, detail="画像ファイルを読み込めません")
+
+    current_user.avatar_url = avatar_url(digest)
+    db.commit()
+    db.refresh(current_user)
+    return current_user
+
+
+@router.get("/avatars/{digest}/{size}.webp")
+def get_avatar(digest: str, size: int, request: Request):
+    """Serve a thumbnail straight from disk with immutable cache headers (no auth, no DB)."""
+    path = avatar_store.thumbnail(digest, size)
+    if path is None:
+        raise HTTPException(status_code=404, detail="画像が見つかりません")
+    etag = f'"{digest}-{size}"'
+    headers = {"Cache-Control": AVATAR_CACHE_CONTROL, "ETag": etag}
+    if request.headers.get("If-None-Match") == etag:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return FileResponse(path, media_type="image/webp", headers=headers)
+
+
 class ChangePasswordPayload(BaseModel):
     current_password: str
     new_password: str = Field(min_length=6, max_length=128)
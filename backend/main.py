@@ -1,14 +1,43 @@
+from contextlib import asynccontextmanager
+import os
+
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import Response
+from starlette.concurrency import run_in_threadpool
+
+from database import engine
+from endpoints.admin import router as admin_router
+from endpoints.batch import router as batch_router
+from endpoints.health import router as health_router
 from endpoints.tasks import router as tasks_router
 from endpoints.users import router as users_router
+from utils import archive, background  # noqa: F401  (archive: 아카이브 워커 등록)
+from utils.body_limit import BodySizeLimitMiddleware
+from utils.health import draining
+from utils.rate_limit import RateLimitMiddleware
+from utils.replicas import ReadAfterWriteMiddleware
+from utils.singleflight import list_flight
+from utils.startup import warm_up
 
-app = FastAPI()
 
-# 프론트 접근 허용 (로컬 + 배포 URL)
-import os
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # 첫 요청이 풀/bcrypt/쿼리 컴파일 비용을 떠안지 않도록 기동 시점에 미리 준비
+    if os.getenv("SKIP_WARMUP") != "1":
+        timings = await run_in_threadpool(warm_up, engine)
+        print(f"🔥 Warm-up finished: {timings}")
+    background.start_all()
+    yield
+    # 로드밸런서가 먼저 이 워커를 빼도록 ready 를 내리고 정리 시작
+    draining.set()
+    # 버퍼에 남은 쓰기(last_seen 등)를 비우고 종료
+    background.stop_all()
 
+
+app = FastAPI(lifespan=lifespan)
+
+# 프론트 접근 허용 (로컬 + 배포 URL)
 allowed_origins = [
     "http://localhost:3000",
     "http://127.0.0.1:3000",
@@ -63,6 +92,13 @@ def is_allowed_origin(origin: str) -> bool:
     print(f"❌ Origin {origin} not allowed")
     return False
 
+# 큰 업로드는 파싱/스풀 전에 413 (레이트 리밋 안쪽이라 막힌 요청은 본문을 읽지 않음)
+app.add_middleware(BodySizeLimitMiddleware)
+# 쓰기에 성공한 세션은 잠시 동안 읽기도 프라이머리로 (복제 지연 대비)
+app.add_middleware(ReadAfterWriteMiddleware)
+# CORS 보다 안쪽에 두어 429/503 응답에도 CORS 헤더가 붙도록 함
+app.add_middleware(RateLimitMiddleware)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=allowed_origins,  # 정확한 origin 목록 사용
@@ -79,7 +115,9 @@ app.add_middleware(
         "sec-ch-ua",
         "sec-ch-ua-mobile",
         "sec-ch-ua-platform",
-        "Access-Control-Allow-Credentials"
+        "Access-Control-Allow-Credentials",
+        "Idempotency-Key",
+        "If-Match",
     ],
     expose_headers=["*"],
 )
@@ -95,7 +133,7 @@ async def options_handler(full_path: str, request: Request):
             headers={
                 "Access-Control-Allow-Origin": origin,
                 "Access-Control-Allow-Methods": "GET, POST, PUT, DELETE, PATCH, OPTIONS",
-                "Access-Control-Allow-Headers": "Content-Type, Authorization, X-Requested-With, Accept, Origin, User-Agent, Referer, sec-ch-ua, sec-ch-ua-mobile, sec-ch-ua-platform, Access-Control-Allow-Credentials",
+                "Access-Control-Allow-Headers": "Content-Type, Authorization, X-Requested-With, Accept, Origin, User-Agent, Referer, sec-ch-ua, sec-ch-ua-mobile, sec-ch-ua-platform, Access-Control-Allow-Credentials, Idempotency-Key, If-Match",
                 "Access-Control-Allow-Credentials": "true",
                 "Vary": "Origin",
             }
@@ -105,10 +143,13 @@ async def options_handler(full_path: str, request: Request):
 
 @app.get("/check")
 def health():
-    return {"status": "ok", "cors_updated": "2025-08-24"}
+    return {"status": "ok", "cors_updated": "2025-08-24", "list_coalescing": list_flight.stats()}
 
 app.include_router(tasks_router)
 app.include_router(users_router)
+app.include_router(admin_router)
+app.include_router(health_router)
+app.include_router(batch_router)
 
 if __name__ == "__main__":
     import uvicorn
@@ -0,0 +1,80 @@
+"""add task urgency
+
+Revision ID: da040fa4489f
+Revises: a0a3184272ac
+Create Date: 2026-10-19 10:15:00.000000+09:00
+
+"""
+from datetime import datetime, timedelta, timezone
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'da040fa4489f'
+down_revision: Union[str, None] = 'a0a3184272ac'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH_SIZE = 1000
+
+# 이 리비전 시점의 models.task.compute_urgency 사본. 모델이 바뀌어도 마이그레이션 결과가 달라지지 않게 고정
+PRIORITY_STEP = timedelta(days=1).total_seconds()
+NO_DUE_HORIZON = timedelta(days=7)
+AGE_WEIGHT = 0.1
+
+
+def _epoch(value: datetime) -> float:
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
+
+def compute_urgency(priority, due_date, created_at) -> float:
+    created_at = created_at or datetime.now(timezone.utc)
+    deadline = due_date or (created_at + NO_DUE_HORIZON)
+    priority = 3 if priority is None else priority
+    return _epoch(deadline) - priority * PRIORITY_STEP + AGE_WEIGHT * _epoch(created_at)
+
+
+def upgrade() -> None:
+    op.add_column('tasks', sa.Column('urgency', sa.Float(), nullable=True))
+    op.create_index('ix_tasks_user_id_urgency', 'tasks', ['user_id', 'urgency'], unique=False)
+
+    # 기존 행 백필 (id 기준 keyset 페이지로 나눠서 갱신)
+    conn = op.get_bind()
+    tasks = sa.table(
+        'tasks',
+        sa.column('id', sa.Integer),
+        sa.column('priority', sa.Integer),
+        sa.column('due_date', sa.DateTime),
+        sa.column('created_at', sa.DateTime),
+        sa.column('urgency', sa.Float),
+    )
+    update = (
+        tasks.update()
+        .where(tasks.c.id == sa.bindparam('task_id'))
+        .values(urgency=sa.bindparam('value'))
+    )
+    last_id = 0
+    while True:
+        rows = conn.execute(
+            sa.select(tasks.c.id, tasks.c.priority, tasks.c.due_date, tasks.c.created_at)
+            .where(tasks.c.id > last_id)
+            .order_by(tasks.c.id)
+            .limit(BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+        conn.execute(update, [
+            {'task_id': row.id, 'value': compute_urgency(row.priority, row.due_date, row.created_at)}
+            for row in rows
+        ])
+        last_id = rows[-1].id
+
+
+def downgrade() -> None:
+    op.drop_index('ix_tasks_user_id_urgency', table_name='tasks')
+    op.drop_column('tasks', 'urgency')
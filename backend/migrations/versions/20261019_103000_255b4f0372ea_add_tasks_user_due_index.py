@@ -0,0 +1,26 @@
+"""add (user_id, due_date) index on tasks
+
+Revision ID: 255b4f0372ea
+Revises: da040fa4489f
+Create Date: 2026-10-19 10:30:00.000000+09:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '255b4f0372ea'
+down_revision: Union[str, None] = 'da040fa4489f'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_tasks_user_id_due_date', 'tasks', ['user_id', 'due_date'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_tasks_user_id_due_date', table_name='tasks')
@@ -0,0 +1,132 @@
+"""normalize tasks.due_date to UTC
+
+Revision ID: db6196dbfe62
+Revises: 255b4f0372ea
+Create Date: 2026-10-19 11:00:00.000000+09:00
+
+Until now due_date was stored as a naive *local* time: either the
+browser's local time sent as-is by the frontend, or the server's local
+time for offset-aware inputs. Rows are converted from LEGACY_DUE_DATE_TZ
+(default Asia/Tokyo, where the users are) to naive UTC, which is what
+models.types.UTCDateTime expects from here on. The original zone of each
+row is not recorded, so every row is assumed to be in that one zone;
+rows entered from another zone stay off by the difference.
+
+created_at/updated_at were filled by the database's now(). SQLite's
+CURRENT_TIMESTAMP is already UTC, so they are left alone there. On
+PostgreSQL now() stored into a ``timestamp`` column is the session
+TimeZone's local time, so they are converted from LEGACY_DB_TZ
+(default: the server's current TimeZone setting) to UTC.
+
+urgency depends on both due_date and created_at and is recomputed for
+every row.
+"""
+import os
+from datetime import datetime, timedelta, timezone
+from typing import Sequence, Union
+from zoneinfo import ZoneInfo
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'db6196dbfe62'
+down_revision: Union[str, None] = '255b4f0372ea'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH_SIZE = 1000
+
+# 이 리비전 시점의 models.task.compute_urgency 사본. 모델이 바뀌어도 마이그레이션 결과가 달라지지 않게 고정
+PRIORITY_STEP = timedelta(days=1).total_seconds()
+NO_DUE_HORIZON = timedelta(days=7)
+AGE_WEIGHT = 0.1
+
+
+def _epoch(value: datetime) -> float:
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
+
+def compute_urgency(priority, due_date, created_at) -> float:
+    created_at = created_at or datetime.now(timezone.utc)
+    deadline = due_date or (created_at + NO_DUE_HORIZON)
+    priority = 3 if priority is None else priority
+    return _epoch(deadline) - priority * PRIORITY_STEP + AGE_WEIGHT * _epoch(created_at)
+
+
+tasks = sa.table(
+    'tasks',
+    sa.column('id', sa.Integer),
+    sa.column('priority', sa.Integer),
+    sa.column('due_date', sa.DateTime),
+    sa.column('created_at', sa.DateTime),
+    sa.column('urgency', sa.Float),
+)
+
+
+def _legacy_zone() -> ZoneInfo:
+    return ZoneInfo(os.getenv('LEGACY_DUE_DATE_TZ', 'Asia/Tokyo'))
+
+
+def _convert_server_timestamps(to_utc: bool) -> None:
+    conn = op.get_bind()
+    if conn.dialect.name != 'postgresql':
+        return
+    zone = os.getenv('LEGACY_DB_TZ') or conn.scalar(sa.text('SHOW TIME ZONE'))
+    if to_utc:
+        expr = "({col} AT TIME ZONE :zone) AT TIME ZONE 'UTC'"
+    else:
+        expr = "({col} AT TIME ZONE 'UTC') AT TIME ZONE :zone"
+    conn.execute(
+        sa.text(
+            f"UPDATE tasks SET created_at = {expr.format(col='created_at')}, "
+            f"updated_at = {expr.format(col='updated_at')}"
+        ),
+        {'zone': zone},
+    )
+
+
+def _convert(convert) -> None:
+    conn = op.get_bind()
+    update = (
+        tasks.update()
+        .where(tasks.c.id == sa.bindparam('task_id'))
+        .values(due_date=sa.bindparam('value'), urgency=sa.bindparam('urgency'))
+    )
+    last_id = 0
+    while True:
+        rows = conn.execute(
+            sa.select(tasks.c.id, tasks.c.priority, tasks.c.due_date, tasks.c.created_at)
+            .where(tasks.c.id > last_id)
+            .order_by(tasks.c.id)
+            .limit(BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+        batch = []
+        for row in rows:
+            due_date = convert(row.due_date) if row.due_date is not None else None
+            batch.append({
+                'task_id': row.id,
+                'value': due_date,
+                # 정렬 키도 마감 시각에 의존하므로 함께 다시 계산
+                'urgency': compute_urgency(row.priority, due_date, row.created_at),
+            })
+        conn.execute(update, batch)
+        last_id = rows[-1].id
+
+
+def upgrade() -> None:
+    zone = _legacy_zone()
+    # created_at 을 먼저 바꿔야 urgency 가 UTC 기준으로 계산됨
+    _convert_server_timestamps(to_utc=True)
+    _convert(lambda value: value.replace(tzinfo=zone).astimezone(timezone.utc).replace(tzinfo=None))
+
+
+def downgrade() -> None:
+    zone = _legacy_zone()
+    _convert_server_timestamps(to_utc=False)
+    _convert(lambda value: value.replace(tzinfo=timezone.utc).astimezone(zone).replace(tzinfo=None))
@@ -0,0 +1,67 @@
+"""add sessions table
+
+Revision ID: f3c22cccc9e8
+Revises: db6196dbfe62
+Create Date: 2026-10-19 11:30:00.000000+09:00
+
+Moves sessions out of users.session_id into a per-device table keyed by
+the SHA-256 of the token. Existing sessions are carried over with a
+fresh 24h expiry so nobody is logged out by the upgrade.
+"""
+import hashlib
+from datetime import datetime, timedelta, timezone
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3c22cccc9e8'
+down_revision: Union[str, None] = 'db6196dbfe62'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    sessions = op.create_table(
+        'sessions',
+        sa.Column('token_hash', sa.String(length=64), nullable=False),
+        sa.Column('user_id', sa.String(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('expires_at', sa.DateTime(), nullable=False),
+        sa.Column('last_seen_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('token_hash'),
+    )
+    op.create_index('ix_sessions_user_id', 'sessions', ['user_id'], unique=False)
+    op.create_index('ix_sessions_expires_at', 'sessions', ['expires_at'], unique=False)
+
+    conn = op.get_bind()
+    rows = conn.execute(sa.text('SELECT id, session_id FROM users WHERE session_id IS NOT NULL')).all()
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    if rows:
+        op.bulk_insert(sessions, [
+            {
+                'token_hash': hashlib.sha256(session_id.encode()).hexdigest(),
+                'user_id': user_id,
+                'created_at': now,
+                'expires_at': now + timedelta(hours=24),
+                'last_seen_at': now,
+            }
+            for user_id, session_id in rows
+        ])
+
+    with op.batch_alter_table('users') as batch_op:
+        batch_op.drop_index('ix_users_session_id')
+        batch_op.drop_column('session_id')
+
+
+def downgrade() -> None:
+    # 토큰 원문은 저장하지 않으므로 기존 세션은 복원할 수 없음 (다시 로그인 필요)
+    with op.batch_alter_table('users') as batch_op:
+        batch_op.add_column(sa.Column('session_id', sa.String(), nullable=True))
+        batch_op.create_index('ix_users_session_id', ['session_id'], unique=True)
+    op.drop_index('ix_sessions_expires_at', table_name='sessions')
+    op.drop_index('ix_sessions_user_id', table_name='sessions')
+    op.drop_table('sessions')
@@ -0,0 +1,27 @@
+"""add tasks.version for optimistic concurrency
+
+Revision ID: 268bb6776bea
+Revises: f3c22cccc9e8
+Create Date: 2026-10-19 12:00:00.000000+09:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '268bb6776bea'
+down_revision: Union[str, None] = 'f3c22cccc9e8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('tasks', sa.Column('version', sa.Integer(), nullable=False, server_default='1'))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('tasks') as batch_op:
+        batch_op.drop_column('version')
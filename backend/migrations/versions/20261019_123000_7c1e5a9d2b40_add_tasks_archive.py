@@ -0,0 +1,45 @@
+"""add tasks_archive table for old done tasks
+
+Revision ID: 7c1e5a9d2b40
+Revises: 268bb6776bea
+Create Date: 2026-10-19 12:30:00.000000+09:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7c1e5a9d2b40'
+down_revision: Union[str, None] = '268bb6776bea'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'tasks_archive',
+        sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column('title', sa.String(length=200), nullable=False),
+        sa.Column('description', sa.Text(), nullable=True),
+        sa.Column('status', sa.String(length=20), nullable=False),
+        sa.Column('priority', sa.Integer(), nullable=False),
+        sa.Column('due_date', sa.DateTime(), nullable=True),
+        sa.Column('urgency', sa.Float(), nullable=True),
+        sa.Column('user_id', sa.String(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.Column('version', sa.Integer(), nullable=False),
+        sa.Column('archived_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_tasks_archive_user_id_created_at', 'tasks_archive', ['user_id', 'created_at'])
+    op.create_index('ix_tasks_status_updated_at', 'tasks', ['status', 'updated_at'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_tasks_status_updated_at', table_name='tasks')
+    op.drop_index('ix_tasks_archive_user_id_created_at', table_name='tasks_archive')
+    op.drop_table('tasks_archive')
@@ -0,0 +1,25 @@
+"""add tasks.due_date index for the reminder engine
+
+Revision ID: 5b8f0d3e61a7
+Revises: 7c1e5a9d2b40
+Create Date: 2026-10-19 13:00:00.000000+09:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5b8f0d3e61a7'
+down_revision: Union[str, None] = '7c1e5a9d2b40'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_tasks_due_date', 'tasks', ['due_date'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_tasks_due_date', table_name='tasks')
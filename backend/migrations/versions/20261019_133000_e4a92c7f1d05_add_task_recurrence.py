@@ -0,0 +1,31 @@
+"""add tasks.recurrence (RRULE) for recurring tasks
+
+Revision ID: e4a92c7f1d05
+Revises: 5b8f0d3e61a7
+Create Date: 2026-10-19 13:30:00.000000+09:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e4a92c7f1d05'
+down_revision: Union[str, None] = '5b8f0d3e61a7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('tasks', sa.Column('recurrence', sa.String(length=200), nullable=True))
+    # tasks_archive 는 tasks 와 같은 컬럼 구성을 유지해야 함 (UNION ALL 조회)
+    op.add_column('tasks_archive', sa.Column('recurrence', sa.String(length=200), nullable=True))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('tasks_archive') as batch_op:
+        batch_op.drop_column('recurrence')
+    with op.batch_alter_table('tasks') as batch_op:
+        batch_op.drop_column('recurrence')
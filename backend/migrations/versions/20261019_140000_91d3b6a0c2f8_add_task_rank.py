@@ -0,0 +1,60 @@
+"""add tasks.rank for manual ordering
+
+Revision ID: 91d3b6a0c2f8
+Revises: e4a92c7f1d05
+Create Date: 2026-10-19 14:00:00.000000+09:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from models.fractional_index import sequential_keys
+
+
+# revision identifiers, used by Alembic.
+revision: str = '91d3b6a0c2f8'
+down_revision: Union[str, None] = 'e4a92c7f1d05'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# 키는 바이트 순서로 비교해야 함
+RANK_TYPE = sa.String(length=255).with_variant(sa.String(length=255, collation='C'), 'postgresql')
+
+
+def upgrade() -> None:
+    op.add_column('tasks', sa.Column('rank', RANK_TYPE, nullable=True))
+    op.add_column('tasks_archive', sa.Column('rank', RANK_TYPE, nullable=True))
+
+    # 기존 태스크는 지금까지의 기본 표시 순서(새 것이 위)대로 키를 매김
+    conn = op.get_bind()
+    tasks = sa.table(
+        'tasks',
+        sa.column('id', sa.Integer),
+        sa.column('user_id', sa.String),
+        sa.column('created_at', sa.DateTime),
+        sa.column('rank', sa.String),
+    )
+    update = tasks.update().where(tasks.c.id == sa.bindparam('task_id')).values(rank=sa.bindparam('value'))
+    user_ids = conn.execute(sa.select(tasks.c.user_id).distinct()).scalars().all()
+    for user_id in user_ids:
+        ids = conn.execute(
+            sa.select(tasks.c.id)
+            .where(tasks.c.user_id == user_id)
+            .order_by(tasks.c.created_at.desc(), tasks.c.id.desc())
+        ).scalars().all()
+        conn.execute(update, [
+            {'task_id': task_id, 'value': key}
+            for task_id, key in zip(ids, sequential_keys(len(ids)))
+        ])
+
+    op.create_index('ix_tasks_user_id_rank', 'tasks', ['user_id', 'rank'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_tasks_user_id_rank', table_name='tasks')
+    with op.batch_alter_table('tasks_archive') as batch_op:
+        batch_op.drop_column('rank')
+    with op.batch_alter_table('tasks') as batch_op:
+        batch_op.drop_column('rank')
@@ -0,0 +1,41 @@
+"""add tags and task_tags
+
+Revision ID: b7e2c94f1a36
+Revises: 91d3b6a0c2f8
+Create Date: 2026-10-19 14:30:00.000000+09:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7e2c94f1a36'
+down_revision: Union[str, None] = '91d3b6a0c2f8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'tags',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('user_id', sa.String(), sa.ForeignKey('users.id', ondelete='CASCADE'), nullable=False),
+        sa.Column('name', sa.String(length=50), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.UniqueConstraint('user_id', 'name', name='uq_tags_user_id_name'),
+    )
+    op.create_table(
+        'task_tags',
+        sa.Column('task_id', sa.Integer(), sa.ForeignKey('tasks.id', ondelete='CASCADE'), primary_key=True),
+        sa.Column('tag_id', sa.Integer(), sa.ForeignKey('tags.id', ondelete='CASCADE'), primary_key=True),
+    )
+    op.create_index('ix_task_tags_tag_id_task_id', 'task_tags', ['tag_id', 'task_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_task_tags_tag_id_task_id', table_name='task_tags')
+    op.drop_table('task_tags')
+    op.drop_table('tags')
@@ -0,0 +1,38 @@
+"""add tasks.parent_id for subtasks
+
+Revision ID: c3d81f5e27a9
+Revises: b7e2c94f1a36
+Create Date: 2026-10-19 15:00:00.000000+09:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3d81f5e27a9'
+down_revision: Union[str, None] = 'b7e2c94f1a36'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table('tasks') as batch_op:
+        batch_op.add_column(sa.Column('parent_id', sa.Integer(), nullable=True))
+        batch_op.create_foreign_key(
+            'fk_tasks_parent_id_tasks', 'tasks', ['parent_id'], ['id'], ondelete='SET NULL'
+        )
+        batch_op.create_index('ix_tasks_parent_id_status', ['parent_id', 'status'], unique=False)
+    # 아카이브는 값만 보존 (FK 없음)
+    op.add_column('tasks_archive', sa.Column('parent_id', sa.Integer(), nullable=True))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('tasks_archive') as batch_op:
+        batch_op.drop_column('parent_id')
+    with op.batch_alter_table('tasks') as batch_op:
+        batch_op.drop_index('ix_tasks_parent_id_status')
+        batch_op.drop_constraint('fk_tasks_parent_id_tasks', type_='foreignkey')
+        batch_op.drop_column('parent_id')
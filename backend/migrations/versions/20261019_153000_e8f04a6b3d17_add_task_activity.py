@@ -0,0 +1,38 @@
+"""add task_activity history table
+
+Revision ID: e8f04a6b3d17
+Revises: c3d81f5e27a9
+Create Date: 2026-10-19 15:30:00.000000+09:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e8f04a6b3d17'
+down_revision: Union[str, None] = 'c3d81f5e27a9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'task_activity',
+        sa.Column('id', sa.BigInteger().with_variant(sa.Integer(), 'sqlite'), primary_key=True),
+        sa.Column('task_id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.String(), nullable=False),
+        sa.Column('action', sa.String(length=16), nullable=False),
+        sa.Column('changes', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+    )
+    op.create_index('ix_task_activity_task_id_id', 'task_activity', ['task_id', 'id'], unique=False)
+    op.create_index('ix_task_activity_created_at', 'task_activity', ['created_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_task_activity_created_at', table_name='task_activity')
+    op.drop_index('ix_task_activity_task_id_id', table_name='task_activity')
+    op.drop_table('task_activity')
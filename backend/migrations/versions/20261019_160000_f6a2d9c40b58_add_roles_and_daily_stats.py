@@ -0,0 +1,64 @@
+"""add roles, tasks.completed_at and daily_task_stats
+
+Revision ID: f6a2d9c40b58
+Revises: e8f04a6b3d17
+Create Date: 2026-10-19 16:00:00.000000+09:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f6a2d9c40b58'
+down_revision: Union[str, None] = 'e8f04a6b3d17'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'roles',
+        sa.Column('user_id', sa.String(), sa.ForeignKey('users.id', ondelete='CASCADE'), primary_key=True),
+        sa.Column('admin_role', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('granted_at', sa.DateTime(), nullable=False),
+    )
+
+    op.add_column('tasks', sa.Column('completed_at', sa.DateTime(), nullable=True))
+    op.add_column('tasks_archive', sa.Column('completed_at', sa.DateTime(), nullable=True))
+    # 기존 done 태스크는 마지막 수정 시각을 완료 시각으로 간주
+    for name in ('tasks', 'tasks_archive'):
+        table = sa.table(name, sa.column('status', sa.String), sa.column('updated_at', sa.DateTime),
+                         sa.column('completed_at', sa.DateTime))
+        op.execute(table.update().where(table.c.status == 'done').values(completed_at=table.c.updated_at))
+    op.create_index('ix_tasks_created_at', 'tasks', ['created_at'], unique=False)
+    op.create_index('ix_tasks_completed_at', 'tasks', ['completed_at'], unique=False)
+    op.create_index('ix_tasks_archive_created_at', 'tasks_archive', ['created_at'], unique=False)
+    op.create_index('ix_tasks_archive_completed_at', 'tasks_archive', ['completed_at'], unique=False)
+
+    op.create_table(
+        'daily_task_stats',
+        sa.Column('day', sa.Date(), primary_key=True),
+        sa.Column('tasks_created', sa.Integer(), nullable=False),
+        sa.Column('tasks_completed', sa.Integer(), nullable=False),
+        sa.Column('completed_late', sa.Integer(), nullable=False),
+        sa.Column('active_users', sa.Integer(), nullable=False),
+        sa.Column('open_tasks', sa.Integer(), nullable=True),
+        sa.Column('overdue_open', sa.Integer(), nullable=True),
+        sa.Column('refreshed_at', sa.DateTime(), nullable=False),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('daily_task_stats')
+    op.drop_index('ix_tasks_archive_completed_at', table_name='tasks_archive')
+    op.drop_index('ix_tasks_archive_created_at', table_name='tasks_archive')
+    op.drop_index('ix_tasks_completed_at', table_name='tasks')
+    op.drop_index('ix_tasks_created_at', table_name='tasks')
+    with op.batch_alter_table('tasks_archive') as batch_op:
+        batch_op.drop_column('completed_at')
+    with op.batch_alter_table('tasks') as batch_op:
+        batch_op.drop_column('completed_at')
+    op.drop_table('roles')
@@ -0,0 +1,45 @@
+"""never reuse tasks.id on SQLite (ids must stay disjoint from tasks_archive)
+
+Without AUTOINCREMENT, SQLite hands out max(id) + 1, so the id of an
+archived task could be given to a new one. The table is rebuilt with
+AUTOINCREMENT and its sequence starts above every id in tasks_archive.
+PostgreSQL sequences never go back, so nothing changes there.
+
+Revision ID: a9c5e17b3f42
+Revises: f6a2d9c40b58
+Create Date: 2026-10-19 16:30:00.000000+09:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a9c5e17b3f42'
+down_revision: Union[str, None] = 'f6a2d9c40b58'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+    with op.batch_alter_table('tasks', recreate='always', table_kwargs={'sqlite_autoincrement': True}):
+        pass
+    # 복사 후 시퀀스는 tasks 의 최대 id. 아카이브 쪽 id 도 넘도록 올림
+    op.execute(
+        "INSERT INTO sqlite_sequence (name, seq) SELECT 'tasks', 0 "
+        "WHERE NOT EXISTS (SELECT 1 FROM sqlite_sequence WHERE name = 'tasks')"
+    )
+    op.execute(
+        "UPDATE sqlite_sequence SET seq = MAX(seq, (SELECT COALESCE(MAX(id), 0) FROM tasks_archive)) "
+        "WHERE name = 'tasks'"
+    )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+    with op.batch_alter_table('tasks', recreate='always', table_kwargs={'sqlite_autoincrement': False}):
+        pass
@@ -0,0 +1,54 @@
+"""keep task_tags rows of archived tasks
+
+task_tags.task_id may now point at tasks or tasks_archive (their ids
+are disjoint), so the foreign key to tasks is dropped; with it, moving
+a task to the archive deleted (PostgreSQL CASCADE) its tag links.
+Links already deleted by earlier archive runs cannot be recovered.
+
+Revision ID: c52e8d1f4a07
+Revises: a9c5e17b3f42
+Create Date: 2026-10-19 17:00:00.000000+09:00
+
+"""
+from typing import Optional, Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c52e8d1f4a07'
+down_revision: Union[str, None] = 'a9c5e17b3f42'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# SQLite 는 FK 에 이름이 없으므로 batch 재생성 시 이 규칙으로 이름을 붙여서 지움
+NAMING = {"fk": "fk_%(table_name)s_%(column_0_name)s_%(referred_table_name)s"}
+FK_NAME = 'fk_task_tags_task_id_tasks'
+
+
+def _task_fk_name() -> Optional[str]:
+    for fk in sa.inspect(op.get_bind()).get_foreign_keys('task_tags'):
+        if fk['referred_table'] == 'tasks':
+            return fk['name']
+    return None
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name == 'sqlite':
+        with op.batch_alter_table('task_tags', naming_convention=NAMING) as batch_op:
+            batch_op.drop_constraint(FK_NAME, type_='foreignkey')
+        return
+    name = _task_fk_name()
+    if name:
+        op.drop_constraint(name, 'task_tags', type_='foreignkey')
+
+
+def downgrade() -> None:
+    # 아카이브된 태스크의 연결은 FK 를 만족하지 않으므로 지움 (이전 동작과 같음)
+    op.execute("DELETE FROM task_tags WHERE task_id NOT IN (SELECT id FROM tasks)")
+    if op.get_bind().dialect.name == 'sqlite':
+        with op.batch_alter_table('task_tags') as batch_op:
+            batch_op.create_foreign_key(FK_NAME, 'tasks', ['task_id'], ['id'], ondelete='CASCADE')
+        return
+    op.create_foreign_key(None, 'task_tags', 'tasks', ['task_id'], ['id'], ondelete='CASCADE')
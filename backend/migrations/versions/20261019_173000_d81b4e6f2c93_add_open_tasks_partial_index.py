@@ -0,0 +1,33 @@
+"""add partial index on open tasks for the analytics snapshot
+
+Revision ID: d81b4e6f2c93
+Revises: c52e8d1f4a07
+Create Date: 2026-10-19 17:30:00.000000+09:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd81b4e6f2c93'
+down_revision: Union[str, None] = 'c52e8d1f4a07'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        'ix_tasks_open_due_date',
+        'tasks',
+        ['due_date', 'status'],
+        unique=False,
+        postgresql_where=sa.text("status != 'done'"),
+        sqlite_where=sa.text("status != 'done'"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_tasks_open_due_date', table_name='tasks')
@@ -1,3 +1,9 @@
 from .base import Base
 from .user import User
 from .task import Task, TaskStatus
+from .task_archive import TaskArchive
+from .session import UserSession
+from .tag import Tag, task_tags
+from .activity import TaskActivity
+from .role import Role
+from .analytics import DailyTaskStats
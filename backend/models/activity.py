@@ -0,0 +1,31 @@
+from sqlalchemy import BigInteger, Column, Index, Integer, String, Text
+from .base import Base
+from .types import UTCDateTime, utcnow
+
+
+class TaskActivity(Base):
+    """Append-only change log of tasks, written in batches by utils.activity.
+
+    Rows are never updated; ``task_id`` has no foreign key so the history
+    of a deleted (or archived) task is kept until retention prunes it.
+    """
+
+    __tablename__ = "task_activity"
+
+    # SQLite 는 INTEGER PRIMARY KEY 만 자동 증가하므로 변형 타입 사용
+    id = Column(BigInteger().with_variant(Integer, "sqlite"), primary_key=True)
+    task_id = Column(Integer, nullable=False)
+    # 변경한 유저
+    user_id = Column(String, nullable=False)
+    # create / update / move / delete
+    action = Column(String(16), nullable=False)
+    # 바뀐 필드만 {"field": [old, new]} 형태의 압축 JSON 으로 저장
+    changes = Column(Text, nullable=True)
+    created_at = Column(UTCDateTime, nullable=False, default=utcnow)
+
+    __table_args__ = (
+        # 태스크별 이력을 id 역순으로 키셋 페이지네이션
+        Index("ix_task_activity_task_id_id", "task_id", "id"),
+        # 보존 기간 지난 행 정리용
+        Index("ix_task_activity_created_at", "created_at"),
+    )
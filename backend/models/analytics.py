@@ -0,0 +1,24 @@
+from sqlalchemy import Column, Date, Integer
+from .base import Base
+from .types import UTCDateTime, utcnow
+
+
+class DailyTaskStats(Base):
+    """One row per UTC day, maintained incrementally by utils.analytics.
+
+    Admin reports read only this table, so they never scan ``tasks``.
+    """
+
+    __tablename__ = "daily_task_stats"
+
+    day = Column(Date, primary_key=True)
+    tasks_created = Column(Integer, nullable=False, default=0)
+    tasks_completed = Column(Integer, nullable=False, default=0)
+    # 마감을 넘겨서 완료된 수
+    completed_late = Column(Integer, nullable=False, default=0)
+    # 그날 태스크를 만들거나 고친 유저 수
+    active_users = Column(Integer, nullable=False, default=0)
+    # 그날 마지막 집계 시점의 스냅샷 (과거 데이터로 되살릴 수 없으므로 백필한 날은 NULL)
+    open_tasks = Column(Integer, nullable=True)
+    overdue_open = Column(Integer, nullable=True)
+    refreshed_at = Column(UTCDateTime, nullable=False, default=utcnow, onupdate=utcnow)
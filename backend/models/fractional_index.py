@@ -0,0 +1,153 @@
+"""Lexicographic order keys for manual ordering (fractional indexing).
+
+A key is an "integer part" whose length is encoded by its first
+character (``a0`` .. ``az``, ``b00`` .. and downwards ``Zz``, ``Yzz`` ..)
+followed by an optional fraction. Keys sort correctly as plain strings
+(byte order), and ``key_between`` can always produce a key strictly
+between two others, so moving an item rewrites only that item's key.
+
+Appending at either end only increments/decrements the integer part, so
+keys stay short; repeated inserts into the same gap grow the fraction by
+about one character per six inserts, which the rebalancer resets.
+"""
+from typing import Iterator, Optional
+
+DIGITS = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz"
+_ZERO = DIGITS[0]
+_SMALLEST_INTEGER = "A" + _ZERO * 26
+
+
+def _midpoint(a: str, b: Optional[str]) -> str:
+    """Fraction strictly between ``a`` and ``b`` (``b=None`` means +infinity)."""
+    if b is not None and a >= b:
+        raise ValueError(f"{a!r} >= {b!r}")
+    if a[-1:] == _ZERO or (b and b[-1:] == _ZERO):
+        raise ValueError("trailing zero")
+    if b:
+        # 공통 접두사는 그대로 두고 나머지 부분의 중간값을 구함
+        n = 0
+        while (a[n] if n < len(a) else _ZERO) == b[n]:
+            n += 1
+        if n > 0:
+            return b[:n] + _midpoint(a[n:], b[n:])
+    digit_a = DIGITS.index(a[0]) if a else 0
+    digit_b = DIGITS.index(b[0]) if b is not None else len(DIGITS)
+    if digit_b - digit_a > 1:
+        return DIGITS[(digit_a + digit_b + 1) // 2]
+    if b is not None and len(b) > 1:
+        return b[:1]
+    return DIGITS[digit_a] + _midpoint(a[1:], None)
+
+
+def _integer_length(head: str) -> int:
+    if "a" <= head <= "z":
+        return ord(head) - ord("a") + 2
+    if "A" <= head <= "Z":
+        return ord("Z") - ord(head) + 2
+    raise ValueError(f"invalid order key head: {head!r}")
+
+
+def _integer_part(key: str) -> str:
+    length = _integer_length(key[0])
+    if length > len(key):
+        raise ValueError(f"invalid order key: {key!r}")
+    return key[:length]
+
+
+def validate_key(key: str) -> None:
+    if key == _SMALLEST_INTEGER:
+        raise ValueError(f"invalid order key: {key!r}")
+    integer = _integer_part(key)
+    if key[len(integer):][-1:] == _ZERO:
+        raise ValueError(f"invalid order key: {key!r}")
+
+
+def _increment_integer(x: str) -> Optional[str]:
+    head, digits = x[0], list(x[1:])
+    for i in reversed(range(len(digits))):
+        d = DIGITS.index(digits[i]) + 1
+        if d == len(DIGITS):
+            digits[i] = _ZERO
+        else:
+            digits[i] = DIGITS[d]
+            return head + "".join(digits)
+    if head == "Z":
+        return "a" + _ZERO
+    if head == "z":
+        return None
+    head = chr(ord(head) + 1)
+    if head > "a":
+        digits.append(_ZERO)
+    else:
+        digits.pop()
+    return head + "".join(digits)
+
+
+def _decrement_integer(x: str) -> Optional[str]:
+    head, digits = x[0], list(x[1:])
+    for i in reversed(range(len(digits))):
+        d = DIGITS.index(digits[i]) - 1
+        if d == -1:
+            digits[i] = DIGITS[-1]
+        else:
+            digits[i] = DIGITS[d]
+            return head + "".join(digits)
+    if head == "a":
+        return "Z" + DIGITS[-1]
+    if head == "A":
+        return None
+    head = chr(ord(head) - 1)
+    if head < "Z":
+        digits.append(DIGITS[-1])
+    else:
+        digits.pop()
+    return head + "".join(digits)
+
+
+def key_between(a: Optional[str], b: Optional[str]) -> str:
+    """A key sorting strictly after ``a`` and before ``b`` (None = open end)."""
+    if a is not None:
+        validate_key(a)
+    if b is not None:
+        validate_key(b)
+    if a is not None and b is not None and a >= b:
+        raise ValueError(f"{a!r} >= {b!r}")
+
+    if a is None:
+        if b is None:
+            return "a" + _ZERO
+        integer_b = _integer_part(b)
+        fraction_b = b[len(integer_b):]
+        if integer_b == _SMALLEST_INTEGER:
+            return integer_b + _midpoint("", fraction_b)
+        if integer_b < b:
+            return integer_b
+        result = _decrement_integer(integer_b)
+        if result is None:
+            raise ValueError("cannot decrement any more")
+        return result
+
+    integer_a = _integer_part(a)
+    fraction_a = a[len(integer_a):]
+    if b is None:
+        result = _increment_integer(integer_a)
+        return integer_a + _midpoint(fraction_a, None) if result is None else result
+
+    integer_b = _integer_part(b)
+    fraction_b = b[len(integer_b):]
+    if integer_a == integer_b:
+        return integer_a + _midpoint(fraction_a, fraction_b)
+    result = _increment_integer(integer_a)
+    if result is None:
+        raise ValueError("cannot increment any more")
+    if result < b:
+        return result
+    return integer_a + _midpoint(fraction_a, None)
+
+
+def sequential_keys(count: int, start: Optional[str] = None) -> Iterator[str]:
+    """``count`` short, increasing keys after ``start`` (used when rebalancing)."""
+    key = start
+    for _ in range(count):
+        key = key_between(key, None)
+        yield key
@@ -0,0 +1,18 @@
+from sqlalchemy import Column, ForeignKey, Integer, String
+from .base import Base
+from .types import UTCDateTime, utcnow
+
+
+# roles.admin_role 값
+ADMIN_ROLE = 1
+
+
+class Role(Base):
+    """Privileges of a user; users without a row have none."""
+
+    __tablename__ = "roles"
+
+    user_id = Column(String, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    # 0 = 일반, 1 = 관리자 (유저 간 통계, 백업)
+    admin_role = Column(Integer, nullable=False, default=0, server_default="0")
+    granted_at = Column(UTCDateTime, nullable=False, default=utcnow)
@@ -0,0 +1,16 @@
+from sqlalchemy import Column, String, ForeignKey
+from .base import Base
+from .types import UTCDateTime, utcnow
+
+
+class UserSession(Base):
+    """One login on one device. Only a SHA-256 of the session token is stored."""
+
+    __tablename__ = "sessions"
+
+    token_hash = Column(String(64), primary_key=True)
+    user_id = Column(String, ForeignKey("users.id"), nullable=False, index=True)
+    created_at = Column(UTCDateTime, nullable=False, default=utcnow)
+    expires_at = Column(UTCDateTime, nullable=False, index=True)
+    # 요청마다 쓰지 않고 utils.sessions 에서 모아서 일괄 갱신
+    last_seen_at = Column(UTCDateTime, nullable=True)
@@ -0,0 +1,30 @@
+from sqlalchemy import Column, ForeignKey, Index, Integer, String, Table, UniqueConstraint
+from .base import Base
+from .types import UTCDateTime, utcnow
+
+
+# 태스크 <-> 태그 연결. PK (task_id, tag_id) 는 태스크의 태그 조회용,
+# (tag_id, task_id) 인덱스는 태그로 태스크를 거르는 세미조인/개수 집계용 (둘 다 인덱스만 읽음).
+# task_id 는 tasks 또는 tasks_archive 의 id (둘은 겹치지 않음). 아카이브해도 연결이 남도록 tasks 로의 FK 는 없음
+task_tags = Table(
+    "task_tags",
+    Base.metadata,
+    Column("task_id", Integer, primary_key=True),
+    Column("tag_id", Integer, ForeignKey("tags.id", ondelete="CASCADE"), primary_key=True),
+    Index("ix_task_tags_tag_id_task_id", "tag_id", "task_id"),
+)
+
+
+class Tag(Base):
+    """A user's label; names are unique per user."""
+
+    __tablename__ = "tags"
+
+    id = Column(Integer, primary_key=True)
+    user_id = Column(String, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    name = Column(String(50), nullable=False)
+    created_at = Column(UTCDateTime, nullable=False, default=utcnow)
+
+    __table_args__ = (
+        UniqueConstraint("user_id", "name", name="uq_tags_user_id_name"),
+    )
@@ -1,7 +1,10 @@
 # backend/models/task.py
-from sqlalchemy import Column, Integer, String, Text, DateTime, func, ForeignKey
-from datetime import datetime
+from sqlalchemy import Column, Integer, String, Text, Float, Index, func, ForeignKey, event, literal, select, text
+from sqlalchemy.orm import query_expression, relationship
+from datetime import datetime, timedelta
 from .base import Base
+from .types import UTCDateTime, as_utc, utcnow
+from .fractional_index import key_between
 import enum
 
 # 문자열 기반의 상태 Enum (FastAPI/Pydantic과 호환이 쉬움)
@@ -19,12 +22,119 @@ class Task(Base):
     # SQLite 호환을 위해 문자열로 저장
     status = Column(String(20), nullable=False, default=TaskStatus.todo)
     priority = Column(Integer, nullable=False, default=3)
-    due_date = Column(DateTime, nullable=True)
+    # 모든 시각은 UTC 로 저장하고 aware datetime 으로 돌려줌
+    due_date = Column(UTCDateTime, nullable=True)
+    # 반복 규칙 (RRULE 형식, utils.recurrence). due_date 는 아직 완료하지 않은 현재 회차
+    recurrence = Column(String(200), nullable=True)
+    # 수동 정렬 키 (models.fractional_index). 바이트 순서로 비교해야 하므로 PostgreSQL 에서는 "C" 콜레이션
+    rank = Column(String(255).with_variant(String(255, collation="C"), "postgresql"), nullable=True)
+    # done 이 된 시각 (done 이 아니면 NULL). 일별 완료 집계용
+    completed_at = Column(UTCDateTime, nullable=True)
+    # "다음에 할 일" 정렬 키 (작을수록 먼저). 쓰기 시점에 compute_urgency 로 갱신
+    urgency = Column(Float, nullable=True)
     
     # ForeignKey to link to the user who owns the task
     user_id = Column(String, ForeignKey("users.id"), nullable=False, index=True)
+    # 상위 태스크 (서브태스크/체크리스트). 상위가 삭제되면 최상위로 올라옴
+    parent_id = Column(Integer, ForeignKey("tasks.id", ondelete="SET NULL", name="fk_tasks_parent_id_tasks"), nullable=True)
 
-    # 서버(데이터베이스)에서 자동으로 현재시각을 채움
-    created_at = Column(DateTime, nullable=False, server_default=func.now())
+    # 현재시각(UTC)을 자동으로 채움. DB 의 now() 는 세션 타임존에 따라 달라지므로 앱에서 채우고,
+    # server_default 는 ORM 을 거치지 않는 INSERT 용으로 남겨둠
+    created_at = Column(UTCDateTime, nullable=False, default=utcnow, server_default=func.now())
     # 업데이트될 때마다 자동으로 현재시각으로 갱신
-    updated_at = Column(DateTime, nullable=False, server_default=func.now(), onupdate=func.now())
+    updated_at = Column(UTCDateTime, nullable=False, default=utcnow, server_default=func.now(), onupdate=utcnow)
+    # 태그는 목록 한 페이지 분을 IN 쿼리 한 번으로 읽음 (N+1 방지)
+    # task_tags.task_id 에는 FK 가 없으므로 조인 조건을 직접 지정
+    tags = relationship(
+        "Tag",
+        secondary="task_tags",
+        primaryjoin="Task.id == task_tags.c.task_id",
+        secondaryjoin="Tag.id == task_tags.c.tag_id",
+        lazy="selectin",
+        order_by="Tag.name",
+    )
+    # 서브태스크 진행도. utils.subtasks.with_progress 로 같은 SELECT 안에서 채움 (기본 0)
+    subtasks_total = query_expression(default_expr=literal(0))
+    subtasks_done = query_expression(default_expr=literal(0))
+    # 낙관적 동시성 제어용. UPDATE/DELETE 는 항상 "WHERE id=? AND version=?" 로 나감
+    version = Column(Integer, nullable=False, default=1, server_default="1")
+
+    __table_args__ = (
+        Index("ix_tasks_user_id_urgency", "user_id", "urgency"),
+        Index("ix_tasks_user_id_due_date", "user_id", "due_date"),
+        Index("ix_tasks_user_id_rank", "user_id", "rank"),
+        # 서브태스크 진행도 집계/트리 탐색용 (인덱스만 읽고 끝남)
+        Index("ix_tasks_parent_id_status", "parent_id", "status"),
+        # 리마인더 엔진이 전체 유저의 다가오는 마감을 구간 단위로 읽을 때 사용
+        Index("ix_tasks_due_date", "due_date"),
+        # 아카이브 대상(오래된 done) 탐색용
+        Index("ix_tasks_status_updated_at", "status", "updated_at"),
+        # 일별 집계(utils.analytics)에서 날짜 범위로 읽음
+        Index("ix_tasks_created_at", "created_at"),
+        Index("ix_tasks_completed_at", "completed_at"),
+        # 열린 태스크 수 스냅샷용 부분 인덱스 (status 도 넣어서 인덱스만 읽음). 쌓이기만 하는 done 행은 들어가지 않음
+        Index(
+            "ix_tasks_open_due_date",
+            "due_date",
+            "status",
+            postgresql_where=text("status != 'done'"),
+            sqlite_where=text("status != 'done'"),
+        ),
+        # 아카이브로 옮긴 id 를 SQLite 가 재사용하지 않도록 (tasks_archive 와 id 가 겹치면 안 됨)
+        {"sqlite_autoincrement": True},
+    )
+    __mapper_args__ = {"version_id_col": version}
+
+
+# 우선도 1단계 = 마감 하루 당김, 마감이 없으면 생성 후 7일을 마감으로 간주,
+# 생성된 지 하루 지날 때마다 0.1일씩 당김
+URGENCY_PRIORITY_STEP = timedelta(days=1).total_seconds()
+URGENCY_NO_DUE_HORIZON = timedelta(days=7)
+URGENCY_AGE_WEIGHT = 0.1
+
+
+def _epoch(value: datetime) -> float:
+    return as_utc(value).timestamp()
+
+
+def compute_urgency(priority, due_date, created_at) -> float:
+    """Time-invariant ranking key for "what should I do next" (lower = sooner).
+
+    The score ``priority + due proximity + age`` is linear in the current
+    time, so ``now`` drops out of the ordering and the key can be stored
+    and indexed instead of being recomputed per query.
+    """
+    created_at = created_at or utcnow()
+    deadline = due_date or (created_at + URGENCY_NO_DUE_HORIZON)
+    priority = 3 if priority is None else priority
+    return (
+        _epoch(deadline)
+        - priority * URGENCY_PRIORITY_STEP
+        + URGENCY_AGE_WEIGHT * _epoch(created_at)
+    )
+
+
+@event.listens_for(Task, "before_insert")
+@event.listens_for(Task, "before_update")
+def _refresh_urgency(mapper, connection, target):
+    target.urgency = compute_urgency(target.priority, target.due_date, target.created_at)
+
+
+@event.listens_for(Task, "before_insert")
+def _assign_rank(mapper, connection, target):
+    # 새 태스크는 수동 정렬의 맨 위에 둠. (user_id, rank) 인덱스로 MIN 한 번만 읽음
+    if target.rank is None:
+        first = connection.scalar(
+            select(func.min(Task.__table__.c.rank)).where(Task.__table__.c.user_id == target.user_id)
+        )
+        target.rank = key_between(None, first)
+
+
+@event.listens_for(Task, "before_insert")
+@event.listens_for(Task, "before_update")
+def _track_completion(mapper, connection, target):
+    if target.status == TaskStatus.done:
+        if target.completed_at is None:
+            target.completed_at = utcnow()
+    else:
+        target.completed_at = None
@@ -0,0 +1,35 @@
+# backend/models/task_archive.py
+from sqlalchemy import Column, Index, Table
+from .base import Base
+from .task import Task
+from .types import UTCDateTime, utcnow
+
+
+def _archived_columns():
+    # tasks 와 같은 컬럼 구성을 유지 (id 는 원래 값을 그대로 옮기므로 autoincrement 없음)
+    for column in Task.__table__.columns:
+        yield Column(
+            column.name,
+            column.type,
+            primary_key=column.primary_key,
+            autoincrement=False,
+            nullable=column.nullable,
+        )
+
+
+tasks_archive = Table(
+    "tasks_archive",
+    Base.metadata,
+    *_archived_columns(),
+    Column("archived_at", UTCDateTime, nullable=False, default=utcnow),
+    Index("ix_tasks_archive_user_id_created_at", "user_id", "created_at"),
+    # utils.analytics.compute_days 가 유저 구분 없이 날짜 범위로 훑음
+    Index("ix_tasks_archive_created_at", "created_at"),
+    Index("ix_tasks_archive_completed_at", "completed_at"),
+)
+
+
+class TaskArchive(Base):
+    """Completed tasks moved out of the hot ``tasks`` table by utils.archive."""
+
+    __table__ = tasks_archive
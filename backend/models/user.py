@@ -13,6 +13,4 @@ class User(Base):
     mail = Column(String, unique=True, nullable=False, index=True)
     password = Column(String, nullable=False)
     avatar_url = Column(String, nullable=True)
-    
-    # Session-based authentication
-    session_id = Column(String, nullable=True, unique=True, index=True)
+    # 세션은 models.session.UserSession (기기별 1행) 에서 관리
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Import-time profile of the backend app.
+
+Runs ``python -X importtime -c "import main"`` in a fresh interpreter and
+reports the slowest modules, so startup cost can be tracked in CI.
+
+Usage:
+  python profile_startup.py [--top N] [--json] [--budget-ms MS]
+
+With ``--budget-ms`` the script exits with status 1 when the total import
+time of ``main`` exceeds the budget.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+
+def run_importtime(module: str = "main") -> str:
+    env = dict(os.environ)
+    env.setdefault("PYTHONDONTWRITEBYTECODE", "1")
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    if proc.returncode != 0:
+        raise SystemExit(f"import {module} failed:\n{proc.stderr}")
+    return proc.stderr
+
+
+def parse_importtime(output: str) -> list[dict]:
+    """Parse ``-X importtime`` lines into dicts with self/cumulative microseconds."""
+    rows = []
+    for line in output.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line.split(":", 1)[1].split("|")
+        name = name.rstrip()
+        depth = (len(name) - len(name.lstrip())) // 2
+        rows.append({
+            "module": name.strip(),
+            "self_us": int(self_us),
+            "cumulative_us": int(cumulative_us),
+            "depth": depth,
+        })
+    return rows
+
+
+def build_report(rows: list[dict], module: str = "main", top: int = 20) -> dict:
+    root = next((r for r in reversed(rows) if r["module"] == module), None)
+    total_us = root["cumulative_us"] if root else sum(r["self_us"] for r in rows)
+    slowest = sorted(rows, key=lambda r: r["cumulative_us"], reverse=True)[:top]
+    return {
+        "module": module,
+        "total_ms": round(total_us / 1000, 1),
+        "modules_imported": len(rows),
+        "slowest": [
+            {
+                "module": r["module"],
+                "cumulative_ms": round(r["cumulative_us"] / 1000, 1),
+                "self_ms": round(r["self_us"] / 1000, 1),
+            }
+            for r in slowest
+        ],
+    }
+
+
+def print_report(report: dict) -> None:
+    print(f"=== import {report['module']}: {report['total_ms']} ms ({report['modules_imported']} modules) ===")
+    print(f"{'cumulative(ms)':>14} {'self(ms)':>9}  module")
+    print("-" * 60)
+    for row in report["slowest"]:
+        print(f"{row['cumulative_ms']:>14} {row['self_ms']:>9}  {row['module']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--module", default="main")
+    parser.add_argument("--top", type=int, default=20)
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    parser.add_argument("--budget-ms", type=float, default=None)
+    args = parser.parse_args()
+
+    report = build_report(parse_importtime(run_importtime(args.module)), args.module, args.top)
+    if args.json:
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+    else:
+        print_report(report)
+
+    if args.budget_ms is not None and report["total_ms"] > args.budget_ms:
+        print(f"❌ import time {report['total_ms']} ms exceeds budget {args.budget_ms} ms", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
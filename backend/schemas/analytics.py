@@ -0,0 +1,50 @@
+# backend/schemas/analytics.py
+from datetime import date, datetime
+from typing import List, Optional
+
+from pydantic import BaseModel
+
+
+def ratio(part: Optional[int], whole: Optional[int]) -> Optional[float]:
+    if part is None or not whole:
+        return None
+    return round(part / whole, 4)
+
+
+class DailyStatsOut(BaseModel):
+    day: date
+    tasks_created: int
+    tasks_completed: int
+    completed_late: int
+    active_users: int
+    # 그날 마지막 집계 시점의 미완료/기한 초과 수 (백필한 날은 null)
+    open_tasks: Optional[int] = None
+    overdue_open: Optional[int] = None
+    overdue_ratio: Optional[float] = None
+
+    class Config:
+        from_attributes = True
+
+    @classmethod
+    def from_row(cls, row) -> "DailyStatsOut":
+        out = cls.model_validate(row)
+        out.overdue_ratio = ratio(row.overdue_open, row.open_tasks)
+        return out
+
+
+class AnalyticsTotals(BaseModel):
+    tasks_created: int
+    tasks_completed: int
+    completed_late: int
+    # 완료된 것 중 마감을 넘긴 비율
+    completed_late_ratio: Optional[float] = None
+    # 기간 중 가장 많았던 하루 활성 유저 수
+    peak_active_users: int
+
+
+class AnalyticsOut(BaseModel):
+    days: List[DailyStatsOut]
+    totals: AnalyticsTotals
+    # 가장 최근 스냅샷 기준 미완료 태스크 중 기한 초과 비율
+    overdue_ratio: Optional[float] = None
+    refreshed_at: Optional[datetime] = None
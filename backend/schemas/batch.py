@@ -0,0 +1,30 @@
+# backend/schemas/batch.py
+from typing import List
+
+from pydantic import BaseModel, Field, field_validator
+
+from utils.batch import BATCH_MAX_REQUESTS, is_batchable
+
+
+class BatchItem(BaseModel):
+    id: str = Field(min_length=1, max_length=64)
+    # 쿼리 문자열 포함 경로 (예: "/tasks/?limit=50")
+    path: str = Field(min_length=1, max_length=2000)
+
+    @field_validator("path")
+    @classmethod
+    def check_path(cls, v: str) -> str:
+        if not is_batchable(v):
+            raise ValueError("バッチで実行できないパスです")
+        return v
+
+
+class BatchRequest(BaseModel):
+    requests: List[BatchItem] = Field(min_length=1, max_length=BATCH_MAX_REQUESTS)
+
+    @field_validator("requests")
+    @classmethod
+    def unique_ids(cls, v: List[BatchItem]) -> List[BatchItem]:
+        if len({item.id for item in v}) != len(v):
+            raise ValueError("id が重複しています")
+        return v
@@ -1,16 +1,38 @@
 # backend/schemas/task.py
-from pydantic import BaseModel, Field
-from datetime import datetime
-from typing import Optional, Literal
+import json
+
+from pydantic import AfterValidator, BaseModel, Field, StringConstraints, field_serializer, field_validator
+
+from utils.recurrence import normalize as _normalize_rule
+from datetime import datetime, timezone
+from typing import Annotated, List, Optional, Literal
 
 TaskStatus = Literal["todo", "in_progress", "done"]
 
+
+def _to_utc(value: datetime) -> datetime:
+    # 타임존이 없는 입력은 UTC 로 간주
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+# 입력은 UTC 로 정규화되고, 출력은 항상 "...Z" 가 붙은 ISO 8601 이 됨
+UTCDatetime = Annotated[datetime, AfterValidator(_to_utc)]
+# "FREQ=WEEKLY;BYDAY=MO,FR" 등. 잘못된 규칙은 422, 저장은 정규화된 형태로
+RecurrenceRule = Annotated[str, AfterValidator(_normalize_rule)]
+TagName = Annotated[str, StringConstraints(strip_whitespace=True, min_length=1, max_length=50)]
+
 class TaskBase(BaseModel):
     title: str = Field(min_length=1, max_length=200)
     description: Optional[str] = None
     status: TaskStatus = "todo"
     priority: int = 3
-    due_date: Optional[datetime] = None
+    due_date: Optional[UTCDatetime] = None
+    recurrence: Optional[RecurrenceRule] = Field(default=None, max_length=200)
+    tags: List[TagName] = Field(default_factory=list, max_length=20)
+    # 상위 태스크 id (서브태스크일 때)
+    parent_id: Optional[int] = None
 
 class TaskCreate(TaskBase):
     pass
@@ -20,12 +42,92 @@ class TaskUpdate(BaseModel):
     description: Optional[str] = None
     status: Optional[TaskStatus] = None
     priority: Optional[int] = None
-    due_date: Optional[datetime] = None
+    due_date: Optional[UTCDatetime] = None
+    recurrence: Optional[RecurrenceRule] = Field(default=None, max_length=200)
+    # 지정하면 태그 전체를 이 목록으로 바꿈
+    tags: Optional[List[TagName]] = Field(default=None, max_length=20)
+    # null 을 보내면 최상위 태스크로 옮김
+    parent_id: Optional[int] = None
+    # If-Match 헤더 대신 본문으로 기대 버전을 보낼 수도 있음
+    version: Optional[int] = None
+
+class TaskMove(BaseModel):
+    """Drop position for manual ordering: between ``after_id`` (above) and ``before_id`` (below)."""
+    after_id: Optional[int] = None
+    before_id: Optional[int] = None
+    # If-Match 헤더 대신 본문으로 기대 버전을 보낼 수도 있음
+    version: Optional[int] = None
 
 class TaskOut(TaskBase):
     id: int
-    created_at: datetime
-    updated_at: datetime
+    version: int
+    # 수동 정렬 키 (sort=manual 에서 오름차순)
+    rank: Optional[str] = None
+    created_at: UTCDatetime
+    updated_at: UTCDatetime
+    # 반복 태스크의 다음 회차를 조회 구간에서 펼친 가상 항목 (id 는 원본 태스크)
+    is_occurrence: bool = False
+    # 직속 서브태스크 수 / 그중 완료된 수
+    subtasks_total: int = 0
+    subtasks_done: int = 0
+
+    @field_validator("tags", mode="before")
+    @classmethod
+    def tag_names(cls, v):
+        # ORM 에서는 Tag 객체 목록으로 들어옴
+        return [getattr(tag, "name", tag) for tag in v or []]
+
+    @field_serializer("tags")
+    def dump_tag_names(self, v):
+        # 목록 응답은 ORM 객체를 검증 없이 바로 직렬화하므로 여기서도 이름으로 바꿈
+        return [getattr(tag, "name", tag) for tag in v]
+
+    class Config:
+        from_attributes = True
+
+
+class TaskTree(TaskOut):
+    children: List["TaskTree"] = Field(default_factory=list)
+
+
+class TaskActivityOut(BaseModel):
+    id: int
+    task_id: int
+    user_id: str
+    action: str
+    # {"field": [old, new]}
+    changes: dict = Field(default_factory=dict)
+    created_at: UTCDatetime
+
+    @field_validator("changes", mode="before")
+    @classmethod
+    def decode_changes(cls, v):
+        # DB 에는 압축 JSON 문자열로 저장됨
+        if v is None:
+            return {}
+        return json.loads(v) if isinstance(v, str) else v
 
     class Config:
         from_attributes = True
+
+
+class TaskHistory(BaseModel):
+    items: List[TaskActivityOut]
+    # 다음 페이지는 before_id=next_before_id 로 요청 (없으면 마지막 페이지)
+    next_before_id: Optional[int] = None
+
+
+class TagCount(BaseModel):
+    name: str
+    count: int
+
+
+class CalendarDay(BaseModel):
+    date: str  # YYYY-MM-DD
+    count: int
+    tasks: List[TaskOut] = []
+
+
+class CalendarOut(BaseModel):
+    month: str  # YYYY-MM
+    days: List[CalendarDay]
@@ -0,0 +1,125 @@
+"""Shared fixtures: one in-memory SQLite schema per test process, one rolled-back transaction per test.
+
+The environment is set before any application module is imported, so
+``database.engine`` itself is the in-memory engine (StaticPool) and
+password hashing uses the cheapest bcrypt cost. Each ``pytest -n auto``
+worker is a separate process with its own database.
+"""
+import os
+import shutil
+import tempfile
+
+os.environ["DATABASE_URL"] = "sqlite://"
+os.environ["DATABASE_REPLICA_URLS"] = ""
+os.environ["BCRYPT_ROUNDS"] = "4"
+os.environ["SKIP_WARMUP"] = "1"
+os.environ["BACKGROUND_WORKERS"] = "0"
+os.environ["AVATAR_DIR"] = tempfile.mkdtemp(prefix="avatars-")
+os.environ.pop("SESSION_REDIS_URL", None)
+os.environ.pop("RATE_LIMIT_REDIS_URL", None)
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+from database import SessionLocal, engine, get_db
+from main import app
+from models import Base
+from utils.activity import activity_log
+from utils.idempotency import store as idempotency_store
+from utils.rate_limit import limiter
+from utils.sessions import session_store
+
+
+# pysqlite 는 SAVEPOINT 를 제대로 다루지 못하므로 트랜잭션 시작을 SQLAlchemy 가 직접 내보내게 함
+@event.listens_for(engine, "connect")
+def _disable_pysqlite_transactions(dbapi_connection, connection_record):
+    dbapi_connection.isolation_level = None
+
+
+@event.listens_for(engine, "begin")
+def _emit_begin(conn):
+    conn.exec_driver_sql("BEGIN")
+
+
+@pytest.fixture(scope="session", autouse=True)
+def schema():
+    Base.metadata.create_all(bind=engine)
+    yield
+    Base.metadata.drop_all(bind=engine)
+    shutil.rmtree(os.environ["AVATAR_DIR"], ignore_errors=True)
+
+
+def _reset_process_state() -> None:
+    """Forget what earlier tests left in the in-process caches (rate limit buckets, sessions, replays)."""
+    limiter.backend.reset()
+    session_store.cache.clear()
+    idempotency_store.clear()
+
+
+@pytest.fixture
+def connection(schema):
+    """A connection inside an outer transaction that is rolled back after the test."""
+    conn = engine.connect()
+    outer = conn.begin()
+    # 앱의 commit() 은 SAVEPOINT 만 끝내므로 테스트가 끝나면 전부 되돌려짐.
+    # 요청 밖에서 SessionLocal() 을 쓰는 코드(이력 flush 등)도 같은 연결을 씀
+    SessionLocal.configure(bind=conn, join_transaction_mode="create_savepoint")
+    _reset_process_state()
+    try:
+        yield conn
+    finally:
+        # 큐에 남은 이력이 다음 테스트의 DB 로 새어 들어가지 않게 이 트랜잭션 안에서 비움
+        activity_log.flush()
+        SessionLocal.configure(bind=engine, join_transaction_mode="conservative_savepoint")
+        outer.rollback()
+        conn.close()
+
+
+def _test_session():
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+@pytest.fixture
+def db(connection):
+    """Session for arranging data and asserting on it directly."""
+    yield from _test_session()
+
+
+@pytest.fixture
+def client(connection):
+    """TestClient without the lifespan (no warm-up, no workers, no draining on exit)."""
+    app.dependency_overrides[get_db] = _test_session
+    # get_read_db 는 덮어쓰지 않음: 복제본이 없으면 SessionLocal (= 테스트 연결) 을 쓰고, /batch 의 공유 세션도 그대로 동작
+    test_client = TestClient(app)
+    try:
+        yield test_client
+    finally:
+        test_client.close()
+        app.dependency_overrides.clear()
+
+
+def register_and_login(client: TestClient, mail: str = "user@example.com", password: str = "secret123") -> dict:
+    """Create an account and log the client in; returns the profile."""
+    profile = client.post("/users/register", json={"name": "テスト", "mail": mail, "password": password})
+    assert profile.status_code == 201, profile.text
+    login = client.post("/users/login", json={"mail": mail, "password": password})
+    assert login.status_code == 200, login.text
+    return profile.json()
+
+
+@pytest.fixture
+def login(client):
+    """``login(mail)`` registers ``mail`` and switches ``client`` to that account."""
+    return lambda mail="user@example.com", password="secret123": register_and_login(client, mail, password)
+
+
+@pytest.fixture
+def user_client(client):
+    """``client`` already logged in as a registered user (``client.profile``)."""
+    client.profile = register_and_login(client)
+    return client
@@ -0,0 +1,43 @@
+def _batch(client, *paths):
+    response = client.post("/batch", json={"requests": [{"id": str(i), "path": p} for i, p in enumerate(paths)]})
+    assert response.status_code == 200, response.text
+    return response.json()["responses"]
+
+
+def test_batch_returns_each_sub_response(user_client):
+    task = user_client.post("/tasks/", json={"title": "first paint"}).json()
+
+    me, tasks, detail, missing = _batch(
+        user_client, "/users/me", "/tasks/?limit=10", f"/tasks/{task['id']}", "/tasks/999999"
+    )
+    assert me["status"] == 200 and me["body"]["id"] == user_client.profile["id"]
+    assert tasks["status"] == 200 and [t["id"] for t in tasks["body"]] == [task["id"]]
+    assert detail["body"]["title"] == "first paint" and "etag" in detail["headers"]
+    # 하나가 실패해도 나머지는 그대로
+    assert missing["status"] == 404
+
+
+def test_batch_requires_login(client):
+    response = client.post("/batch", json={"requests": [{"id": "me", "path": "/users/me"}]})
+    assert response.status_code == 401
+    # 게스트를 만들지 않음
+    assert "session_id" not in client.cookies
+
+
+def test_batch_rejects_unbatchable_paths(user_client):
+    for path in ("/admin/analytics", "/tasks/reminders/stream", "/batch"):
+        response = user_client.post("/batch", json={"requests": [{"id": "x", "path": path}]})
+        assert response.status_code == 422, path
+
+
+def test_batch_charges_one_token_per_sub_request(user_client):
+    from utils.rate_limit import limiter
+
+    def session_tokens():
+        return next(tokens for key, (tokens, _) in limiter.backend._buckets.items() if key.startswith("rl:default:sid:"))
+
+    user_client.get("/users/me")
+    before = session_tokens()
+    assert len(_batch(user_client, *["/users/me"] * 5)) == 5
+    # 리필분이 조금 더해질 수 있으므로 4개 이상 줄었는지만 확인
+    assert session_tokens() <= before - 4
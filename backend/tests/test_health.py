@@ -0,0 +1,14 @@
+def test_live(client):
+    assert client.get("/health/live").json() == {"status": "alive"}
+
+
+def test_full_gate_does_not_flip_readiness(client):
+    from utils.gates import image_gate
+
+    image_gate.in_flight = image_gate.limit
+    try:
+        response = client.get("/health/ready")
+        assert response.status_code == 200, response.json()
+        assert response.json()["checks"]["gates"]["image"]["in_flight"] == image_gate.limit
+    finally:
+        image_gate.in_flight = 0
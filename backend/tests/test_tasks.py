@@ -0,0 +1,309 @@
+def _create(client, **fields):
+    response = client.post("/tasks/", json={"title": "task", **fields})
+    assert response.status_code == 201, response.text
+    return response.json()
+
+
+def test_anonymous_client_gets_guest_session(client):
+    response = client.get("/tasks/")
+    assert response.status_code == 200
+    assert response.json() == []
+    assert client.cookies.get("session_id")
+
+
+def test_create_and_get_task(user_client):
+    task = _create(user_client, title="買い物", priority=1, tags=["home", "Errand"])
+    assert task["title"] == "買い物"
+    assert sorted(task["tags"]) == ["Errand", "home"]
+
+    response = user_client.get(f"/tasks/{task['id']}")
+    assert response.status_code == 200
+    assert response.json()["id"] == task["id"]
+
+
+def test_list_filters_by_status_and_tag(user_client):
+    _create(user_client, title="a", tags=["work"])
+    _create(user_client, title="b", status="done", tags=["work"])
+    _create(user_client, title="c")
+
+    titles = lambda params: sorted(t["title"] for t in user_client.get("/tasks/", params=params).json())  # noqa: E731
+    assert titles({}) == ["a", "b", "c"]
+    assert titles({"status_in": "done"}) == ["b"]
+    assert titles({"tags": "work"}) == ["a", "b"]
+
+
+def test_update_and_history(user_client):
+    task = _create(user_client, title="draft")
+    response = user_client.patch(f"/tasks/{task['id']}", json={"title": "final", "status": "in_progress"})
+    assert response.status_code == 200
+    assert response.json()["title"] == "final"
+
+    history = user_client.get(f"/tasks/{task['id']}/history").json()["items"]
+    assert [item["action"] for item in history] == ["update", "create"]
+    assert history[0]["changes"]["title"] == ["draft", "final"]
+
+
+def test_subtask_progress(user_client):
+    parent = _create(user_client, title="parent")
+    _create(user_client, title="child 1", parent_id=parent["id"], status="done")
+    _create(user_client, title="child 2", parent_id=parent["id"])
+
+    body = user_client.get(f"/tasks/{parent['id']}").json()
+    assert (body["subtasks_done"], body["subtasks_total"]) == (1, 2)
+
+
+def test_moving_a_subtree_counts_its_height(user_client):
+    from utils.subtasks import MAX_SUBTASK_DEPTH
+
+    def chain(length):
+        ids = [_create(user_client)["id"]]
+        for _ in range(length):
+            ids.append(_create(user_client, parent_id=ids[-1])["id"])
+        return ids
+
+    half = MAX_SUBTASK_DEPTH // 2
+    target, moved = chain(half), chain(half)
+    # 부모 쪽 깊이만 보면 통과하지만, 옮기는 서브트리까지 합치면 상한을 넘음
+    response = user_client.patch(f"/tasks/{moved[0]}", json={"parent_id": target[-1]})
+    assert response.status_code == 422
+    assert user_client.patch(f"/tasks/{moved[0]}", json={"parent_id": target[0]}).status_code == 200
+
+
+def test_delete_task(user_client):
+    task = _create(user_client)
+    assert user_client.delete(f"/tasks/{task['id']}").status_code == 204
+    assert user_client.get(f"/tasks/{task['id']}").status_code == 404
+
+
+def test_tasks_are_private_to_their_owner(client, login):
+    login("owner@example.com")
+    task = _create(client, title="secret")
+
+    login("other@example.com")
+    assert client.get(f"/tasks/{task['id']}").status_code == 404
+    assert client.get("/tasks/").json() == []
+
+
+def test_archived_ids_are_never_reused(user_client, db):
+    from datetime import timedelta
+
+    from models.task_archive import tasks_archive
+    from utils.archive import archive_done_tasks
+
+    kept = _create(user_client, title="a")
+    archived = _create(user_client, title="b", status="done")
+    assert archive_done_tasks(older_than=timedelta(0)) == 1
+
+    # SQLite 는 AUTOINCREMENT 가 없으면 최대 id 를 재사용함
+    fresh = _create(user_client, title="new")
+    assert fresh["id"] not in (kept["id"], archived["id"])
+
+    listed = user_client.get("/tasks/", params={"include_archived": "true"}).json()
+    assert sorted((t["id"], t["title"]) for t in listed) == sorted(
+        [(kept["id"], "a"), (archived["id"], "b"), (fresh["id"], "new")]
+    )
+    assert db.query(tasks_archive).count() == 1
+
+
+def test_archived_tasks_keep_their_tags(user_client):
+    from datetime import timedelta
+
+    from utils.archive import archive_done_tasks
+
+    archived = _create(user_client, title="old", status="done", tags=["work"])
+    _create(user_client, title="other", tags=["home"])
+    assert archive_done_tasks(older_than=timedelta(0)) == 1
+
+    listed = user_client.get("/tasks/", params={"include_archived": "true", "tags": "work"}).json()
+    assert [(t["id"], t["tags"]) for t in listed] == [(archived["id"], ["work"])]
+    # 아카이브를 포함하지 않으면 보이지 않음
+    assert user_client.get("/tasks/", params={"tags": "work"}).json() == []
+    # 태스크를 지우면 연결도 함께 지워짐 (FK 가 없어도 ORM 이 처리)
+    other = user_client.get("/tasks/", params={"tags": "home"}).json()[0]
+    assert user_client.delete(f"/tasks/{other['id']}").status_code == 204
+    assert {t["name"]: t["count"] for t in user_client.get("/tasks/tags").json()} == {"work": 1, "home": 0}
+
+
+def test_archive_skips_ids_already_in_archive(user_client, db):
+    from datetime import timedelta
+
+    from models.task_archive import tasks_archive
+    from models.types import utcnow
+    from utils.archive import archive_done_tasks
+
+    task = _create(user_client, title="reused id", status="done")
+    # AUTOINCREMENT 이전에 같은 id 가 이미 아카이브된 경우를 재현
+    columns = {c.name: None for c in tasks_archive.columns}
+    columns.update(id=task["id"], title="old", status="done", priority=3, user_id=user_client.profile["id"],
+                   created_at=utcnow(), updated_at=utcnow(), archived_at=utcnow(), version=1)
+    db.execute(tasks_archive.insert().values(**columns))
+    db.commit()
+
+    assert archive_done_tasks(older_than=timedelta(0)) == 0
+    assert user_client.get(f"/tasks/{task['id']}").json()["title"] == "reused id"
+
+
+def test_reminder_inside_lead_time_fires_immediately_once():
+    import time
+    from datetime import datetime, timedelta, timezone
+    from types import SimpleNamespace
+
+    from utils.reminders import ReminderEngine
+
+    engine = ReminderEngine(sinks=[], lead=15 * 60)
+    engine._loaded_until = time.time() + 3600
+    now = datetime.now(timezone.utc)
+    task = SimpleNamespace(id=1, user_id="u", title="soon", status="todo", due_date=now + timedelta(minutes=5))
+
+    # 마감까지 lead 보다 적게 남았으면 버리지 않고 바로 알림
+    engine.schedule(task)
+    assert [e.task_id for e in engine._pop_due(time.time())] == [1]
+    # 같은 마감으로 다시 저장해도 (제목 수정 등) 두 번 알리지 않음
+    engine.schedule(task)
+    assert engine._pop_due(time.time()) == []
+    # 마감을 바꾸면 새로 알림
+    task.due_date = now + timedelta(minutes=10)
+    engine.schedule(task)
+    assert [e.task_id for e in engine._pop_due(time.time())] == [1]
+    # 이미 지난 마감은 알리지 않음
+    task.due_date = now - timedelta(minutes=1)
+    engine.schedule(task)
+    assert engine._pop_due(time.time()) == []
+
+
+def test_activity_queue_drops_oldest_while_the_database_is_down(monkeypatch):
+    import utils.activity
+    from utils.activity import ActivityLog
+
+    attempts = []
+
+    def broken_session():
+        attempts.append(1)
+        raise RuntimeError("database is down")
+
+    monkeypatch.setattr(utils.activity, "SessionLocal", broken_session)
+    log = ActivityLog(max_pending=3)
+    for task_id in range(1, 7):
+        log.record(task_id, "u", "update")
+
+    # 상한에서 한 번만 요청 안에서 쓰기를 시도하고, 이후로는 오래된 것부터 버림
+    assert len(attempts) == 1
+    assert log.pending() == 3
+    assert log.dropped == 3
+    assert [row["task_id"] for row in log._pending] == [4, 5, 6]
+
+
+def test_generations_evict_only_the_least_recently_used_user():
+    from utils.singleflight import Generations
+
+    generations = Generations(max_entries=2)
+    a, b = generations.bump("a"), generations.bump("b")
+    generations.get("a")
+    c = generations.bump("c")
+
+    # b 만 밀려나고, a/c 의 값은 그대로
+    assert (generations.get("a"), generations.get("c")) == (a, c)
+    # 밀려난 유저는 자신이 쓴 적 있는 값 이상을 읽음 (이전 세대로 되돌아가지 않음)
+    assert generations.get("b") >= b
+    assert generations.get("never-written") not in (0, a, c)
+
+
+def test_rank_rebalance_bumps_versions(user_client, db):
+    from sqlalchemy import update
+
+    from models.task import Task
+    from utils.task_rank import rebalance_user
+
+    a, b, c = (_create(user_client, title=title) for title in "abc")
+    rebalance_user(db, user_client.profile["id"])
+    db.commit()
+
+    # 다시 매기기 전의 키로 계산한 이동은 409
+    stale = user_client.patch(f"/tasks/{a['id']}/move", json={"after_id": c["id"], "version": a["version"]})
+    assert stale.status_code == 409
+
+    # 키가 겹쳐서 이동 중에 다시 매기는 경우에도 자신의 이동은 충돌하지 않음
+    db.execute(update(Task).where(Task.id == b["id"]).values(rank=db.get(Task, c["id"]).rank))
+    db.commit()
+    # (같은 키끼리는 id 순이므로 b 가 c 보다 앞)
+    moved = user_client.patch(f"/tasks/{a['id']}/move", json={"after_id": b["id"], "before_id": c["id"]})
+    assert moved.status_code == 200, moved.text
+    titles = [task["title"] for task in user_client.get("/tasks/", params={"sort": "manual"}).json()]
+    assert titles == ["b", "a", "c"]
+
+
+def test_monthly_recurrence_keeps_the_local_day():
+    from datetime import datetime, timezone
+    from zoneinfo import ZoneInfo
+
+    from utils.recurrence import occurrences, parse_rule
+
+    jst = ZoneInfo("Asia/Tokyo")
+    # UTC 로는 전달 말일 23:00 이므로, UTC 로 펼치면 30일까지인 달 다음 달이 빠짐
+    start = datetime(2026, 2, 1, 8, tzinfo=jst).astimezone(timezone.utc)
+    dues = list(occurrences(parse_rule("FREQ=MONTHLY;TZID=Asia/Tokyo"), start, limit=6))
+    assert [due.astimezone(jst).strftime("%m-%d %H:%M") for due in dues] == [
+        "02-01 08:00", "03-01 08:00", "04-01 08:00", "05-01 08:00", "06-01 08:00", "07-01 08:00",
+    ]
+    assert all(due.tzinfo == timezone.utc for due in dues)
+
+
+def test_weekly_byday_recurrence_is_aligned_on_the_local_weekday(user_client):
+    # 2026-10-19 (월) 08:00 JST = 2026-10-18 (일) 23:00 UTC
+    task = _create(user_client, due_date="2026-10-19T08:00:00+09:00", recurrence="FREQ=WEEKLY;BYDAY=MO")
+    assert task["recurrence"] == "FREQ=WEEKLY;BYDAY=MO;TZID=Asia/Tokyo"
+    assert task["due_date"] == "2026-10-18T23:00:00Z"
+
+    response = user_client.patch(f"/tasks/{task['id']}", json={"status": "done"})
+    assert response.status_code == 200
+    assert response.json()["due_date"] == "2026-10-25T23:00:00Z"
+
+
+def test_reversed_move_is_rejected_without_rebalancing(user_client, monkeypatch):
+    import endpoints.tasks
+
+    a, b, c = (_create(user_client, title=title) for title in "abc")
+    calls = []
+    monkeypatch.setattr(endpoints.tasks, "rebalance_user", lambda *args: calls.append(args))
+
+    # 새 태스크가 위로 가므로 b 가 a 보다 앞. after=a, before=b 는 순서가 뒤바뀐 요청
+    response = user_client.patch(f"/tasks/{c['id']}/move", json={"after_id": a["id"], "before_id": b["id"]})
+    assert response.status_code == 422
+    assert calls == []
+
+
+def test_reminder_resync_picks_up_writes_of_other_processes(user_client, db):
+    import time
+    from datetime import datetime, timedelta, timezone
+
+    from models.task import Task
+    from utils.reminders import ReminderEngine
+
+    # 이 엔진은 API 의 schedule() 을 받지 않음 (다른 워커의 엔진과 같은 처지)
+    engine = ReminderEngine(sinks=[], lead=15 * 60, resync=60)
+    engine._loaded_until = time.time() + 3600
+    due = datetime.now(timezone.utc) + timedelta(minutes=5)
+    task = _create(user_client, title="soon", due_date=due.isoformat())
+    later = _create(user_client, title="later", due_date=(due + timedelta(hours=2)).isoformat())
+
+    assert engine._resync(time.time()) == 1
+    assert set(engine._scheduled) == {task["id"]}
+
+    db.get(Task, task["id"]).status = "done"
+    db.commit()
+    engine._resync(time.time())
+    assert engine._scheduled == {}
+    assert later["id"] not in engine._scheduled
+
+
+def test_open_task_snapshot_counts_open_and_overdue(user_client, db):
+    from datetime import datetime, timedelta, timezone
+
+    from utils.analytics import open_task_snapshot
+
+    now = datetime.now(timezone.utc)
+    _create(user_client, due_date=(now - timedelta(days=1)).isoformat())
+    _create(user_client, due_date=(now + timedelta(days=1)).isoformat())
+    _create(user_client)
+    _create(user_client, status="done", due_date=(now - timedelta(days=1)).isoformat())
+    assert open_task_snapshot(db, now) == (3, 1)
@@ -0,0 +1,156 @@
+from models.user import User
+
+
+def test_register_normalizes_mail_and_hashes_password(client, db):
+    response = client.post(
+        "/users/register", json={"name": " テスト ", "mail": " User@Example.COM ", "password": "secret123"}
+    )
+    assert response.status_code == 201
+    body = response.json()
+    assert body["name"] == "テスト"
+    assert body["mail"] == "user@example.com"
+
+    user = db.get(User, body["id"])
+    assert user.password != "secret123"
+    # 테스트에서는 bcrypt 비용을 낮춤
+    assert user.password.startswith("$2b$04$")
+
+
+def test_register_rejects_duplicate_mail(client, login):
+    login("dup@example.com")
+    response = client.post("/users/register", json={"name": "x", "mail": "dup@example.com", "password": "secret123"})
+    assert response.status_code == 409
+
+
+def test_login_sets_session_cookie_and_me_returns_profile(user_client):
+    assert user_client.cookies.get("session_id")
+    response = user_client.get("/users/me")
+    assert response.status_code == 200
+    assert response.json()["id"] == user_client.profile["id"]
+
+
+def test_login_with_wrong_password_is_rejected(client, login):
+    login("someone@example.com")
+    response = client.post("/users/login", json={"mail": "someone@example.com", "password": "wrong-password"})
+    assert response.status_code == 401
+
+
+def test_me_requires_session(client):
+    assert client.get("/users/me").status_code == 401
+
+
+def test_logout_revokes_session(user_client):
+    token = user_client.cookies.get("session_id")
+    assert user_client.post("/users/logout").status_code == 200
+    response = user_client.get("/users/me", headers={"Authorization": f"Bearer {token}"})
+    assert response.status_code == 401
+
+
+def test_each_test_starts_with_an_empty_database(db):
+    # 앞선 테스트에서 만든 유저는 롤백되어 남아 있지 않아야 함
+    assert db.query(User).count() == 0
+
+
+def _png(color=(200, 30, 30), size=(640, 480)) -> bytes:
+    from io import BytesIO
+
+    from PIL import Image
+
+    buffer = BytesIO()
+    Image.new("RGB", size, color).save(buffer, "PNG")
+    return buffer.getvalue()
+
+
+def test_avatar_upload_serves_immutable_thumbnails(user_client):
+    response = user_client.post("/users/me/avatar", files={"file": ("me.png", _png(), "image/png")})
+    assert response.status_code == 200, response.text
+    url = response.json()["avatar_url"]
+    assert url.startswith("/api/users/avatars/") and url.endswith("/96.webp")
+
+    # 프런트엔드 프록시(/api) 를 빼면 백엔드 경로
+    thumbnail = user_client.get(url.removeprefix("/api"))
+    assert thumbnail.status_code == 200
+    assert thumbnail.headers["content-type"] == "image/webp"
+    assert "immutable" in thumbnail.headers["cache-control"]
+
+    cached = user_client.get(url.removeprefix("/api"), headers={"If-None-Match": thumbnail.headers["etag"]})
+    assert cached.status_code == 304
+
+    # 같은 이미지를 다시 올리면 같은 주소 (내용 주소 지정)
+    again = user_client.post("/users/me/avatar", files={"file": ("copy.png", _png(), "image/png")})
+    assert again.json()["avatar_url"] == url
+    # 업로드한 URL 은 프로필 저장 시 그대로 유지됨
+    assert user_client.patch("/users/me", json={"avatar_url": url}).json()["avatar_url"] == url
+
+
+def test_avatar_upload_rejects_non_images(user_client):
+    response = user_client.post("/users/me/avatar", files={"file": ("x.png", b"not an image", "image/png")})
+    assert response.status_code == 422
+    assert user_client.get("/users/avatars/" + "0" * 32 + "/96.webp").status_code == 404
+
+
+def test_oversized_avatar_is_rejected_before_parsing(user_client):
+    from utils.avatars import AVATAR_MAX_UPLOAD_BYTES
+
+    response = user_client.post(
+        "/users/me/avatar",
+        content=b"x" * 16,
+        headers={"Content-Type": "multipart/form-data; boundary=x", "Content-Length": str(AVATAR_MAX_UPLOAD_BYTES * 2)},
+    )
+    assert response.status_code == 413
+
+    # Content-Length 없이 흘려보내도 상한을 넘는 순간 끊김
+    def chunks():
+        yield b"--x\r\nContent-Disposition: form-data; name=\"file\"; filename=\"a.png\"\r\n\r\n"
+        for _ in range(AVATAR_MAX_UPLOAD_BYTES // (1024 * 1024) + 2):
+            yield b"\0" * (1024 * 1024)
+
+    response = user_client.post(
+        "/users/me/avatar", content=chunks(), headers={"Content-Type": "multipart/form-data; boundary=x"}
+    )
+    assert response.status_code == 413
+
+
+def test_avatar_gc_keeps_only_referenced_masters(tmp_path, db, user_client):
+    from utils.avatars import AvatarStore, avatar_url
+
+    store = AvatarStore(root=str(tmp_path), sizes=(16, 32))
+    kept = store.save(_png((1, 2, 3)))
+    dropped = store.save(_png((4, 5, 6)))
+    db.get(User, user_client.profile["id"]).avatar_url = avatar_url(kept, 32)
+    db.flush()
+
+    # 유예 시간 안의 master 는 (아직 커밋 전일 수 있으므로) 건드리지 않음
+    assert store.collect_garbage(grace=3600) == 0
+    assert store.collect_garbage(grace=-1) == 1
+    assert store.thumbnail(kept, 16) is not None
+    assert store.thumbnail(dropped, 16) is None
+
+
+def test_thumbnail_cache_evicts_and_rerenders(tmp_path):
+    from utils.avatars import AvatarStore
+
+    store = AvatarStore(root=str(tmp_path), sizes=(16, 32), max_bytes=1)
+    digest = store.save(_png())
+    # 상한이 작아서 가장 최근 썸네일 하나만 남음
+    assert not (tmp_path / "thumbs" / digest[:2] / f"{digest}_16.webp").exists()
+    assert store.thumbnail(digest, 16) is not None
+    assert (tmp_path / "thumbs" / digest[:2] / f"{digest}_16.webp").exists()
+    assert store.thumbnail(digest, 64) is None
+
+
+def test_bcrypt_gate_only_covers_the_hash(client, login):
+    from utils.gates import bcrypt_gate
+
+    login("gate@example.com")
+    assert bcrypt_gate.in_flight == 0
+    bcrypt_gate.in_flight = bcrypt_gate.limit
+    try:
+        response = client.post("/users/login", json={"mail": "gate@example.com", "password": "secret123"})
+        assert response.status_code == 503
+        assert response.headers["retry-after"] == "1"
+        # bcrypt 를 쓰지 않는 요청은 게이트와 상관없음
+        assert client.get("/users/me").status_code == 200
+    finally:
+        bcrypt_gate.in_flight = 0
+
@@ -0,0 +1,172 @@
+import json
+import os
+import threading
+import time
+from datetime import date, datetime, timedelta
+from typing import Iterable, List, Optional
+
+from sqlalchemy import delete, inspect, insert, select
+
+from database import SessionLocal
+from models.activity import TaskActivity
+from models.task import Task
+from models.types import utcnow
+from utils.background import PeriodicWorker, register
+
+
+ACTIVITY_FLUSH_SECONDS = float(os.getenv("ACTIVITY_FLUSH_SECONDS", "2"))
+# 큐가 이만큼 쌓이면 기록하는 쪽에서 바로 씀. 그래도 못 쓰면 (DB 장애) 오래된 것부터 버려서 이 크기를 넘지 않음
+ACTIVITY_QUEUE_MAX = int(os.getenv("ACTIVITY_QUEUE_MAX", "10000"))
+ACTIVITY_RETENTION_DAYS = float(os.getenv("ACTIVITY_RETENTION_DAYS", "180"))
+ACTIVITY_PRUNE_BATCH_SIZE = int(os.getenv("ACTIVITY_PRUNE_BATCH_SIZE", "5000"))
+ACTIVITY_PRUNE_INTERVAL_SECONDS = float(os.getenv("ACTIVITY_PRUNE_INTERVAL_SECONDS", str(6 * 60 * 60)))
+
+# 이력에 남기는 필드 (rank/urgency/version 같은 내부 값은 제외)
+TRACKED_FIELDS = ("title", "description", "status", "priority", "due_date", "recurrence", "parent_id")
+
+
+def _plain(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+def field_changes(task: Task, fields: Iterable[str] = TRACKED_FIELDS) -> dict:
+    """``{"field": [old, new]}`` for the pending (not yet flushed) edits of ``task``."""
+    state = inspect(task)
+    changes = {}
+    for name in fields:
+        history = state.attrs[name].history
+        if not history.added:
+            continue
+        old = history.deleted[0] if history.deleted else None
+        new = history.added[0]
+        if old != new:
+            changes[name] = [_plain(old), _plain(new)]
+    return changes
+
+
+def snapshot(task: Task, fields: Iterable[str] = TRACKED_FIELDS) -> dict:
+    """Non-empty field values of a new task, as ``{"field": [None, value]}``."""
+    return {
+        name: [None, _plain(getattr(task, name))]
+        for name in fields
+        if getattr(task, name) is not None
+    }
+
+
+def encode_changes(changes: Optional[dict]) -> Optional[str]:
+    if not changes:
+        return None
+    return json.dumps(changes, ensure_ascii=False, separators=(",", ":"))
+
+
+class ActivityLog:
+    """In-process queue of activity rows, written with one multi-row INSERT per flush.
+
+    Requests only append to a list under a lock, so recording adds no
+    database round trip to the write path; a crash loses at most the
+    last ``ACTIVITY_FLUSH_SECONDS`` of history. While the database keeps
+    rejecting writes the queue stays at ``max_pending`` rows by dropping
+    the oldest ones (counted in ``dropped``).
+    """
+
+    def __init__(self, max_pending: int = ACTIVITY_QUEUE_MAX):
+        self.max_pending = max_pending
+        self._pending: List[dict] = []
+        self._lock = threading.Lock()
+        # flush 가 동시에 두 번 돌면 같은 태스크의 이력 순서가 뒤바뀔 수 있으므로 직렬화
+        self._flush_lock = threading.Lock()
+        self.written = 0
+        self.dropped = 0
+        # 쓰기에 실패하면 이 시각 전까지는 요청 안에서 다시 시도하지 않음 (워커가 재시도)
+        self._retry_at = 0.0
+
+    def _trim(self) -> None:
+        # self._lock 을 잡은 상태에서 호출
+        excess = len(self._pending) - self.max_pending
+        if excess > 0:
+            del self._pending[:excess]
+            self.dropped += excess
+            print(f"⚠️ Dropped {excess} task activity rows (queue full)")
+
+    def record(self, task_id: int, user_id: str, action: str, changes: Optional[dict] = None) -> None:
+        row = {
+            "task_id": task_id,
+            "user_id": str(user_id),
+            "action": action,
+            "changes": encode_changes(changes),
+            "created_at": utcnow(),
+        }
+        with self._lock:
+            self._pending.append(row)
+            self._trim()
+            overflow = len(self._pending) >= self.max_pending and time.monotonic() >= self._retry_at
+        if overflow:
+            try:
+                self.flush()
+            except Exception as exc:  # 쓰기 실패로 요청까지 실패시키지는 않음 (큐에 남아 있음)
+                print(f"⚠️ Task activity flush failed: {exc}")
+
+    def flush(self) -> int:
+        with self._flush_lock:
+            with self._lock:
+                pending, self._pending = self._pending, []
+            if not pending:
+                return 0
+            db = None
+            try:
+                db = SessionLocal()
+                db.execute(insert(TaskActivity.__table__), pending)
+                db.commit()
+            except Exception:
+                if db is not None:
+                    db.rollback()
+                # 다음 주기에 다시 시도 (순서 유지를 위해 앞에 되돌림)
+                with self._lock:
+                    self._pending[:0] = pending
+                    self._trim()
+                    self._retry_at = time.monotonic() + ACTIVITY_FLUSH_SECONDS
+                raise
+            finally:
+                if db is not None:
+                    db.close()
+            self.written += len(pending)
+            return len(pending)
+
+    def pending(self) -> int:
+        with self._lock:
+            return len(self._pending)
+
+
+def prune_activity(
+    older_than: timedelta = timedelta(days=ACTIVITY_RETENTION_DAYS),
+    batch_size: int = ACTIVITY_PRUNE_BATCH_SIZE,
+) -> int:
+    """Delete history older than the retention period in short batches (created_at index)."""
+    table = TaskActivity.__table__
+    cutoff = utcnow() - older_than
+    removed = 0
+    while True:
+        db = SessionLocal()
+        try:
+            ids = db.scalars(
+                select(table.c.id).where(table.c.created_at < cutoff).order_by(table.c.created_at).limit(batch_size)
+            ).all()
+            if ids:
+                db.execute(delete(table).where(table.c.id.in_(ids)))
+                db.commit()
+        finally:
+            db.close()
+        removed += len(ids)
+        if len(ids) < batch_size:
+            break
+    if removed:
+        print(f"🧹 Pruned {removed} task activity rows older than {older_than.days} days")
+    return removed
+
+
+activity_log = ActivityLog()
+
+register(PeriodicWorker("task-activity", ACTIVITY_FLUSH_SECONDS, activity_log.flush, run_on_stop=True))
+register(PeriodicWorker("task-activity-prune", ACTIVITY_PRUNE_INTERVAL_SECONDS, prune_activity))
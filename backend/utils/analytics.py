@@ -0,0 +1,123 @@
+import os
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Optional
+
+from sqlalchemy import case, func, select, union
+from sqlalchemy.orm import Session
+
+from database import SessionLocal
+from models.activity import TaskActivity
+from models.analytics import DailyTaskStats
+from models.task import Task, TaskStatus
+from models.task_archive import tasks_archive
+from models.types import utcnow
+from utils.background import PeriodicWorker, register
+
+
+ANALYTICS_ROLLUP_INTERVAL_SECONDS = float(os.getenv("ANALYTICS_ROLLUP_INTERVAL_SECONDS", str(5 * 60)))
+# 집계 테이블이 비어 있을 때 처음 채우는 일수
+ANALYTICS_BACKFILL_DAYS = int(os.getenv("ANALYTICS_BACKFILL_DAYS", "90"))
+# 매 주기 다시 계산하는 최근 일수 (자정 직후 전날 분의 늦은 변경 반영)
+ANALYTICS_REFRESH_DAYS = int(os.getenv("ANALYTICS_REFRESH_DAYS", "2"))
+
+_tasks = Task.__table__
+_activity = TaskActivity.__table__
+
+
+def _as_date(value) -> date:
+    # SQLite 의 date() 는 문자열, PostgreSQL 은 date 를 돌려줌
+    return value if isinstance(value, date) else date.fromisoformat(str(value)[:10])
+
+
+def _day_start(day: date) -> datetime:
+    return datetime.combine(day, time.min, tzinfo=timezone.utc)
+
+
+def compute_days(db: Session, first: date, last: date) -> dict[date, dict]:
+    """Counters for every UTC day in ``[first, last]``, from range scans of the date indexes."""
+    lower, upper = _day_start(first), _day_start(last + timedelta(days=1))
+    days = {
+        first + timedelta(days=n): {"tasks_created": 0, "tasks_completed": 0, "completed_late": 0, "active_users": 0}
+        for n in range((last - first).days + 1)
+    }
+
+    # 아카이브로 옮겨진 태스크도 만든 날/완료한 날에 그대로 셈
+    for table in (_tasks, tasks_archive):
+        created_day = func.date(table.c.created_at)
+        for day, count in db.execute(
+            select(created_day, func.count())
+            .where(table.c.created_at >= lower, table.c.created_at < upper)
+            .group_by(created_day)
+        ):
+            days[_as_date(day)]["tasks_created"] += count
+
+        completed_day = func.date(table.c.completed_at)
+        late = case((table.c.completed_at > table.c.due_date, 1), else_=0)
+        for day, count, late_count in db.execute(
+            select(completed_day, func.count(), func.sum(late))
+            .where(table.c.completed_at >= lower, table.c.completed_at < upper)
+            .group_by(completed_day)
+        ):
+            stats = days[_as_date(day)]
+            stats["tasks_completed"] += count
+            stats["completed_late"] += late_count or 0
+
+    # 활동 = 그날 태스크를 만들었거나 (이력이 남는) 변경을 한 유저
+    touched = union(
+        select(func.date(_tasks.c.created_at).label("day"), _tasks.c.user_id)
+        .where(_tasks.c.created_at >= lower, _tasks.c.created_at < upper),
+        select(func.date(_activity.c.created_at).label("day"), _activity.c.user_id)
+        .where(_activity.c.created_at >= lower, _activity.c.created_at < upper),
+    ).subquery()
+    for day, count in db.execute(select(touched.c.day, func.count()).group_by(touched.c.day)):
+        days[_as_date(day)]["active_users"] = count
+    return days
+
+
+def open_task_snapshot(db: Session, now: datetime) -> tuple[int, int]:
+    """(open tasks, open tasks past their due date) right now.
+
+    The predicate matches the partial index ``ix_tasks_open_due_date``
+    ((due_date, status) WHERE status != 'done'), so only open tasks are
+    read, from the index alone; done tasks, which keep piling up, are
+    never scanned.
+    """
+    # 부분 인덱스 조건과 글자 그대로 같아야 플래너가 그 인덱스를 씀
+    is_open = _tasks.c.status != TaskStatus.done.value
+    overdue = case((_tasks.c.due_date < now, 1), else_=0)
+    total, late = db.execute(select(func.count(), func.sum(overdue)).where(is_open)).one()
+    return total, late or 0
+
+
+def refresh_rollups(now: Optional[datetime] = None) -> int:
+    """Recompute the last few days of ``daily_task_stats`` (all of the backfill window on first run)."""
+    now = now or utcnow()
+    today = now.date()
+    db = SessionLocal()
+    try:
+        latest = db.scalar(select(func.max(DailyTaskStats.day)))
+        first = today - timedelta(days=ANALYTICS_REFRESH_DAYS - 1)
+        if latest is None:
+            first = today - timedelta(days=ANALYTICS_BACKFILL_DAYS - 1)
+        elif latest < first:
+            # 워커가 며칠 멈춰 있었으면 빈 날부터 다시 채움
+            first = latest
+        days = compute_days(db, first, today)
+        days[today]["open_tasks"], days[today]["overdue_open"] = open_task_snapshot(db, now)
+
+        for day, values in days.items():
+            row = db.get(DailyTaskStats, day) or DailyTaskStats(day=day)
+            for key, value in values.items():
+                setattr(row, key, value)
+            row.refreshed_at = now
+            db.add(row)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+    return len(days)
+
+
+register(PeriodicWorker("analytics-rollup", ANALYTICS_ROLLUP_INTERVAL_SECONDS, refresh_rollups))
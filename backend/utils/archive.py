@@ -0,0 +1,103 @@
+import os
+import time
+from datetime import timedelta
+
+from sqlalchemy import and_, delete, exists, insert, literal, select
+
+from database import SessionLocal
+from models.task import Task, TaskStatus
+from models.task_archive import tasks_archive
+from models.types import utcnow
+from utils.background import PeriodicWorker, register
+from utils.singleflight import task_generations
+
+
+# done 상태로 이 기간 이상 수정되지 않은 태스크를 tasks_archive 로 옮김
+ARCHIVE_AFTER_DAYS = float(os.getenv("ARCHIVE_AFTER_DAYS", "30"))
+# 한 트랜잭션에서 옮기는 행 수. 작게 잘라서 쓰기 락을 짧게 유지
+ARCHIVE_BATCH_SIZE = int(os.getenv("ARCHIVE_BATCH_SIZE", "500"))
+# 한 번의 실행에서 처리할 최대 배치 수 (남은 분은 다음 주기에)
+ARCHIVE_MAX_BATCHES = int(os.getenv("ARCHIVE_MAX_BATCHES", "20"))
+ARCHIVE_INTERVAL_SECONDS = float(os.getenv("ARCHIVE_INTERVAL_SECONDS", str(10 * 60)))
+# 배치 사이에 쉬는 시간. 요청 처리 중인 트랜잭션에 락을 양보
+ARCHIVE_PAUSE_SECONDS = float(os.getenv("ARCHIVE_PAUSE_SECONDS", "0.05"))
+
+_TASK_COLUMNS = [column.name for column in Task.__table__.columns]
+
+
+def archive_batch(db, cutoff, batch_size: int = ARCHIVE_BATCH_SIZE) -> int:
+    """Move one batch of done tasks last updated before ``cutoff``; the caller commits."""
+    tasks = Task.__table__
+    parent = tasks.alias("parent")
+    child = tasks.alias("child")
+
+    def stale(table):
+        return and_(table.c.status == TaskStatus.done.value, table.c.updated_at < cutoff)
+
+    # 서브태스크는 부모가 옮겨진 뒤에만, 부모는 자식이 모두 오래된 done 일 때만 옮김.
+    # 진행도 집계는 tasks 만 보므로 남아있는 부모의 자식이 먼저 사라지면 안 됨
+    eligible = (
+        stale(tasks),
+        ~exists().where(parent.c.id == tasks.c.parent_id),
+        ~exists().where(child.c.parent_id == tasks.c.id, ~stale(child)),
+        # AUTOINCREMENT 이전에 재사용된 id 는 아카이브에 이미 있으므로 옮기지 않고 남겨둠
+        # (PK 충돌로 배치 전체가 롤백되고 같은 배치를 계속 재시도하지 않도록)
+        ~exists().where(tasks_archive.c.id == tasks.c.id),
+    )
+    # (status, updated_at) 인덱스 범위만 읽음. PostgreSQL 에서는 수정 중인 행을 건너뜀
+    rows = db.execute(
+        select(tasks.c.id, tasks.c.user_id)
+        .where(*eligible)
+        .order_by(tasks.c.updated_at)
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+    ).all()
+    if not rows:
+        return 0
+    ids = [row.id for row in rows]
+    archived_at = literal(utcnow(), type_=tasks_archive.c.archived_at.type)
+    # 조회 후 다시 열린(done 이 아니게 된) 태스크는 옮기지 않도록 조건을 한 번 더 붙임
+    db.execute(
+        insert(tasks_archive).from_select(
+            _TASK_COLUMNS + ["archived_at"],
+            select(*[tasks.c[name] for name in _TASK_COLUMNS], archived_at)
+            .where(tasks.c.id.in_(ids), *eligible),
+        )
+    )
+    # 위 INSERT 로 실제로 옮겨진 행만 지움 (ids 에는 아카이브와 겹치는 id 가 없으므로 방금 넣은 것뿐).
+    # task_tags 는 그대로 둠: id 가 같으므로 아카이브 쪽에서도 태그 필터/표시가 그대로 동작
+    moved = (tasks.c.id.in_(ids), exists().where(tasks_archive.c.id == tasks.c.id))
+    db.execute(delete(tasks).where(*moved))
+    for user_id in {row.user_id for row in rows}:
+        task_generations.bump(user_id)
+    return len(ids)
+
+
+def archive_done_tasks(
+    older_than: timedelta = timedelta(days=ARCHIVE_AFTER_DAYS),
+    batch_size: int = ARCHIVE_BATCH_SIZE,
+    max_batches: int = ARCHIVE_MAX_BATCHES,
+) -> int:
+    """Archive old done tasks in bounded batches, one short transaction each."""
+    cutoff = utcnow() - older_than
+    moved = 0
+    for _ in range(max_batches):
+        db = SessionLocal()
+        try:
+            count = archive_batch(db, cutoff, batch_size)
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+        moved += count
+        if count < batch_size:
+            break
+        time.sleep(ARCHIVE_PAUSE_SECONDS)
+    if moved:
+        print(f"📦 Archived {moved} done tasks older than {older_than.days} days")
+    return moved
+
+
+register(PeriodicWorker("task-archive", ARCHIVE_INTERVAL_SECONDS, archive_done_tasks))
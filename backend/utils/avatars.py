@@ -0,0 +1,254 @@
+import hashlib
+import io
+import os
+import re
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from sqlalchemy import select
+
+from database import SessionLocal
+from models.user import User
+from utils.background import PeriodicWorker, register
+from utils.startup import lazy_module
+
+
+# Pillow 는 아바타 라우트에서만 쓰므로 첫 사용 시점에 로드
+Image = lazy_module("PIL.Image")
+ImageOps = lazy_module("PIL.ImageOps")
+
+AVATAR_DIR = os.getenv("AVATAR_DIR", os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "avatars"))
+# 미리 만들어 두는 정사각형 썸네일 크기 (px). 가장 큰 것이 원본(master) 크기
+AVATAR_SIZES = tuple(sorted(int(s) for s in os.getenv("AVATAR_SIZES", "48,96,256").split(",")))
+AVATAR_DEFAULT_SIZE = int(os.getenv("AVATAR_DEFAULT_SIZE", "96"))
+AVATAR_MAX_UPLOAD_BYTES = int(os.getenv("AVATAR_MAX_UPLOAD_BYTES", str(5 * 1024 * 1024)))
+# 디코딩 전에 거르는 픽셀 수 (압축 폭탄 방지). draft() 축소는 JPEG 만 되므로 PNG 등은 이 크기로 통째로 풀림
+# (25MP RGBA ≈ 100MB, 동시 처리 수는 utils.gates.image_gate 로 제한)
+AVATAR_MAX_PIXELS = int(os.getenv("AVATAR_MAX_PIXELS", str(25_000_000)))
+# 썸네일 디렉터리 용량 상한. 넘으면 오래 안 쓴 것부터 지우고, 다시 요청되면 master 에서 새로 만듦
+AVATAR_THUMB_CACHE_MAX_BYTES = int(os.getenv("AVATAR_THUMB_CACHE_MAX_BYTES", str(256 * 1024 * 1024)))
+# 저장하는 avatar_url 앞부분. 프런트엔드는 /api/* 를 백엔드로 프록시함
+AVATAR_PUBLIC_PREFIX = os.getenv("AVATAR_PUBLIC_PREFIX", "/api").rstrip("/")
+# 어떤 유저도 쓰지 않는 master 를 지우는 주기와, 업로드 직후(커밋 전) master 를 건드리지 않는 유예 시간
+AVATAR_GC_INTERVAL_SECONDS = float(os.getenv("AVATAR_GC_INTERVAL_SECONDS", str(60 * 60)))
+AVATAR_GC_GRACE_SECONDS = float(os.getenv("AVATAR_GC_GRACE_SECONDS", str(60 * 60)))
+
+_ALLOWED_FORMATS = {"JPEG", "PNG", "WEBP", "GIF"}
+_DIGEST_RE = re.compile(r"^[0-9a-f]{32}$")
+
+
+class InvalidImage(ValueError):
+    pass
+
+
+def avatar_url(digest: str, size: int = AVATAR_DEFAULT_SIZE) -> str:
+    return f"{AVATAR_PUBLIC_PREFIX}/users/avatars/{digest}/{size}.webp"
+
+
+def is_local_avatar_url(url: str) -> bool:
+    prefix = f"{AVATAR_PUBLIC_PREFIX}/users/avatars/"
+    if not url.startswith(prefix):
+        return False
+    digest, _, name = url[len(prefix):].partition("/")
+    return bool(_DIGEST_RE.match(digest)) and name in {f"{size}.webp" for size in AVATAR_SIZES}
+
+
+def valid_digest(digest: str) -> bool:
+    return bool(_DIGEST_RE.match(digest))
+
+
+def _write_atomically(path: str, data: bytes) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def _encode(image) -> bytes:
+    buffer = io.BytesIO()
+    image.save(buffer, "WEBP", quality=85, method=4)
+    return buffer.getvalue()
+
+
+def _normalize(data: bytes):
+    """Decode an upload into the square master image (largest size)."""
+    master_size = AVATAR_SIZES[-1]
+    try:
+        image = Image.open(io.BytesIO(data))
+        if image.format not in _ALLOWED_FORMATS:
+            raise InvalidImage(image.format)
+        # 헤더만 읽은 상태에서 크기를 확인하고 나서 디코딩
+        if image.width * image.height > AVATAR_MAX_PIXELS:
+            raise InvalidImage("too many pixels")
+        # JPEG 는 DCT 단계에서 축소해서 읽음 (큰 사진도 디코딩 비용이 작음)
+        image.draft("RGB", (master_size, master_size))
+        image = ImageOps.exif_transpose(image)
+        image = image.convert("RGBA" if "A" in image.getbands() or "transparency" in image.info else "RGB")
+        return ImageOps.fit(image, (master_size, master_size), Image.Resampling.LANCZOS)
+    except InvalidImage:
+        raise
+    except Exception as exc:
+        raise InvalidImage(str(exc)) from exc
+
+
+class AvatarStore:
+    """Content-addressed avatars: one master per distinct upload plus an LRU of thumbnails.
+
+    Masters live under ``masters/`` (a few tens of KB each) and are kept
+    while some user's ``avatar_url`` points at them; ``collect_garbage``
+    removes the rest, so master disk usage is bounded by the number of
+    users with an uploaded avatar. Thumbnails under ``thumbs/`` are bounded
+    by ``max_bytes`` (least recently served first) and re-rendered from
+    the master on a miss. The LRU index is per process and rebuilt from
+    file mtimes on first use.
+    """
+
+    def __init__(self, root: str = AVATAR_DIR, sizes=AVATAR_SIZES, max_bytes: int = AVATAR_THUMB_CACHE_MAX_BYTES):
+        self.root = root
+        self.sizes = tuple(sizes)
+        self.max_bytes = max_bytes
+        self._index: Optional[OrderedDict[str, int]] = None
+        self._total = 0
+        self._lock = threading.Lock()
+
+    def master_path(self, digest: str) -> str:
+        return os.path.join(self.root, "masters", digest[:2], f"{digest}.webp")
+
+    def thumb_path(self, digest: str, size: int) -> str:
+        return os.path.join(self.root, "thumbs", digest[:2], f"{digest}_{size}.webp")
+
+    def _load_index(self) -> None:
+        entries = []
+        for directory, _, files in os.walk(os.path.join(self.root, "thumbs")):
+            for name in files:
+                if not name.endswith(".webp"):
+                    continue
+                path = os.path.join(directory, name)
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, path, stat.st_size))
+        entries.sort()
+        self._index = OrderedDict((path, size) for _, path, size in entries)
+        self._total = sum(self._index.values())
+
+    def _remember(self, path: str, nbytes: int) -> None:
+        with self._lock:
+            if self._index is None:
+                self._load_index()
+            self._total += nbytes - self._index.pop(path, 0)
+            self._index[path] = nbytes
+            evicted = []
+            while self._total > self.max_bytes and len(self._index) > 1:
+                old_path, old_size = self._index.popitem(last=False)
+                self._total -= old_size
+                evicted.append(old_path)
+        for old_path in evicted:
+            try:
+                os.remove(old_path)
+            except FileNotFoundError:
+                pass
+
+    def _touch(self, path: str) -> bool:
+        """Mark ``path`` as just served; False when it is not in this process's index."""
+        with self._lock:
+            if self._index is None:
+                self._load_index()
+            if path not in self._index:
+                return False
+            self._index.move_to_end(path)
+            return True
+
+    def _render_thumb(self, master, digest: str, size: int) -> str:
+        path = self.thumb_path(digest, size)
+        thumb = master if size == master.width else master.resize((size, size), Image.Resampling.LANCZOS)
+        data = _encode(thumb)
+        _write_atomically(path, data)
+        self._remember(path, len(data))
+        return path
+
+    def save(self, data: bytes) -> str:
+        """Store an upload (all sizes, once) and return its digest; re-uploads are free."""
+        digest = hashlib.sha256(data).hexdigest()[:32]
+        master_path = self.master_path(digest)
+        if os.path.exists(master_path):
+            return digest
+        master = _normalize(data)
+        _write_atomically(master_path, _encode(master))
+        for size in self.sizes:
+            self._render_thumb(master, digest, size)
+        return digest
+
+    def thumbnail(self, digest: str, size: int) -> Optional[str]:
+        """Path of the ``size`` thumbnail, re-rendered from the master if it was evicted."""
+        if size not in self.sizes or not valid_digest(digest):
+            return None
+        path = self.thumb_path(digest, size)
+        # 인덱스는 워커마다 따로이므로 디스크 기준으로 판단 (다른 워커가 만들었거나 지웠을 수 있음)
+        if os.path.exists(path):
+            if not self._touch(path):
+                self._remember(path, os.path.getsize(path))
+            return path
+        master_path = self.master_path(digest)
+        if not os.path.exists(master_path):
+            return None
+        with Image.open(master_path) as master:
+            master.load()
+            return self._render_thumb(master, digest, size)
+
+    def remove(self, digest: str) -> None:
+        paths = [self.master_path(digest)] + [self.thumb_path(digest, size) for size in self.sizes]
+        with self._lock:
+            for path in paths[1:]:
+                if self._index is not None and path in self._index:
+                    self._total -= self._index.pop(path)
+        for path in paths:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    def stored_digests(self, older_than: float) -> list[str]:
+        """Digests of masters last written before the epoch time ``older_than``."""
+        digests = []
+        for directory, _, files in os.walk(os.path.join(self.root, "masters")):
+            for name in files:
+                digest = name.removesuffix(".webp")
+                if valid_digest(digest) and os.path.getmtime(os.path.join(directory, name)) < older_than:
+                    digests.append(digest)
+        return digests
+
+    def collect_garbage(self, grace: float = AVATAR_GC_GRACE_SECONDS) -> int:
+        """Delete masters (and thumbnails) that no user's avatar_url references."""
+        candidates = self.stored_digests(time.time() - grace)
+        if not candidates:
+            return 0
+        prefix = f"{AVATAR_PUBLIC_PREFIX}/users/avatars/"
+        db = SessionLocal()
+        try:
+            urls = db.scalars(select(User.avatar_url).where(User.avatar_url.startswith(prefix))).all()
+        finally:
+            db.close()
+        referenced = {url[len(prefix):].partition("/")[0] for url in urls}
+        removed = 0
+        for digest in candidates:
+            if digest not in referenced:
+                self.remove(digest)
+                removed += 1
+        if removed:
+            print(f"🧹 Removed {removed} unused avatars")
+        return removed
+
+
+avatar_store = AvatarStore()
+
+register(PeriodicWorker("avatar-gc", AVATAR_GC_INTERVAL_SECONDS, avatar_store.collect_garbage))
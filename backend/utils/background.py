@@ -0,0 +1,72 @@
+import os
+import threading
+from typing import Callable, Protocol
+
+
+BACKGROUND_WORKERS_ENABLED = os.getenv("BACKGROUND_WORKERS", "1") == "1"
+
+
+class PeriodicWorker:
+    """Daemon thread calling ``fn`` every ``interval`` seconds until stopped."""
+
+    def __init__(self, name: str, interval: float, fn: Callable[[], object], run_on_stop: bool = False):
+        self.name = name
+        self.interval = interval
+        self.fn = fn
+        # 종료 시 한 번 더 실행 (버퍼를 비워야 하는 작업용)
+        self.run_on_stop = run_on_stop
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def _run_once(self) -> None:
+        try:
+            self.fn()
+        except Exception as exc:  # 한 번 실패해도 다음 주기에 다시 시도
+            print(f"⚠️ Background worker '{self.name}' failed: {exc}")
+
+    def _loop(self) -> None:
+        while not self._stop.wait(self.interval):
+            self._run_once()
+
+    def start(self) -> None:
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name=self.name, daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+        if self.run_on_stop:
+            self._run_once()
+
+
+class Worker(Protocol):
+    name: str
+
+    def start(self) -> None: ...
+
+    def stop(self, timeout: float = 5.0) -> None: ...
+
+
+_workers: list[Worker] = []
+
+
+def register(worker: Worker) -> Worker:
+    _workers.append(worker)
+    return worker
+
+
+def start_all() -> None:
+    if not BACKGROUND_WORKERS_ENABLED:
+        return
+    for worker in _workers:
+        worker.start()
+
+
+def stop_all() -> None:
+    for worker in reversed(_workers):
+        worker.stop()
@@ -0,0 +1,258 @@
+import gzip
+import os
+import shutil
+import sqlite3
+import tempfile
+import time
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from typing import Optional
+
+from sqlalchemy.engine import Engine
+
+from models.base import Base
+
+
+BACKUP_DIR = os.getenv("BACKUP_DIR", os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "backups"))
+# SQLite 온라인 백업에서 한 번에 복사할 페이지 수와 배치 사이 대기 시간.
+# 배치 사이에는 락을 놓으므로 그 동안 다른 요청이 쓸 수 있음
+BACKUP_PAGES_PER_STEP = int(os.getenv("BACKUP_PAGES_PER_STEP", "256"))
+BACKUP_STEP_SLEEP = float(os.getenv("BACKUP_STEP_SLEEP", "0.005"))
+_COPY_CHUNK = 1024 * 1024
+
+
+@dataclass
+class BackupResult:
+    path: str
+    bytes: int
+    seconds: float
+    dialect: str
+    compressed: bool
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+def default_backup_path(dialect: str, compress: bool = True, directory: str = BACKUP_DIR) -> str:
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    suffix = ".db" if dialect == "sqlite" else ".copy"
+    return os.path.join(directory, f"app-{stamp}{suffix}" + (".gz" if compress else ""))
+
+
+def _open(path: str, mode: str):
+    return gzip.open(path, mode, compresslevel=6) if path.endswith(".gz") else open(path, mode)
+
+
+def _replace_atomically(tmp_path: str, path: str) -> None:
+    # 중간에 실패해도 반쯤 쓴 백업 파일이 남지 않도록 임시 파일에 쓴 뒤 rename
+    os.replace(tmp_path, path)
+
+
+# --- SQLite ----------------------------------------------------------------
+
+def _sqlite_connection(engine: Engine):
+    raw = engine.raw_connection()
+    return raw, raw.driver_connection
+
+
+def backup_sqlite(
+    engine: Engine,
+    path: str,
+    pages: int = BACKUP_PAGES_PER_STEP,
+    sleep: float = BACKUP_STEP_SLEEP,
+) -> None:
+    """Consistent snapshot through ``sqlite3.Connection.backup``, copied ``pages`` at a time."""
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, snapshot = tempfile.mkstemp(suffix=".db", dir=directory)
+    os.close(fd)
+    raw, source = _sqlite_connection(engine)
+    try:
+        target = sqlite3.connect(snapshot)
+        try:
+            source.backup(target, pages=pages, sleep=sleep)
+        finally:
+            target.close()
+        if path.endswith(".gz"):
+            tmp_path = snapshot + ".gz"
+            with open(snapshot, "rb") as src, gzip.open(tmp_path, "wb", compresslevel=6) as dst:
+                shutil.copyfileobj(src, dst, _COPY_CHUNK)
+            os.remove(snapshot)
+        else:
+            tmp_path = snapshot
+        _replace_atomically(tmp_path, path)
+    except BaseException:
+        for leftover in (snapshot, snapshot + ".gz"):
+            if os.path.exists(leftover):
+                os.remove(leftover)
+        raise
+    finally:
+        raw.close()
+
+
+def restore_sqlite(engine: Engine, path: str) -> None:
+    """Overwrite the live database with ``path`` in a single backup step (pages=-1)."""
+    directory = os.path.dirname(os.path.abspath(path))
+    if path.endswith(".gz"):
+        fd, snapshot = tempfile.mkstemp(suffix=".db", dir=directory)
+        with os.fdopen(fd, "wb") as dst, gzip.open(path, "rb") as src:
+            shutil.copyfileobj(src, dst, _COPY_CHUNK)
+    else:
+        snapshot = path
+    # 풀에 남은 연결이 예전 스키마/페이지를 들고 있지 않도록 먼저 정리
+    engine.dispose()
+    raw, target = _sqlite_connection(engine)
+    try:
+        source = sqlite3.connect(snapshot)
+        try:
+            source.backup(target)
+        finally:
+            source.close()
+    finally:
+        raw.close()
+        if snapshot != path:
+            os.remove(snapshot)
+        engine.dispose()
+
+
+# --- PostgreSQL ------------------------------------------------------------
+#
+# pg_dump 의 plain 형식과 같은 모양으로 테이블마다
+#   COPY "tasks" ("id", ...) FROM stdin;
+#   <text 형식 행들>
+#   \.
+# 를 이어서 쓴다. text 형식은 개행을 이스케이프하므로 한 행이 항상 한 줄.
+
+_END_OF_COPY = "\\.\n"
+
+
+def _quote(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+
+def _copy_target(table) -> str:
+    return f"{_quote(table.name)} ({', '.join(_quote(c.name) for c in table.columns)})"
+
+
+class _CopySection:
+    """File-like view over one COPY section of a dump, ending at ``\\.``."""
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.done = False
+
+    def readline(self, size: int = -1) -> str:
+        if self.done:
+            return ""
+        line = self.stream.readline()
+        if not line or line == _END_OF_COPY:
+            self.done = True
+            return ""
+        return line
+
+    def read(self, size: int = -1) -> str:
+        chunks, total = [], 0
+        while size < 0 or total < size:
+            line = self.readline()
+            if not line:
+                break
+            chunks.append(line)
+            total += len(line)
+        return "".join(chunks)
+
+
+def backup_postgres(engine: Engine, path: str) -> None:
+    """Stream every model table out with ``COPY ... TO STDOUT`` inside one snapshot."""
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp_path = path + ".tmp"
+    raw = engine.raw_connection()
+    try:
+        cursor = raw.cursor()
+        # 모든 테이블을 같은 시점으로 읽기 위해 REPEATABLE READ 스냅샷 하나에서 복사
+        cursor.execute("SET TRANSACTION ISOLATION LEVEL REPEATABLE READ READ ONLY")
+        with _open(tmp_path, "wt") as out:
+            for table in Base.metadata.sorted_tables:
+                out.write(f"COPY {_copy_target(table)} FROM stdin;\n")
+                cursor.copy_expert(f"COPY {_copy_target(table)} TO STDOUT", out)
+                out.write(_END_OF_COPY)
+        raw.rollback()
+        _replace_atomically(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    finally:
+        raw.close()
+
+
+def restore_postgres(engine: Engine, path: str) -> None:
+    """Truncate the model tables and COPY the dump back in, all in one transaction."""
+    tables = Base.metadata.sorted_tables
+    raw = engine.raw_connection()
+    try:
+        cursor = raw.cursor()
+        cursor.execute("TRUNCATE " + ", ".join(_quote(t.name) for t in tables) + " CASCADE")
+        with _open(path, "rt") as dump:
+            for header in iter(dump.readline, ""):
+                if not header.startswith("COPY "):
+                    continue
+                cursor.copy_expert(header.rstrip().rstrip(";"), _CopySection(dump))
+        # COPY 는 시퀀스를 움직이지 않으므로 serial 컬럼의 다음 값을 맞춰줌
+        for table in tables:
+            column = table.autoincrement_column
+            if column is None:
+                continue
+            cursor.execute(
+                f"SELECT setval(pg_get_serial_sequence(%s, %s), "
+                f"COALESCE((SELECT MAX({_quote(column.name)}) FROM {_quote(table.name)}), 0) + 1, false)",
+                (table.name, column.name),
+            )
+        raw.commit()
+    except BaseException:
+        raw.rollback()
+        raise
+    finally:
+        raw.close()
+
+
+# --- entry points ----------------------------------------------------------
+
+def create_backup(
+    engine: Engine,
+    path: Optional[str] = None,
+    compress: bool = True,
+    pages: int = BACKUP_PAGES_PER_STEP,
+    sleep: float = BACKUP_STEP_SLEEP,
+) -> BackupResult:
+    """Back up ``engine``'s database; an explicit ``path`` is gzipped when it ends in ``.gz``."""
+    dialect = engine.dialect.name
+    path = path or default_backup_path(dialect, compress)
+    started = time.perf_counter()
+    if dialect == "sqlite":
+        backup_sqlite(engine, path, pages=pages, sleep=sleep)
+    elif dialect == "postgresql":
+        backup_postgres(engine, path)
+    else:
+        raise ValueError(f"Backups are not supported for {dialect}")
+    return BackupResult(
+        path=path,
+        bytes=os.path.getsize(path),
+        seconds=round(time.perf_counter() - started, 3),
+        dialect=dialect,
+        compressed=path.endswith(".gz"),
+    )
+
+
+def restore_backup(engine: Engine, path: str) -> float:
+    """Restore ``path`` into ``engine``'s database; returns elapsed seconds."""
+    if not os.path.exists(path):
+        raise FileNotFoundError(path)
+    dialect = engine.dialect.name
+    started = time.perf_counter()
+    if dialect == "sqlite":
+        restore_sqlite(engine, path)
+    elif dialect == "postgresql":
+        restore_postgres(engine, path)
+    else:
+        raise ValueError(f"Backups are not supported for {dialect}")
+    return round(time.perf_counter() - started, 3)
@@ -0,0 +1,91 @@
+import json
+import os
+from typing import Optional
+from urllib.parse import urlsplit
+
+
+# 한 번의 /batch 에 담을 수 있는 하위 요청 수
+BATCH_MAX_REQUESTS = int(os.getenv("BATCH_MAX_REQUESTS", "10"))
+# /batch 본문 상한. 레이트 리밋이 하위 요청 수를 세려고 본문을 먼저 읽으므로 작게 둠
+BATCH_MAX_BODY_BYTES = int(os.getenv("BATCH_MAX_BODY_BYTES", str(64 * 1024)))
+# 하위 요청으로 허용하는 경로 (읽기 전용 GET 만). SSE 처럼 끝나지 않는 응답은 제외
+BATCHABLE_PREFIXES = ("/tasks", "/users/me")
+UNBATCHABLE_PATHS = {"/tasks/reminders/stream"}
+
+# 하위 요청 scope 에 실어 보내는 공유 상태 (utils.replicas.get_read_db / utils.security 가 읽음)
+SHARED_SESSION_KEY = "batch.db"
+SHARED_USER_KEY = "batch.user"
+
+# 하위 요청에 그대로 넘기지 않는 헤더 (바깥 POST 의 본문/조건부 요청용)
+_DROPPED_HEADERS = {b"content-length", b"content-type", b"if-none-match", b"if-match", b"idempotency-key"}
+# 결과에 담아 돌려주는 하위 응답 헤더
+_RETURNED_HEADERS = ("etag", "cache-control", "retry-after")
+# 바깥 요청의 라우팅 결과는 하위 요청마다 새로 정해짐
+_ROUTING_KEYS = {"path", "raw_path", "query_string", "method", "headers", "route", "endpoint", "path_params"}
+
+
+def request_cost(body: bytes) -> int:
+    """Rate-limit tokens for a /batch body: one per sub-request (at least one)."""
+    try:
+        items = json.loads(body).get("requests")
+    except (ValueError, AttributeError):
+        return 1
+    # 상한을 넘는 묶음은 스키마 검증에서 422 가 되지만, 그래도 최대치만큼은 차감
+    return min(max(len(items), 1), BATCH_MAX_REQUESTS) if isinstance(items, list) else 1
+
+
+def is_batchable(path: str) -> bool:
+    route = urlsplit(path).path
+    if not route.startswith("/") or route in UNBATCHABLE_PATHS:
+        return False
+    return any(route == prefix or route.startswith(prefix + "/") for prefix in BATCHABLE_PREFIXES)
+
+
+async def dispatch(app, parent_scope: dict, path: str, shared: Optional[dict] = None) -> tuple[int, dict, bytes]:
+    """Run ``GET path`` through ``app`` in-process and return (status, headers, body).
+
+    ``parent_scope`` supplies the client, auth headers and exception
+    handlers; ``shared`` entries are added to the sub-request scope.
+    """
+    url = urlsplit(path)
+    scope = {key: value for key, value in parent_scope.items() if key not in _ROUTING_KEYS}
+    scope.update(
+        method="GET",
+        path=url.path,
+        raw_path=url.path.encode(),
+        query_string=url.query.encode(),
+        headers=[(name, value) for name, value in parent_scope["headers"] if name not in _DROPPED_HEADERS],
+        state={},
+        **(shared or {}),
+    )
+
+    status = 500
+    headers: dict[str, str] = {}
+    chunks: list[bytes] = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+            for name, value in message.get("headers", []):
+                headers[name.decode("latin-1").lower()] = value.decode("latin-1")
+        elif message["type"] == "http.response.body":
+            chunks.append(message.get("body", b""))
+
+    await app(scope, receive, send)
+    return status, headers, b"".join(chunks)
+
+
+def encode_part(request_id: str, status: int, headers: dict, body: bytes) -> bytes:
+    """One entry of the combined response; JSON bodies are embedded as-is (no re-parse)."""
+    if headers.get("content-type", "").startswith("application/json") and body:
+        encoded_body = body
+    else:
+        encoded_body = json.dumps(body.decode("utf-8", "replace") if body else None).encode()
+    returned = {name: headers[name] for name in _RETURNED_HEADERS if name in headers}
+    head = json.dumps({"id": request_id, "status": status, "headers": returned}, ensure_ascii=False)
+    # 마지막 "}" 를 떼고 body 를 이어 붙임
+    return head[:-1].encode() + b',"body":' + encoded_body + b"}"
@@ -0,0 +1,64 @@
+from fastapi import HTTPException
+
+from utils.avatars import AVATAR_MAX_UPLOAD_BYTES
+
+
+# 업로드 라우트별 요청 본문 상한 (multipart 경계/헤더 몫으로 64KiB 여유)
+BODY_LIMITS: dict[tuple[str, str], int] = {
+    ("POST", "/users/me/avatar"): AVATAR_MAX_UPLOAD_BYTES + 64 * 1024,
+}
+
+_TOO_LARGE = "ファイルが大きすぎます"
+
+
+async def _reject(send) -> None:
+    body = ('{"detail":"%s"}' % _TOO_LARGE).encode()
+    await send({
+        "type": "http.response.start",
+        "status": 413,
+        "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())],
+    })
+    await send({"type": "http.response.body", "body": body})
+
+
+class BodySizeLimitMiddleware:
+    """Rejects oversized upload bodies before they are parsed or spooled to disk.
+
+    A Content-Length over the limit is answered with 413 right away;
+    without one (chunked), reading stops with 413 as soon as the
+    received bytes pass the limit.
+    """
+
+    def __init__(self, app, limits: dict[tuple[str, str], int] = BODY_LIMITS):
+        self.app = app
+        self.limits = limits
+
+    async def __call__(self, scope, receive, send):
+        limit = self.limits.get((scope.get("method"), scope.get("path"))) if scope["type"] == "http" else None
+        if limit is None:
+            await self.app(scope, receive, send)
+            return
+
+        for name, value in scope["headers"]:
+            if name == b"content-length":
+                try:
+                    declared = int(value)
+                except ValueError:
+                    declared = limit + 1
+                if declared > limit:
+                    await _reject(send)
+                    return
+
+        received = 0
+
+        async def limited_receive():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > limit:
+                    # FastAPI 는 본문을 읽다 난 HTTPException 을 그대로 응답으로 돌려줌
+                    raise HTTPException(status_code=413, detail=_TOO_LARGE)
+            return message
+
+        await self.app(scope, limited_receive, send)
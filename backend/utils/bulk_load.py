@@ -0,0 +1,221 @@
+import random
+import uuid
+from datetime import datetime, timedelta
+from itertools import chain, islice
+from typing import Iterable, Iterator, Optional
+
+from sqlalchemy import Table, insert
+from sqlalchemy.engine import Engine
+
+from models.task import Task, TaskStatus, compute_urgency
+from models.types import utcnow
+from models.user import User
+from models.fractional_index import sequential_keys
+from utils.security import get_password_hash
+
+
+# SQLite executemany / PostgreSQL COPY 버퍼 한 번에 담는 행 수
+BULK_BATCH_SIZE = 10_000
+
+
+def _column_defaults(table: Table, keys: Iterable[str]) -> dict:
+    """Python-side defaults (scalar or callable) for columns missing from the rows."""
+    keys = set(keys)
+    defaults = {}
+    for column in table.columns:
+        if column.name in keys or column.default is None or column is table.autoincrement_column:
+            continue
+        default = column.default
+        if default.is_scalar:
+            defaults[column.name] = lambda value=default.arg: value
+        elif default.is_callable:
+            # SQLAlchemy 가 인자 없는 함수도 context 하나를 받도록 감싸 둠
+            defaults[column.name] = lambda fn=default.arg: fn(None)
+    return defaults
+
+
+def _complete_rows(table: Table, rows: Iterable[dict]) -> tuple[list[str], Iterator[dict]]:
+    rows = iter(rows)
+    first = next(rows, None)
+    if first is None:
+        return [], iter(())
+    defaults = _column_defaults(table, first)
+    columns = [c.name for c in table.columns if c.name in first or c.name in defaults]
+
+    def completed():
+        for row in chain([first], rows):
+            for name, make in defaults.items():
+                if name not in row:
+                    row[name] = make()
+            yield row
+
+    return columns, completed()
+
+
+def _batches(rows: Iterable[dict], size: int) -> Iterator[list[dict]]:
+    rows = iter(rows)
+    while batch := list(islice(rows, size)):
+        yield batch
+
+
+# --- PostgreSQL COPY -------------------------------------------------------
+
+_COPY_ESCAPES = str.maketrans({"\\": "\\\\", "\t": "\\t", "\n": "\\n", "\r": "\\r"})
+
+
+def _copy_value(value) -> str:
+    if value is None:
+        return "\\N"
+    if isinstance(value, bool):
+        return "t" if value else "f"
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value).translate(_COPY_ESCAPES)
+
+
+class _CopyStream:
+    """Read-only file object producing COPY text lines from a row iterator on demand."""
+
+    def __init__(self, lines: Iterator[str], chunk_rows: int):
+        self.lines = lines
+        self.chunk_rows = chunk_rows
+        self.buffer = ""
+
+    def read(self, size: int = -1) -> str:
+        while size < 0 or len(self.buffer) < size:
+            chunk = "".join(islice(self.lines, self.chunk_rows))
+            if not chunk:
+                break
+            self.buffer += chunk
+        if size < 0:
+            data, self.buffer = self.buffer, ""
+        else:
+            data, self.buffer = self.buffer[:size], self.buffer[size:]
+        return data
+
+
+def _copy_lines(table: Table, columns: list[str], rows: Iterable[dict], dialect, counter: list) -> Iterator[str]:
+    # UTCDateTime 처럼 TypeDecorator 가 바꾸는 값은 DB 에 넣을 형태로 먼저 변환
+    processors = [table.c[name].type.bind_processor(dialect) for name in columns]
+    for row in rows:
+        counter[0] += 1
+        values = []
+        for name, process in zip(columns, processors):
+            value = row[name]
+            values.append(_copy_value(process(value) if process else value))
+        yield "\t".join(values) + "\n"
+
+
+def _copy_postgres(engine: Engine, table: Table, columns: list[str], rows: Iterable[dict], batch_size: int) -> int:
+    counter = [0]
+    stream = _CopyStream(_copy_lines(table, columns, rows, engine.dialect, counter), batch_size)
+    target = f'"{table.name}" (' + ", ".join(f'"{name}"' for name in columns) + ")"
+    raw = engine.raw_connection()
+    try:
+        cursor = raw.cursor()
+        cursor.copy_expert(f"COPY {target} FROM STDIN", stream, size=1024 * 1024)
+        # 대량 적재 직후에는 통계가 비어 있어 플래너가 잘못된 계획을 세우므로 갱신
+        raw.commit()
+        cursor.execute(f'ANALYZE "{table.name}"')
+        raw.commit()
+    except BaseException:
+        raw.rollback()
+        raise
+    finally:
+        raw.close()
+    return counter[0]
+
+
+# --- SQLite / generic ------------------------------------------------------
+
+def _executemany(engine: Engine, table: Table, rows: Iterable[dict], batch_size: int) -> int:
+    loaded = 0
+    # 전체를 하나의 트랜잭션으로 묶어서 fsync 를 한 번만 함
+    with engine.begin() as conn:
+        for batch in _batches(rows, batch_size):
+            conn.execute(insert(table), batch)
+            loaded += len(batch)
+    return loaded
+
+
+def bulk_load(engine: Engine, table: Table, rows: Iterable[dict], batch_size: int = BULK_BATCH_SIZE) -> int:
+    """Stream ``rows`` (dicts keyed by column name) into ``table``; returns rows loaded.
+
+    Rows bypass the ORM, so mapper events such as the urgency refresh do
+    not run: the caller supplies every computed column itself. Missing
+    columns get their Python-side defaults.
+    """
+    columns, rows = _complete_rows(table, rows)
+    if not columns:
+        return 0
+    if engine.dialect.name == "postgresql":
+        return _copy_postgres(engine, table, columns, rows, batch_size)
+    return _executemany(engine, table, rows, batch_size)
+
+
+# --- synthetic data --------------------------------------------------------
+
+def synthetic_users(count: int, password: str = "password", prefix: str = "seed", seed: Optional[int] = None) -> Iterator[dict]:
+    """Users ``{prefix}_{n}@example.com``; every row shares one password hash."""
+    rng = random.Random(seed)
+    # bcrypt 는 일부러 느리므로 해시는 한 번만 계산해서 재사용
+    password_hash = get_password_hash(password)
+    for n in range(count):
+        yield {
+            "id": str(uuid.UUID(int=rng.getrandbits(128), version=4)),
+            "name": f"{prefix}_{n}",
+            "mail": f"{prefix}_{n}@example.com",
+            "password": password_hash,
+            "avatar_url": None,
+        }
+
+
+def synthetic_tasks(user_ids: Iterable[str], per_user: int, seed: Optional[int] = None) -> Iterator[dict]:
+    rng = random.Random(seed)
+    now = utcnow()
+    statuses = [status.value for status in TaskStatus]
+    for user_id in user_ids:
+        for n, rank in enumerate(sequential_keys(per_user)):
+            created_at = now - timedelta(seconds=rng.randrange(0, 180 * 24 * 3600))
+            due_date = (
+                created_at + timedelta(hours=rng.randrange(1, 60 * 24)) if rng.random() < 0.7 else None
+            )
+            priority = rng.randint(1, 5)
+            description = None if rng.random() < 0.5 else f"seeded task {n + 1} for {user_id}"
+            status = rng.choice(statuses)
+            yield {
+                "title": f"Task {n + 1}",
+                "description": description,
+                "status": status,
+                "priority": priority,
+                "due_date": due_date,
+                "urgency": compute_urgency(priority, due_date, created_at),
+                "user_id": user_id,
+                "rank": rank,
+                "created_at": created_at,
+                "updated_at": created_at,
+                "completed_at": created_at if status == TaskStatus.done.value else None,
+                "version": 1,
+            }
+
+
+def seed(
+    engine: Engine,
+    users: int,
+    tasks_per_user: int,
+    password: str = "password",
+    prefix: str = "seed",
+    batch_size: int = BULK_BATCH_SIZE,
+    random_seed: Optional[int] = None,
+) -> dict:
+    """Load ``users`` synthetic users and ``tasks_per_user`` tasks each."""
+    user_ids: list[str] = []
+
+    def users_with_ids():
+        for row in synthetic_users(users, password, prefix, random_seed):
+            user_ids.append(row["id"])
+            yield row
+
+    loaded_users = bulk_load(engine, User.__table__, users_with_ids(), batch_size)
+    loaded_tasks = bulk_load(engine, Task.__table__, synthetic_tasks(user_ids, tasks_per_user, random_seed), batch_size)
+    return {"users": loaded_users, "tasks": loaded_tasks}
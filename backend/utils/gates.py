@@ -0,0 +1,65 @@
+import os
+import threading
+from contextlib import contextmanager
+
+from fastapi import HTTPException, status
+
+
+# bcrypt 해시/검증의 워커당 동시 실행 수
+BCRYPT_MAX_CONCURRENCY = int(os.getenv("BCRYPT_MAX_CONCURRENCY", "4"))
+# 이미지 디코딩/리사이즈 (아바타 업로드) 의 워커당 동시 실행 수
+IMAGE_MAX_CONCURRENCY = int(os.getenv("IMAGE_MAX_CONCURRENCY", "2"))
+
+
+class ConcurrencyGate:
+    """Non-blocking in-flight counter: excess work is shed, never queued.
+
+    Held only around the CPU-heavy call itself (``with gate.slot():``),
+    never across a whole request, so a slow client or a long-lived
+    response cannot keep a slot.
+    """
+
+    def __init__(self, name: str, limit: int):
+        self.name = name
+        self.limit = limit
+        self.in_flight = 0
+        self.shed = 0
+        self._lock = threading.Lock()
+
+    def try_acquire(self) -> bool:
+        with self._lock:
+            if self.in_flight >= self.limit:
+                self.shed += 1
+                return False
+            self.in_flight += 1
+            return True
+
+    def release(self) -> None:
+        with self._lock:
+            self.in_flight -= 1
+
+    @contextmanager
+    def slot(self):
+        """Run the block inside the gate, or fail fast with 503 when it is full."""
+        if not self.try_acquire():
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="サーバーが混み合っています。しばらくしてから再度お試しください",
+                headers={"Retry-After": "1"},
+            )
+        try:
+            yield
+        finally:
+            self.release()
+
+    def stats(self) -> dict:
+        return {"in_flight": self.in_flight, "limit": self.limit, "shed": self.shed}
+
+
+bcrypt_gate = ConcurrencyGate("bcrypt", BCRYPT_MAX_CONCURRENCY)
+image_gate = ConcurrencyGate("image", IMAGE_MAX_CONCURRENCY)
+gates = {gate.name: gate for gate in (bcrypt_gate, image_gate)}
+
+
+def gate_stats() -> dict:
+    return {name: gate.stats() for name, gate in gates.items()}
@@ -0,0 +1,106 @@
+import os
+import threading
+import time
+from typing import Optional
+
+import anyio.to_thread
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import NullPool
+
+
+# DB 지연 측정 결과를 이 시간 동안 재사용 (프로브가 DB 부하가 되지 않도록)
+HEALTH_DB_CACHE_SECONDS = float(os.getenv("HEALTH_DB_CACHE_SECONDS", "2"))
+HEALTH_DB_MAX_LATENCY_MS = float(os.getenv("HEALTH_DB_MAX_LATENCY_MS", "500"))
+# 커넥션 풀 사용률이 이 값 이상이면 not ready
+HEALTH_POOL_MAX_SATURATION = float(os.getenv("HEALTH_POOL_MAX_SATURATION", "1.0"))
+# 스레드풀 빈 자리를 기다리는 요청 수가 이보다 많으면 not ready
+HEALTH_THREADPOOL_MAX_WAITING = int(os.getenv("HEALTH_THREADPOOL_MAX_WAITING", "20"))
+
+# 종료 중에는 새 트래픽을 받지 않도록 ready 를 내림 (lifespan 에서 설정)
+draining = threading.Event()
+
+
+class DbProbe:
+    """``SELECT 1`` round trip, measured on its own connection and cached.
+
+    The probe does not borrow from the application pool, so an exhausted
+    pool shows up as pool saturation instead of a probe that hangs; and
+    concurrent callers share one in-flight probe.
+    """
+
+    def __init__(self, engine: Engine, ttl: float = HEALTH_DB_CACHE_SECONDS):
+        url = engine.url
+        args = {"check_same_thread": False} if url.get_backend_name() == "sqlite" else {"connect_timeout": 3}
+        self.engine = create_engine(url, poolclass=NullPool, connect_args=args)
+        self.ttl = ttl
+        self._result: Optional[dict] = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    def _measure(self) -> dict:
+        started = time.perf_counter()
+        try:
+            with self.engine.connect() as conn:
+                conn.execute(text("SELECT 1"))
+        except Exception as exc:
+            return {"ok": False, "error": type(exc).__name__}
+        return {"ok": True, "latency_ms": round((time.perf_counter() - started) * 1000, 2)}
+
+    def check(self) -> dict:
+        if time.monotonic() - self._checked_at < self.ttl and self._result is not None:
+            return {**self._result, "cached": True}
+        # 다른 스레드가 측정 중이면 기다리지 않고 직전 결과를 돌려줌
+        if not self._lock.acquire(blocking=self._result is None):
+            return {**self._result, "cached": True}
+        try:
+            self._result = self._measure()
+            self._checked_at = time.monotonic()
+            return {**self._result, "cached": False}
+        finally:
+            self._lock.release()
+
+
+def pool_stats(engine: Engine) -> dict:
+    pool = engine.pool
+    size = getattr(pool, "size", lambda: 0)()
+    capacity = size + max(getattr(pool, "_max_overflow", 0), 0)
+    checked_out = getattr(pool, "checkedout", lambda: 0)()
+    return {
+        "size": size,
+        "checked_out": checked_out,
+        "overflow": getattr(pool, "overflow", lambda: 0)(),
+        "capacity": capacity,
+        "saturation": round(checked_out / capacity, 4) if capacity else 0.0,
+    }
+
+
+def threadpool_stats() -> dict:
+    """Usage of the worker threads that run sync endpoints (call from the event loop)."""
+    limiter = anyio.to_thread.current_default_thread_limiter()
+    return {
+        "busy": int(limiter.borrowed_tokens),
+        "limit": int(limiter.total_tokens),
+        "waiting": limiter.statistics().tasks_waiting,
+    }
+
+
+def readiness(db: dict, pool: dict, threads: dict) -> list[str]:
+    """Reasons this worker should not receive traffic right now (empty = ready).
+
+    Concurrency gates (utils.gates) are not consulted: a full gate already
+    sheds its own excess with 503, and letting it flip readiness would let
+    a handful of clients pull every worker out of the load balancer.
+    """
+    reasons = []
+    if draining.is_set():
+        reasons.append("shutting_down")
+    if not db.get("ok"):
+        reasons.append("database_unreachable")
+    elif db["latency_ms"] > HEALTH_DB_MAX_LATENCY_MS:
+        reasons.append("database_slow")
+    if pool["capacity"] and pool["saturation"] >= HEALTH_POOL_MAX_SATURATION:
+        reasons.append("db_pool_saturated")
+    if threads["waiting"] > HEALTH_THREADPOOL_MAX_WAITING:
+        reasons.append("threadpool_backlog")
+    return reasons
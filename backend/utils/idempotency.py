@@ -0,0 +1,178 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Optional
+
+from fastapi import HTTPException, Request
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import Response
+
+
+IDEMPOTENCY_HEADER = "Idempotency-Key"
+IDEMPOTENCY_TTL_SECONDS = float(os.getenv("IDEMPOTENCY_TTL_SECONDS", str(24 * 60 * 60)))
+IDEMPOTENCY_MAX_ENTRIES = int(os.getenv("IDEMPOTENCY_MAX_ENTRIES", "20000"))
+# 같은 키의 선행 요청이 끝나기를 기다리는 최대 시간
+IDEMPOTENCY_WAIT_SECONDS = float(os.getenv("IDEMPOTENCY_WAIT_SECONDS", "10"))
+MAX_KEY_LENGTH = 255
+
+
+@dataclass
+class StoredResponse:
+    fingerprint: str
+    status_code: int
+    body: bytes
+    expires_at: float
+
+    def to_response(self) -> Response:
+        return Response(
+            content=self.body,
+            status_code=self.status_code,
+            media_type="application/json" if self.body else None,
+            headers={"Idempotent-Replayed": "true"},
+        )
+
+
+@dataclass
+class _InFlight:
+    fingerprint: str
+    done: threading.Event = field(default_factory=threading.Event)
+
+
+class IdempotencyStore:
+    """Process-local response cache keyed by (user, Idempotency-Key), with TTL + LRU eviction.
+
+    Concurrent requests with the same key are collapsed: the first one runs,
+    the rest wait for it and replay its stored response.
+    """
+
+    def __init__(self, ttl: float = IDEMPOTENCY_TTL_SECONDS, max_entries: int = IDEMPOTENCY_MAX_ENTRIES):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, StoredResponse] = OrderedDict()
+        self._in_flight: dict[str, _InFlight] = {}
+        self._lock = threading.Lock()
+
+    def _get(self, key: str, now: float) -> Optional[StoredResponse]:
+        stored = self._entries.get(key)
+        if stored is not None and stored.expires_at <= now:
+            del self._entries[key]
+            return None
+        return stored
+
+    def _evict(self, now: float) -> None:
+        # 오래된 것부터 순서대로 들어있으므로 앞에서부터 만료분을 제거
+        while self._entries:
+            oldest = next(iter(self._entries.values()))
+            if oldest.expires_at > now and len(self._entries) <= self.max_entries:
+                break
+            self._entries.popitem(last=False)
+
+    def begin(self, key: str, fingerprint: str, wait: float = IDEMPOTENCY_WAIT_SECONDS) -> Optional[StoredResponse]:
+        """Return the stored response to replay, or None when the caller should execute."""
+        deadline = time.monotonic() + wait
+        while True:
+            with self._lock:
+                stored = self._get(key, time.time())
+                if stored is not None:
+                    if stored.fingerprint != fingerprint:
+                        raise _mismatch()
+                    return stored
+                in_flight = self._in_flight.get(key)
+                if in_flight is None:
+                    self._in_flight[key] = _InFlight(fingerprint)
+                    return None
+            if in_flight.fingerprint != fingerprint:
+                raise _mismatch()
+            if not in_flight.done.wait(max(0.0, deadline - time.monotonic())):
+                raise HTTPException(status_code=409, detail="同じリクエストを処理中です")
+            # 선행 요청이 실패했으면 저장된 응답이 없으므로 다시 돌면서 실행권을 얻음
+
+    def complete(self, key: str, stored: Optional[StoredResponse]) -> None:
+        with self._lock:
+            if stored is not None:
+                now = time.time()
+                self._entries[key] = stored
+                self._evict(now)
+            in_flight = self._in_flight.pop(key, None)
+        if in_flight is not None:
+            in_flight.done.set()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+def _mismatch() -> HTTPException:
+    return HTTPException(status_code=422, detail="Idempotency-Key が別のリクエストで使用されています")
+
+
+store = IdempotencyStore()
+
+
+class IdempotencyGuard:
+    """Context manager wrapping one mutating request.
+
+    ``replay`` is set when a previous request with the same key already
+    finished; otherwise the endpoint runs and passes its result to
+    ``respond`` so it can be stored for later retries.
+    """
+
+    def __init__(
+        self,
+        scope: str,
+        key: Optional[str],
+        fingerprint: str,
+        response: Optional[Response] = None,
+        store: IdempotencyStore = store,
+    ):
+        self.store = store
+        # 엔드포인트의 Response 파라미터에 붙은 쿠키 (익명 세션 등)를 옮겨 담기 위해 보관
+        self.response = response
+        self.key = f"{scope}:{key}" if key else None
+        self.fingerprint = fingerprint
+        self.replay: Optional[Response] = None
+        self._stored: Optional[StoredResponse] = None
+
+    def __enter__(self) -> "IdempotencyGuard":
+        if self.key:
+            stored = self.store.begin(self.key, self.fingerprint)
+            if stored is not None:
+                self.replay = stored.to_response()
+        return self
+
+    def respond(self, content: Any, status_code: int = 200) -> Response:
+        body = b"" if content is None else json.dumps(
+            jsonable_encoder(content), ensure_ascii=False, separators=(",", ":")
+        ).encode()
+        self._stored = StoredResponse(self.fingerprint, status_code, body, time.time() + self.store.ttl)
+        result = Response(
+            content=body,
+            status_code=status_code,
+            media_type="application/json" if body else None,
+        )
+        if self.response is not None:
+            result.raw_headers.extend(
+                (name, value) for name, value in self.response.raw_headers if name == b"set-cookie"
+            )
+        return result
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if self.key and self.replay is None:
+            self.store.complete(self.key, self._stored if exc_type is None else None)
+
+
+def idempotency_guard(
+    request: Request, response: Response, user_id: str, payload: Any = None
+) -> IdempotencyGuard:
+    key = request.headers.get(IDEMPOTENCY_HEADER)
+    if key is not None and not (0 < len(key) <= MAX_KEY_LENGTH):
+        raise HTTPException(status_code=400, detail=f"{IDEMPOTENCY_HEADER} must be 1-{MAX_KEY_LENGTH} characters")
+    body = payload.model_dump(mode="json", exclude_unset=True) if payload is not None else None
+    fingerprint = hashlib.sha256(
+        json.dumps([request.method, request.url.path, body], sort_keys=True, default=str).encode()
+    ).hexdigest()
+    return IdempotencyGuard(str(user_id), key, fingerprint, response)
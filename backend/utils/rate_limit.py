@@ -0,0 +1,264 @@
+import hashlib
+import json
+import math
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional
+
+from starlette.concurrency import run_in_threadpool
+from starlette.requests import Request
+
+from utils.batch import BATCH_MAX_BODY_BYTES, request_cost
+from utils.redis_client import get_redis
+from utils.security import get_session_id
+
+
+RATE_LIMIT_ENABLED = os.getenv("RATE_LIMIT_ENABLED", "1") == "1"
+# X-Forwarded-For 중 신뢰할 프록시 홉 수 (Render/Railway 는 1)
+PROXY_HOPS = int(os.getenv("RATE_LIMIT_PROXY_HOPS", "1"))
+
+
+@dataclass(frozen=True)
+class Limit:
+    """Token bucket refilled at ``per_minute`` tokens/min holding at most ``burst``."""
+    per_minute: float
+    burst: int
+
+    @property
+    def rate(self) -> float:
+        return self.per_minute / 60.0
+
+
+@dataclass(frozen=True)
+class RouteBudget:
+    name: str
+    per_ip: Optional[Limit] = None
+    per_session: Optional[Limit] = None
+
+
+class MemoryBackend:
+    """Process-local token buckets, bounded with LRU eviction."""
+
+    blocking = False
+
+    def __init__(self, max_keys: int = 100_000):
+        self.max_keys = max_keys
+        self._buckets: OrderedDict[str, tuple[float, float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def take(self, key: str, limit: Limit, now: Optional[float] = None, cost: int = 1) -> float:
+        """Consume ``cost`` tokens. Returns 0 when allowed, else seconds until retry."""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            tokens, updated = self._buckets.pop(key, (float(limit.burst), now))
+            tokens = min(float(limit.burst), tokens + (now - updated) * limit.rate)
+            if tokens >= cost:
+                tokens -= cost
+                retry_after = 0.0
+            else:
+                retry_after = (cost - tokens) / limit.rate
+            self._buckets[key] = (tokens, now)
+            if len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        return retry_after
+
+    def reset(self) -> None:
+        with self._lock:
+            self._buckets.clear()
+
+
+# KEYS[1]=bucket, ARGV = rate(tokens/s), burst, now(s), cost(tokens)
+_REDIS_TAKE = """
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'updated')
+local rate = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local cost = tonumber(ARGV[4])
+local tokens = tonumber(state[1]) or burst
+local updated = tonumber(state[2]) or now
+tokens = math.min(burst, tokens + math.max(0, now - updated) * rate)
+local retry = 0
+if tokens >= cost then
+  tokens = tokens - cost
+else
+  retry = (cost - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'updated', now)
+redis.call('EXPIRE', KEYS[1], math.ceil(burst / rate) + 1)
+return tostring(retry)
+"""
+
+
+class RedisBackend:
+    """Token buckets shared by every worker through one atomic Lua script."""
+
+    blocking = True
+
+    def __init__(self, client):
+        self.client = client
+        self._script = client.register_script(_REDIS_TAKE)
+
+    def take(self, key: str, limit: Limit, now: Optional[float] = None, cost: int = 1) -> float:
+        now = time.time() if now is None else now
+        try:
+            return float(self._script(keys=[key], args=[limit.rate, limit.burst, now, cost]))
+        except Exception as exc:  # Redis 장애 시에는 제한하지 않음 (fail open)
+            print(f"⚠️ Rate limit backend unavailable: {exc}")
+            return 0.0
+
+    def reset(self) -> None:
+        pass
+
+
+DEFAULT_BUDGET = RouteBudget("default", per_ip=Limit(600, 120), per_session=Limit(300, 60))
+# 쿠키 없는 /tasks 요청은 익명 유저를 새로 만들기 때문에 IP 단위로 엄격하게 제한
+ANONYMOUS_BUDGET = RouteBudget("anonymous", per_ip=Limit(10, 20))
+
+ROUTE_BUDGETS: dict[tuple[str, str], RouteBudget] = {
+    ("POST", "/users/login"): RouteBudget("login", per_ip=Limit(10, 10)),
+    ("POST", "/users/register"): RouteBudget("register", per_ip=Limit(5, 5)),
+    ("POST", "/users/guest"): RouteBudget("guest", per_ip=Limit(3, 5)),
+    ("POST", "/users/change-password"): RouteBudget(
+        "change_password", per_ip=Limit(10, 10), per_session=Limit(5, 5)
+    ),
+    ("POST", "/admin/backup"): RouteBudget("backup", per_ip=Limit(2, 2)),
+    ("POST", "/users/me/avatar"): RouteBudget(
+        "avatar", per_ip=Limit(10, 5), per_session=Limit(6, 3)
+    ),
+}
+
+
+def client_ip(request: Request, proxy_hops: int = PROXY_HOPS) -> str:
+    # 프록시가 덧붙인 오른쪽 항목만 신뢰 (왼쪽은 클라이언트가 위조 가능)
+    forwarded = request.headers.get("X-Forwarded-For")
+    if forwarded and proxy_hops > 0:
+        hops = [h.strip() for h in forwarded.split(",") if h.strip()]
+        if hops:
+            return hops[-min(proxy_hops, len(hops))]
+    return request.client.host if request.client else "unknown"
+
+
+class RateLimiter:
+    def __init__(self, backend=None, budgets=None):
+        self.backend = backend or MemoryBackend()
+        self.budgets = ROUTE_BUDGETS if budgets is None else budgets
+
+    def budget_for(self, request: Request, token: Optional[str]) -> RouteBudget:
+        path = request.url.path
+        budget = self.budgets.get((request.method, path.rstrip("/") or "/"))
+        if budget:
+            return budget
+        if not token and path.startswith("/tasks"):
+            return ANONYMOUS_BUDGET
+        return DEFAULT_BUDGET
+
+    def check(self, request: Request, budget: RouteBudget, token: Optional[str], cost: int = 1) -> float:
+        """Return 0 when the request fits its budget, else the Retry-After seconds."""
+        retry_after = 0.0
+        if budget.per_ip:
+            key = f"rl:{budget.name}:ip:{client_ip(request)}"
+            retry_after = max(retry_after, self.backend.take(key, budget.per_ip, cost=cost))
+        if budget.per_session and token:
+            digest = hashlib.sha256(token.encode()).hexdigest()[:32]
+            key = f"rl:{budget.name}:sid:{digest}"
+            retry_after = max(retry_after, self.backend.take(key, budget.per_session, cost=cost))
+        return retry_after
+
+
+def _build_limiter() -> RateLimiter:
+    client = get_redis(os.getenv("RATE_LIMIT_REDIS_URL"))
+    return RateLimiter(RedisBackend(client) if client is not None else MemoryBackend())
+
+
+limiter = _build_limiter()
+
+
+async def _reject(send, status_code: int, detail: str, retry_after: float) -> None:
+    body = json.dumps({"detail": detail}, ensure_ascii=False).encode()
+    await send({
+        "type": "http.response.start",
+        "status": status_code,
+        "headers": [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode()),
+            (b"retry-after", str(max(1, math.ceil(retry_after))).encode()),
+        ],
+    })
+    await send({"type": "http.response.body", "body": body})
+
+
+async def _read_body(receive, max_bytes: int) -> Optional[bytes]:
+    """Buffer the whole request body; None once it grows past ``max_bytes``."""
+    chunks, size = [], 0
+    while True:
+        message = await receive()
+        if message["type"] != "http.request":
+            return b"".join(chunks)
+        chunk = message.get("body", b"")
+        size += len(chunk)
+        if size > max_bytes:
+            return None
+        chunks.append(chunk)
+        if not message.get("more_body", False):
+            return b"".join(chunks)
+
+
+def _replay(body: bytes, receive):
+    sent = False
+
+    async def replay_receive():
+        nonlocal sent
+        if sent:
+            return await receive()
+        sent = True
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    return replay_receive
+
+
+class RateLimitMiddleware:
+    """Per-route token-bucket budgets (shedding of CPU-heavy calls is in utils.gates)."""
+
+    def __init__(self, app, limiter: Optional[RateLimiter] = None, enabled: bool = RATE_LIMIT_ENABLED):
+        self.app = app
+        self.limiter = limiter
+        self.enabled = enabled
+
+    async def __call__(self, scope, receive, send):
+        # 헬스 프로브는 예산을 쓰지도, 막히지도 않게 함
+        if (
+            not self.enabled
+            or scope["type"] != "http"
+            or scope["method"] == "OPTIONS"
+            or scope["path"].startswith("/health/")
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        active = self.limiter or limiter
+        request = Request(scope)
+        token = get_session_id(request)
+        budget = active.budget_for(request, token)
+
+        cost = 1
+        if scope["method"] == "POST" and scope["path"] == "/batch":
+            # 하위 요청도 각각 한 요청으로 차감 (묶어서 예산을 우회하지 못하게)
+            body = await _read_body(receive, BATCH_MAX_BODY_BYTES)
+            if body is None:
+                await _reject(send, 413, "リクエストが大きすぎます", 0)
+                return
+            cost = request_cost(body)
+            receive = _replay(body, receive)
+
+        if active.backend.blocking:
+            retry_after = await run_in_threadpool(active.check, request, budget, token, cost)
+        else:
+            retry_after = active.check(request, budget, token, cost)
+        if retry_after > 0:
+            await _reject(send, 429, "リクエストが多すぎます。しばらくしてから再度お試しください", retry_after)
+            return
+        # bcrypt/이미지 처리의 동시 실행 제한은 요청 전체가 아니라 해당 호출만 감쌈 (utils.gates)
+        await self.app(scope, receive, send)
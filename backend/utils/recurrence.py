@@ -0,0 +1,237 @@
+"""Minimal RRULE subset (RFC 5545) for recurring tasks.
+
+Supported parts: ``FREQ`` (DAILY, WEEKLY, MONTHLY, YEARLY), ``INTERVAL``,
+``COUNT``, ``UNTIL`` and ``BYDAY`` (weekly rules only, e.g. ``MO,WE,FR``),
+plus a non-standard ``TZID`` (IANA name, RFC 5545 carries it on DTSTART).
+Occurrences are expanded on the wall clock of that zone from the series
+start (the task's first ``due_date``) and returned in UTC, so a monthly
+task due at 08:00 JST stays on the same local day; dates that do not
+exist in a month (e.g. the 31st) are skipped, as RFC 5545 does.
+"""
+import calendar
+import os
+from dataclasses import dataclass, replace
+from datetime import datetime, timedelta, timezone
+from typing import Iterator, Optional
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+# TZID 가 없는 규칙(이전에 저장된 것 포함)을 펼칠 때 쓰는 시간대. 사용자는 일본에 있음
+RECURRENCE_DEFAULT_TZ = os.getenv("RECURRENCE_DEFAULT_TZ", "Asia/Tokyo")
+
+FREQUENCIES = ("DAILY", "WEEKLY", "MONTHLY", "YEARLY")
+WEEKDAYS = ("MO", "TU", "WE", "TH", "FR", "SA", "SU")
+# 한 번에 펼치는 발생 수 상한 (잘못된 범위 요청으로 무한히 펼치지 않도록)
+MAX_OCCURRENCES = 1000
+
+
+@dataclass(frozen=True)
+class Rule:
+    freq: str
+    interval: int = 1
+    count: Optional[int] = None
+    until: Optional[datetime] = None
+    byday: tuple[int, ...] = ()
+    tzid: Optional[str] = None
+
+    @property
+    def zone(self) -> ZoneInfo:
+        return ZoneInfo(self.tzid or RECURRENCE_DEFAULT_TZ)
+
+    def __str__(self) -> str:
+        parts = [f"FREQ={self.freq}"]
+        if self.interval != 1:
+            parts.append(f"INTERVAL={self.interval}")
+        if self.count is not None:
+            parts.append(f"COUNT={self.count}")
+        if self.until is not None:
+            parts.append("UNTIL=" + self.until.strftime("%Y%m%dT%H%M%SZ"))
+        if self.byday:
+            parts.append("BYDAY=" + ",".join(WEEKDAYS[d] for d in self.byday))
+        if self.tzid:
+            parts.append(f"TZID={self.tzid}")
+        return ";".join(parts)
+
+
+def _parse_until(value: str) -> datetime:
+    for fmt in ("%Y%m%dT%H%M%SZ", "%Y%m%dT%H%M%S", "%Y%m%d"):
+        try:
+            parsed = datetime.strptime(value, fmt)
+        except ValueError:
+            continue
+        if fmt == "%Y%m%d":
+            parsed = parsed.replace(hour=23, minute=59, second=59)
+        return parsed.replace(tzinfo=timezone.utc)
+    raise ValueError(f"Invalid UNTIL: {value}")
+
+
+def parse_rule(text: str) -> Rule:
+    """Parse ``FREQ=WEEKLY;BYDAY=MO,TH;COUNT=10`` (an optional ``RRULE:`` prefix is accepted)."""
+    text = text.strip()
+    if text.upper().startswith("RRULE:"):
+        text = text[6:]
+    parts = {}
+    tzid = None
+    for item in filter(None, text.split(";")):
+        key, sep, value = item.partition("=")
+        if not sep or not value:
+            raise ValueError(f"Invalid rule part: {item}")
+        key = key.strip().upper()
+        if key == "TZID":
+            # 시간대 이름은 대소문자를 구분함 (Asia/Tokyo)
+            tzid = value.strip()
+            continue
+        parts[key] = value.strip().upper()
+
+    unknown = set(parts) - {"FREQ", "INTERVAL", "COUNT", "UNTIL", "BYDAY"}
+    if unknown:
+        raise ValueError(f"Unsupported rule parts: {', '.join(sorted(unknown))}")
+    freq = parts.get("FREQ")
+    if freq not in FREQUENCIES:
+        raise ValueError(f"FREQ must be one of {', '.join(FREQUENCIES)}")
+    try:
+        interval = int(parts.get("INTERVAL", "1"))
+        count = int(parts["COUNT"]) if "COUNT" in parts else None
+    except ValueError:
+        raise ValueError("INTERVAL and COUNT must be integers")
+    if interval < 1 or (count is not None and count < 1):
+        raise ValueError("INTERVAL and COUNT must be positive")
+    if count is not None and "UNTIL" in parts:
+        raise ValueError("COUNT and UNTIL cannot be combined")
+    until = _parse_until(parts["UNTIL"]) if "UNTIL" in parts else None
+
+    byday: tuple[int, ...] = ()
+    if "BYDAY" in parts:
+        if freq != "WEEKLY":
+            raise ValueError("BYDAY is only supported with FREQ=WEEKLY")
+        try:
+            byday = tuple(sorted({WEEKDAYS.index(day.strip()) for day in parts["BYDAY"].split(",")}))
+        except ValueError:
+            raise ValueError(f"BYDAY must be a list of {','.join(WEEKDAYS)}")
+    if tzid is not None:
+        try:
+            ZoneInfo(tzid)
+        except (ZoneInfoNotFoundError, ValueError):
+            raise ValueError(f"Unknown TZID: {tzid}")
+    return Rule(freq, interval, count, until, byday, tzid)
+
+
+def normalize(text: str) -> str:
+    """Canonical text form stored in ``tasks.recurrence`` (TZID filled in with the default)."""
+    rule = parse_rule(text)
+    # 저장 시점의 시간대로 고정 (나중에 기본값이 바뀌어도 기존 반복은 그대로)
+    return str(replace(rule, tzid=rule.tzid or RECURRENCE_DEFAULT_TZ))
+
+
+def _add_months(start: datetime, months: int) -> Optional[datetime]:
+    year, month = divmod(start.month - 1 + months, 12)
+    year += start.year
+    if start.day > calendar.monthrange(year, month + 1)[1]:
+        return None
+    return start.replace(year=year, month=month + 1)
+
+
+def _local(value: datetime, zone: ZoneInfo) -> datetime:
+    """Naive wall-clock time of ``value`` in ``zone`` (naive input is taken to be UTC)."""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.astimezone(zone).replace(tzinfo=None)
+
+
+def _candidates(rule: Rule, start: datetime, first_period: int) -> Iterator[datetime]:
+    """Wall-clock datetimes from period ``first_period`` on, before COUNT/UNTIL are applied."""
+    period = first_period
+    while True:
+        if rule.freq == "DAILY":
+            yield start + timedelta(days=period * rule.interval)
+        elif rule.freq == "WEEKLY":
+            week = start + timedelta(weeks=period * rule.interval)
+            if not rule.byday:
+                yield week
+            else:
+                monday = week - timedelta(days=week.weekday())
+                for day in rule.byday:
+                    candidate = monday + timedelta(days=day)
+                    if candidate >= start:
+                        yield candidate
+        else:
+            months = period * rule.interval * (12 if rule.freq == "YEARLY" else 1)
+            candidate = _add_months(start, months)
+            if candidate is not None:
+                yield candidate
+        period += 1
+
+
+def _period_length(rule: Rule) -> Optional[timedelta]:
+    if rule.freq == "DAILY":
+        return timedelta(days=rule.interval)
+    if rule.freq == "WEEKLY":
+        return timedelta(weeks=rule.interval)
+    return None
+
+
+def occurrences(
+    rule: Rule,
+    start: datetime,
+    window_from: Optional[datetime] = None,
+    window_to: Optional[datetime] = None,
+    limit: int = MAX_OCCURRENCES,
+) -> Iterator[datetime]:
+    """Occurrences in ``[window_from, window_to)``, at most ``limit`` of them.
+
+    The rule is expanded on the wall clock of ``rule.zone``; each
+    occurrence is converted back to ``start``'s timezone (UTC for the
+    stored due dates).
+
+    Without COUNT the generator jumps straight to the period containing
+    ``window_from``, so a series that started years ago costs nothing
+    extra; with COUNT it walks from the start because the index matters.
+    """
+    zone = rule.zone
+    local_start = _local(start, zone)
+    output_tz = start.tzinfo or timezone.utc
+
+    def to_output(local: datetime) -> datetime:
+        value = local.replace(tzinfo=zone).astimezone(output_tz)
+        return value if start.tzinfo is not None else value.replace(tzinfo=None)
+
+    first_period = 0
+    if window_from is not None and rule.count is None and window_from > start:
+        local_from = _local(window_from, zone)
+        length = _period_length(rule)
+        if length is not None:
+            first_period = max(0, (local_from - local_start) // length - 1)
+        else:
+            months = (local_from.year - local_start.year) * 12 + local_from.month - local_start.month
+            step = rule.interval * (12 if rule.freq == "YEARLY" else 1)
+            first_period = max(0, months // step - 1)
+
+    emitted = 0
+    index = 0
+    for local in _candidates(rule, local_start, first_period):
+        candidate = to_output(local)
+        if rule.until is not None and candidate > rule.until:
+            return
+        if rule.count is not None and index >= rule.count:
+            return
+        index += 1
+        if window_to is not None and candidate >= window_to:
+            return
+        if window_from is not None and candidate < window_from:
+            continue
+        yield candidate
+        emitted += 1
+        if emitted >= limit:
+            return
+
+
+def next_occurrence(rule: Rule, start: datetime, after: datetime) -> Optional[datetime]:
+    """First occurrence strictly after ``after``, or None when the series has ended."""
+    for candidate in occurrences(rule, start, after, limit=2):
+        if candidate > after:
+            return candidate
+    return None
+
+
+def align_start(rule: Rule, start: datetime) -> Optional[datetime]:
+    """First occurrence at or after ``start`` (e.g. a Friday start with ``BYDAY=MO``)."""
+    return next(occurrences(rule, start, start, limit=1), None)
@@ -0,0 +1,19 @@
+from functools import lru_cache
+from typing import Optional
+
+
+@lru_cache(maxsize=None)
+def get_redis(url: Optional[str]):
+    """Return a Redis client for ``url``, or None when unset or redis is not installed.
+
+    ``redis`` is an optional dependency: without it every shared backend
+    falls back to its in-memory implementation.
+    """
+    if not url:
+        return None
+    try:
+        import redis
+    except ImportError:
+        print(f"⚠️ redis package is not installed; ignoring {url}")
+        return None
+    return redis.Redis.from_url(url, socket_timeout=0.5, socket_connect_timeout=0.5)
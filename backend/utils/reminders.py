@@ -0,0 +1,365 @@
+import asyncio
+import heapq
+import json
+import math
+import os
+import threading
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from typing import Optional, Protocol
+
+from sqlalchemy import select, tuple_
+
+from database import SessionLocal
+from models.task import Task, TaskStatus
+from models.types import as_utc
+from utils.background import register
+
+
+# 마감 몇 초 전에 알릴지
+REMINDER_LEAD_SECONDS = float(os.getenv("REMINDER_LEAD_SECONDS", str(15 * 60)))
+# 메모리(힙)에 올려두는 구간. 이 구간의 절반이 지나면 다음 구간을 읽어옴
+REMINDER_WINDOW_SECONDS = float(os.getenv("REMINDER_WINDOW_SECONDS", str(60 * 60)))
+REMINDER_BATCH_SIZE = int(os.getenv("REMINDER_BATCH_SIZE", "5000"))
+# 이 주기마다 곧 울릴 구간만 DB 에서 다시 읽음. 다른 워커/인스턴스가 처리한 쓰기는 최대 이만큼 늦게 반영됨
+REMINDER_RESYNC_SECONDS = float(os.getenv("REMINDER_RESYNC_SECONDS", "60"))
+REMINDER_WEBHOOK_URL = os.getenv("REMINDER_WEBHOOK_URL")
+REMINDER_LOG = os.getenv("REMINDER_LOG", "1") == "1"
+
+
+@dataclass(frozen=True)
+class ReminderEvent:
+    task_id: int
+    user_id: str
+    title: str
+    due_date: datetime
+    fire_at: float
+
+    def to_dict(self) -> dict:
+        data = asdict(self)
+        data["due_date"] = self.due_date.isoformat()
+        data["fire_at"] = datetime.fromtimestamp(self.fire_at, timezone.utc).isoformat()
+        return data
+
+
+class ReminderSink(Protocol):
+    def send(self, event: ReminderEvent) -> None: ...
+
+
+class LogSink:
+    def send(self, event: ReminderEvent) -> None:
+        print(f"⏰ Reminder: task {event.task_id} '{event.title}' (user {event.user_id}) due {event.due_date.isoformat()}")
+
+
+class WebhookSink:
+    """POSTs each event as JSON; deliveries run on a small pool so a slow receiver never delays the timer."""
+
+    def __init__(self, url: str, timeout: float = 5.0, workers: int = 2):
+        self.url = url
+        self.timeout = timeout
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="reminder-webhook")
+
+    def _post(self, event: ReminderEvent) -> None:
+        body = json.dumps({"type": "task.reminder", "data": event.to_dict()}, ensure_ascii=False).encode()
+        request = urllib.request.Request(
+            self.url, data=body, method="POST", headers={"Content-Type": "application/json"}
+        )
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                response.read()
+        except Exception as exc:
+            print(f"⚠️ Reminder webhook failed for task {event.task_id}: {exc}")
+
+    def send(self, event: ReminderEvent) -> None:
+        self._pool.submit(self._post, event)
+
+
+class SseSink:
+    """Fans events out to the asyncio queues of connected SSE clients, per user."""
+
+    def __init__(self, max_queue: int = 100):
+        self.max_queue = max_queue
+        self._subscribers: dict[str, set[tuple[asyncio.AbstractEventLoop, asyncio.Queue]]] = {}
+        self._lock = threading.Lock()
+
+    def subscribe(self, user_id: str) -> tuple[asyncio.AbstractEventLoop, asyncio.Queue]:
+        subscriber = (asyncio.get_running_loop(), asyncio.Queue(self.max_queue))
+        with self._lock:
+            self._subscribers.setdefault(str(user_id), set()).add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, user_id: str, subscriber) -> None:
+        with self._lock:
+            subscribers = self._subscribers.get(str(user_id))
+            if subscribers is not None:
+                subscribers.discard(subscriber)
+                if not subscribers:
+                    del self._subscribers[str(user_id)]
+
+    @staticmethod
+    def _offer(queue: asyncio.Queue, event: ReminderEvent) -> None:
+        try:
+            queue.put_nowait(event)
+        except asyncio.QueueFull:  # 읽지 않는 클라이언트 때문에 메모리가 늘지 않도록 버림
+            pass
+
+    def send(self, event: ReminderEvent) -> None:
+        with self._lock:
+            subscribers = list(self._subscribers.get(event.user_id, ()))
+        for loop, queue in subscribers:
+            loop.call_soon_threadsafe(self._offer, queue, event)
+
+    def connections(self) -> int:
+        with self._lock:
+            return sum(len(s) for s in self._subscribers.values())
+
+
+class ReminderEngine:
+    """Min-heap of upcoming reminders, refilled window by window from the due_date index.
+
+    Only reminders firing within the current window are held in memory, so
+    the table is read once per half window instead of being polled. Writes
+    keep the heap current through ``schedule``/``cancel``; superseded heap
+    entries are skipped lazily when they reach the top.
+
+    The heap is per process and the write hooks only run in the process
+    that handled the write, so every ``resync`` seconds the reminders
+    firing in the next ``2 * resync`` seconds are re-read from the
+    due_date index and that stretch is taken from the database. A write
+    handled elsewhere therefore fires here at most ``resync`` late.
+    """
+
+    def __init__(
+        self,
+        sinks: list,
+        lead: float = REMINDER_LEAD_SECONDS,
+        window: float = REMINDER_WINDOW_SECONDS,
+        batch_size: int = REMINDER_BATCH_SIZE,
+        resync: float = REMINDER_RESYNC_SECONDS,
+    ):
+        self.name = "reminders"
+        self.sinks = sinks
+        self.lead = lead
+        self.window = window
+        self.batch_size = batch_size
+        self.resync = resync
+        self._resynced_at = 0.0
+        self._heap: list[tuple[float, int]] = []
+        # task_id -> 현재 유효한 알림. 힙 항목이 이것과 다르면 취소/변경된 것
+        self._scheduled: dict[int, ReminderEvent] = {}
+        # task_id -> 이미 알린 마감 시각 (마감이 지나면 지움). 같은 마감을 두 번 알리지 않도록
+        self._fired: dict[int, float] = {}
+        self._loaded_until = 0.0
+        self._cond = threading.Condition()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.fired = 0
+
+    # --- write hooks (called by the endpoints after commit) -------------
+
+    def schedule(self, task: Task) -> None:
+        due = task.due_date
+        if due is None or task.status == TaskStatus.done.value:
+            self.cancel(task.id)
+            return
+        now = time.time()
+        due_at = as_utc(due).timestamp()
+        fire_at = due_at - self.lead
+        with self._cond:
+            if fire_at >= self._loaded_until or due_at <= now or self._fired.get(task.id) == due_at:
+                # 아직 읽지 않은 구간이면 그 구간을 읽을 때 들어옴. 이미 지났거나 알린 마감은 버림
+                self._scheduled.pop(task.id, None)
+                return
+            # 알림 시각이 이미 지났어도 마감 전이면 바로 알림
+            self._push(ReminderEvent(task.id, str(task.user_id), task.title, as_utc(due), max(fire_at, now)))
+            self._cond.notify()
+
+    def cancel(self, task_id: int) -> None:
+        with self._cond:
+            self._scheduled.pop(task_id, None)
+
+    # --- engine ----------------------------------------------------------
+
+    def _push(self, event: ReminderEvent) -> None:
+        self._scheduled[event.task_id] = event
+        heapq.heappush(self._heap, (event.fire_at, event.task_id))
+        # 취소된 항목이 쌓이면 힙을 다시 만듦
+        if len(self._heap) > 2 * len(self._scheduled) + 1000:
+            self._heap = [(e.fire_at, e.task_id) for e in self._scheduled.values()]
+            heapq.heapify(self._heap)
+
+    def _load_window(self, now: float) -> int:
+        with self._cond:
+            previous = self._loaded_until
+            start = max(previous, now)
+            end = now + self.window
+            # 먼저 경계를 옮겨서, 읽는 도중에 생성된 태스크는 schedule() 쪽에서 받게 함
+            self._loaded_until = end
+        # 처음 읽을 때는 알림 시각이 이미 지난(마감까지 lead 미만 남은) 태스크도 가져와 바로 알림
+        lower = datetime.fromtimestamp(start + self.lead if previous else now, timezone.utc)
+        upper = datetime.fromtimestamp(end + self.lead, timezone.utc)
+        loaded = 0
+        after = None
+        db = SessionLocal()
+        try:
+            while True:
+                stmt = (
+                    select(Task.id, Task.user_id, Task.title, Task.due_date)
+                    .where(Task.due_date >= lower, Task.due_date < upper, Task.status != TaskStatus.done.value)
+                    .order_by(Task.due_date, Task.id)
+                    .limit(self.batch_size)
+                )
+                if after is not None:
+                    stmt = stmt.where(tuple_(Task.due_date, Task.id) > after)
+                try:
+                    rows = db.execute(stmt).all()
+                except Exception:
+                    # 읽지 못한 구간은 다음 시도에서 다시 읽음
+                    with self._cond:
+                        self._loaded_until = previous
+                    raise
+                if not rows:
+                    break
+                with self._cond:
+                    for row in rows:
+                        due = as_utc(row.due_date)
+                        # 읽는 사이에 API 로 바뀐 태스크는 그쪽 값이 최신이므로 덮어쓰지 않음
+                        if row.id not in self._scheduled and self._fired.get(row.id) != due.timestamp():
+                            fire_at = max(due.timestamp() - self.lead, now)
+                            self._push(ReminderEvent(row.id, str(row.user_id), row.title, due, fire_at))
+                    self._cond.notify()
+                loaded += len(rows)
+                after = (rows[-1].due_date, rows[-1].id)
+                if len(rows) < self.batch_size:
+                    break
+        finally:
+            db.close()
+        return loaded
+
+    def _resync(self, now: float) -> int:
+        """Take the next ``2 * resync`` seconds of reminders from the database (writes of other processes)."""
+        with self._cond:
+            horizon = min(now + 2 * self.resync, self._loaded_until)
+        lower = datetime.fromtimestamp(now, timezone.utc)
+        upper = datetime.fromtimestamp(horizon + self.lead, timezone.utc)
+        db = SessionLocal()
+        try:
+            # due_date 인덱스의 짧은 범위만 읽음
+            rows = db.execute(
+                select(Task.id, Task.user_id, Task.title, Task.due_date)
+                .where(Task.due_date >= lower, Task.due_date < upper, Task.status != TaskStatus.done.value)
+                .order_by(Task.due_date, Task.id)
+                .limit(self.batch_size)
+            ).all()
+        finally:
+            db.close()
+        self._resynced_at = now
+        with self._cond:
+            seen = set()
+            for row in rows:
+                due = as_utc(row.due_date)
+                seen.add(row.id)
+                if self._fired.get(row.id) == due.timestamp():
+                    continue
+                current = self._scheduled.get(row.id)
+                if current is None or current.due_date != due or current.title != row.title:
+                    fire_at = max(due.timestamp() - self.lead, now)
+                    self._push(ReminderEvent(row.id, str(row.user_id), row.title, due, fire_at))
+            if len(rows) < self.batch_size:
+                # 이 구간에 있어야 하는데 DB 에 없으면 다른 곳에서 완료/삭제/변경된 것
+                for task_id, event in list(self._scheduled.items()):
+                    if task_id not in seen and lower <= event.due_date < upper:
+                        del self._scheduled[task_id]
+            self._cond.notify()
+        return len(rows)
+
+    def _pop_due(self, now: float) -> list[ReminderEvent]:
+        due = []
+        with self._cond:
+            while self._heap and self._heap[0][0] <= now:
+                fire_at, task_id = heapq.heappop(self._heap)
+                event = self._scheduled.get(task_id)
+                if event is not None and event.fire_at == fire_at:
+                    del self._scheduled[task_id]
+                    self._fired[task_id] = event.due_date.timestamp()
+                    due.append(event)
+            if self._fired:
+                self._fired = {task_id: due_at for task_id, due_at in self._fired.items() if due_at > now}
+        return due
+
+    def _emit(self, event: ReminderEvent) -> None:
+        for sink in self.sinks:
+            try:
+                sink.send(event)
+            except Exception as exc:
+                print(f"⚠️ Reminder sink {type(sink).__name__} failed: {exc}")
+        self.fired += 1
+
+    def _loop(self) -> None:
+        while not self._stop.is_set():
+            now = time.time()
+            if now >= self._loaded_until - self.window / 2:
+                try:
+                    self._load_window(now)
+                    self._resynced_at = now
+                except Exception as exc:  # DB 오류 시 잠시 후 다시 시도 (_load_window 가 경계를 되돌려 둠)
+                    print(f"⚠️ Reminder window load failed: {exc}")
+                    self._stop.wait(30)
+                    continue
+            elif now >= self._resynced_at + self.resync:
+                try:
+                    self._resync(now)
+                except Exception as exc:  # 다음 주기에 다시 읽음 (힙은 그대로 유지)
+                    print(f"⚠️ Reminder resync failed: {exc}")
+                    self._resynced_at = now
+            for event in self._pop_due(now):
+                self._emit(event)
+            with self._cond:
+                next_fire = self._heap[0][0] if self._heap else math.inf
+                wake_at = min(next_fire, self._loaded_until - self.window / 2, self._resynced_at + self.resync)
+                timeout = wake_at - time.time()
+                if timeout > 0 and not self._stop.is_set():
+                    self._cond.wait(timeout)
+
+    def start(self) -> None:
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name=self.name, daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        with self._cond:
+            self._cond.notify_all()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def stats(self) -> dict:
+        return {
+            "scheduled": len(self._scheduled),
+            "fired": self.fired,
+            "loaded_until": datetime.fromtimestamp(self._loaded_until, timezone.utc).isoformat()
+            if self._loaded_until else None,
+        }
+
+
+sse_sink = SseSink()
+
+
+def _build_sinks() -> list:
+    # 워커가 여러 개면 웹훅/로그는 워커 수만큼 발송되므로 한 인스턴스에서만 켜는 것을 권장.
+    # 힙은 워커마다 따로라서 다른 워커가 처리한 생성/수정은 _resync 주기(REMINDER_RESYNC_SECONDS)만큼 늦게 반영됨
+    sinks: list = [sse_sink]
+    if REMINDER_LOG:
+        sinks.append(LogSink())
+    if REMINDER_WEBHOOK_URL:
+        sinks.append(WebhookSink(REMINDER_WEBHOOK_URL))
+    return sinks
+
+
+reminder_engine = register(ReminderEngine(_build_sinks()))
@@ -0,0 +1,223 @@
+import itertools
+import os
+import threading
+import time
+from collections import OrderedDict
+from http.cookies import SimpleCookie
+from typing import Optional
+
+from fastapi import Request
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from database import SessionLocal, replica_engines
+from utils.background import PeriodicWorker, register
+from utils.batch import SHARED_SESSION_KEY
+from utils.redis_client import get_redis
+from utils.security import SESSION_COOKIE_NAME, get_session_id
+from utils.sessions import hash_token
+
+
+# 이보다 뒤처진 복제본은 읽기 대상에서 뺌
+REPLICA_MAX_LAG_SECONDS = float(os.getenv("REPLICA_MAX_LAG_SECONDS", "5"))
+REPLICA_HEALTH_INTERVAL_SECONDS = float(os.getenv("REPLICA_HEALTH_INTERVAL_SECONDS", "5"))
+# 쓰기 직후 이 시간 동안은 같은 세션의 읽기도 프라이머리로 보냄 (허용 지연보다 길게)
+READ_AFTER_WRITE_SECONDS = float(os.getenv("READ_AFTER_WRITE_SECONDS", str(REPLICA_MAX_LAG_SECONDS)))
+
+_UNSAFE_METHODS = {"POST", "PUT", "PATCH", "DELETE"}
+# POST 지만 아무것도 쓰지 않는 경로 (읽기 묶음 요청)
+_READ_ONLY_POSTS = {"/batch"}
+
+# 수신한 WAL 을 모두 적용했으면 지연 0 (쓰기가 없을 때 replay 시각만 보고 지연으로 오판하지 않도록)
+_PG_LAG_SQL = text(
+    "SELECT CASE WHEN NOT pg_is_in_recovery() OR pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) END"
+)
+
+
+class ReplicaPool:
+    """Round-robin over the replicas that passed the last health check."""
+
+    def __init__(self, engines: list[Engine], max_lag: float = REPLICA_MAX_LAG_SECONDS):
+        self.engines = engines
+        self.max_lag = max_lag
+        # 첫 헬스 체크 전에는 모두 정상으로 간주 (연결은 pool_pre_ping 이 확인)
+        self._healthy = list(engines)
+        self._lag: dict[str, Optional[float]] = {}
+        self._counter = itertools.count()
+
+    def choose(self) -> Optional[Engine]:
+        healthy = self._healthy
+        if not healthy:
+            return None
+        return healthy[next(self._counter) % len(healthy)]
+
+    def _lag_of(self, engine: Engine) -> float:
+        with engine.connect() as conn:
+            if engine.dialect.name == "postgresql":
+                return float(conn.execute(_PG_LAG_SQL).scalar() or 0)
+            conn.execute(text("SELECT 1"))
+            return 0.0
+
+    def check(self) -> int:
+        healthy = []
+        for engine in self.engines:
+            name = engine.url.render_as_string(hide_password=True)
+            try:
+                lag = self._lag_of(engine)
+            except Exception as exc:
+                lag = None
+                if self._lag.get(name, 0.0) is not None:
+                    print(f"⚠️ Replica {name} is unreachable: {exc}")
+            self._lag[name] = lag
+            if lag is not None and lag <= self.max_lag:
+                healthy.append(engine)
+        # 리스트를 통째로 바꿔서 choose() 가 락 없이 읽을 수 있게 함
+        self._healthy = healthy
+        return len(healthy)
+
+    def stats(self) -> dict:
+        return {"replicas": len(self.engines), "healthy": len(self._healthy), "lag_seconds": dict(self._lag)}
+
+
+class MemoryWriteMarker:
+    """token_hash -> time of the last write, bounded; only visible to this worker process."""
+
+    blocking = False
+
+    def __init__(self, ttl: float = READ_AFTER_WRITE_SECONDS, max_entries: int = 50_000):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._marks: OrderedDict[str, float] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def mark(self, key: str) -> None:
+        with self._lock:
+            self._marks[key] = time.monotonic() + self.ttl
+            self._marks.move_to_end(key)
+            if len(self._marks) > self.max_entries:
+                self._marks.popitem(last=False)
+
+    def recent(self, key: str) -> bool:
+        with self._lock:
+            until = self._marks.get(key)
+            if until is None:
+                return False
+            if until < time.monotonic():
+                del self._marks[key]
+                return False
+            return True
+
+
+class RedisWriteMarker:
+    """Same interface backed by Redis, so a write on one worker is seen by all of them."""
+
+    blocking = True
+
+    def __init__(self, client, ttl: float = READ_AFTER_WRITE_SECONDS):
+        self.client = client
+        self.ttl_ms = max(1, int(ttl * 1000))
+
+    def mark(self, key: str) -> None:
+        try:
+            self.client.set(f"raw:{key}", 1, px=self.ttl_ms)
+        except Exception:
+            pass
+
+    def recent(self, key: str) -> bool:
+        try:
+            return bool(self.client.exists(f"raw:{key}"))
+        except Exception:
+            # 확인할 수 없으면 안전하게 프라이머리로
+            return True
+
+
+def _build_marker():
+    client = get_redis(os.getenv("SESSION_REDIS_URL"))
+    return RedisWriteMarker(client) if client is not None else MemoryWriteMarker()
+
+
+replica_pool = ReplicaPool(replica_engines)
+write_marker = _build_marker()
+
+
+def _marker_key(token: Optional[str]) -> Optional[str]:
+    return hash_token(token) if token else None
+
+
+def open_read_session(request: Request) -> Session:
+    """New session on a healthy replica unless this client wrote just now; the caller closes it."""
+    db = SessionLocal()
+    key = _marker_key(get_session_id(request))
+    if replica_pool.engines and not (key and write_marker.recent(key)):
+        db.info["replica"] = replica_pool.choose()
+    return db
+
+
+def get_read_db(request: Request):
+    """Session for read-only endpoints (see ``open_read_session``)."""
+    shared = request.scope.get(SHARED_SESSION_KEY)
+    if shared is not None:
+        # /batch 의 하위 요청: 바깥 요청이 연 세션(같은 트랜잭션)을 쓰고 닫지 않음
+        yield shared
+        return
+    db = open_read_session(request)
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+def _mark_all(keys: list[str]) -> None:
+    for key in keys:
+        write_marker.mark(key)
+
+
+def _cookie_token(headers) -> Optional[str]:
+    for name, value in headers:
+        if name.lower() != b"set-cookie":
+            continue
+        cookie = SimpleCookie()
+        cookie.load(value.decode("latin-1"))
+        morsel = cookie.get(SESSION_COOKIE_NAME)
+        if morsel is not None and morsel.value:
+            return morsel.value
+    return None
+
+
+class ReadAfterWriteMiddleware:
+    """Marks the client's session after a successful write so its next reads use the primary.
+
+    Also marks a session token issued by the response (login, new guest),
+    whose session row may not have reached the replicas yet.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not replica_pool.engines:
+            await self.app(scope, receive, send)
+            return
+        request = Request(scope)
+        unsafe = scope["method"] in _UNSAFE_METHODS and scope["path"] not in _READ_ONLY_POSTS
+
+        async def send_and_mark(message):
+            if message["type"] == "http.response.start":
+                keys = [_marker_key(_cookie_token(message.get("headers", [])))]
+                if unsafe and message["status"] < 400:
+                    keys.append(_marker_key(get_session_id(request)))
+                keys = [key for key in keys if key]
+                if keys and write_marker.blocking:
+                    await run_in_threadpool(_mark_all, keys)
+                elif keys:
+                    _mark_all(keys)
+            await send(message)
+
+        await self.app(scope, receive, send_and_mark)
+
+
+if replica_engines:
+    register(PeriodicWorker("db-replica-health", REPLICA_HEALTH_INTERVAL_SECONDS, replica_pool.check))
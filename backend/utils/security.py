@@ -1,5 +1,6 @@
 from datetime import datetime, timedelta, timezone
 from typing import Optional
+import os
 import uuid
 
 from passlib.context import CryptContext
@@ -8,46 +9,63 @@ from sqlalchemy.orm import Session
 
 from database import get_db
 from models.user import User
+from utils.batch import SHARED_USER_KEY
+from utils.gates import bcrypt_gate
+from utils.sessions import session_store
 
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# bcrypt 비용. 테스트에서는 4 로 낮춰서 해시 한 번에 수 ms 로 끝나게 함 (운영에서는 기본값 유지)
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=BCRYPT_ROUNDS)
 
 # Simple session-based auth using cookies
 SESSION_COOKIE_NAME = "session_id"
 
 
 def get_password_hash(password: str) -> str:
-    return pwd_context.hash(password)
+    # 게이트가 꽉 차면 기다리지 않고 503 (bcrypt 는 워커 CPU 를 통째로 씀)
+    with bcrypt_gate.slot():
+        return pwd_context.hash(password)
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+    with bcrypt_gate.slot():
+        return pwd_context.verify(plain_password, hashed_password)
 
 
 def create_session_id() -> str:
     return str(uuid.uuid4())
 
 
-def get_current_user_from_session(
-    request: Request, db: Session = Depends(get_db)
-) -> Optional[User]:
+def get_session_id(request: Request) -> Optional[str]:
     # 먼저 Authorization 헤더에서 세션 ID 확인 (CORS 환경에서 더 안정적)
     auth_header = request.headers.get("Authorization")
-    session_id = None
-    
     if auth_header and auth_header.startswith("Bearer "):
-        session_id = auth_header.replace("Bearer ", "")
-        print(f"🔍 Session ID from header: {session_id}")
-    else:
-        # 쿠키에서 세션 ID 확인 (백업)
-        session_id = request.cookies.get(SESSION_COOKIE_NAME)
-        print(f"🔍 Session ID from cookie: {session_id}")
-    
+        return auth_header.replace("Bearer ", "")
+    # 쿠키에서 세션 ID 확인 (백업)
+    return request.cookies.get(SESSION_COOKIE_NAME)
+
+
+def get_current_user_from_session(
+    request: Request, db: Session = Depends(get_db)
+) -> Optional[User]:
+    # /batch 의 하위 요청은 바깥 요청에서 한 번 확인한 유저를 그대로 씀
+    shared_user = request.scope.get(SHARED_USER_KEY)
+    if shared_user is not None:
+        return shared_user
+
+    session_id = get_session_id(request)
     if not session_id:
         print("❌ No session ID found")
         return None
-    
-    user = db.query(User).filter(User.session_id == session_id).first()
+
+    user_id = session_store.lookup(db, session_id)
+    if user_id is None and db.info.get("replica") is not None:
+        # 복제 지연으로 방금 만든 세션이 아직 복제본에 없을 수 있으므로 프라이머리에서 다시 확인
+        db.info["replica"] = None
+        user_id = session_store.lookup(db, session_id)
+    user = db.get(User, user_id) if user_id else None
     print(f"🔍 User found for session: {user is not None}")
     return user
 
@@ -75,9 +93,10 @@ def get_current_user_optional(
             name="体験モード",
             mail=f"anon_{session_id[:8]}@local.temp",
             password=get_password_hash("anonymous"),
-            session_id=session_id
         )
         db.add(user)
+        db.flush()
+        session_store.create(db, user.id, session_id)
         db.commit()
         db.refresh(user)
         new_session_id = session_id
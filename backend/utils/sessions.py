@@ -0,0 +1,206 @@
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Optional
+
+from sqlalchemy import bindparam, delete, update
+from sqlalchemy.orm import Session
+
+from database import SessionLocal
+from models.session import UserSession
+from models.types import utcnow
+from utils.background import PeriodicWorker, register
+from utils.redis_client import get_redis
+
+
+SESSION_TTL = timedelta(hours=24)
+# 조회 결과 캐시 유지 시간. 다른 워커에서 로그아웃한 세션이 이 시간만큼 더 살아있을 수 있음
+SESSION_CACHE_SECONDS = float(os.getenv("SESSION_CACHE_SECONDS", "60"))
+# last_seen_at 은 이 간격보다 촘촘하게 기록하지 않음
+LAST_SEEN_RESOLUTION = float(os.getenv("SESSION_LAST_SEEN_RESOLUTION", "60"))
+LAST_SEEN_FLUSH_SECONDS = float(os.getenv("SESSION_LAST_SEEN_FLUSH_SECONDS", "30"))
+
+
+def hash_token(token: str) -> str:
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+class MemorySessionCache:
+    """token_hash -> (user_id, expires_at epoch), bounded LRU with a short TTL."""
+
+    def __init__(self, max_entries: int = 50_000, ttl: float = SESSION_CACHE_SECONDS):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: OrderedDict[str, tuple[str, float, float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, token_hash: str) -> Optional[tuple[str, float]]:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(token_hash)
+            if entry is None:
+                return None
+            user_id, expires_at, cached_until = entry
+            if cached_until < now:
+                del self._entries[token_hash]
+                return None
+            self._entries.move_to_end(token_hash)
+            return user_id, expires_at
+
+    def set(self, token_hash: str, user_id: str, expires_at: float) -> None:
+        with self._lock:
+            self._entries[token_hash] = (user_id, expires_at, time.monotonic() + self.ttl)
+            self._entries.move_to_end(token_hash)
+            if len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, token_hash: str) -> None:
+        with self._lock:
+            self._entries.pop(token_hash, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+class RedisSessionCache:
+    """Same interface backed by Redis, so a logout is visible to every worker at once."""
+
+    def __init__(self, client, ttl: float = SESSION_CACHE_SECONDS):
+        self.client = client
+        self.ttl = max(1, int(ttl))
+
+    def get(self, token_hash: str) -> Optional[tuple[str, float]]:
+        try:
+            raw = self.client.get(f"sess:{token_hash}")
+        except Exception:
+            return None
+        if raw is None:
+            return None
+        user_id, _, expires_at = raw.decode().rpartition("|")
+        return user_id, float(expires_at)
+
+    def set(self, token_hash: str, user_id: str, expires_at: float) -> None:
+        try:
+            self.client.set(f"sess:{token_hash}", f"{user_id}|{expires_at}", ex=self.ttl)
+        except Exception:
+            pass
+
+    def delete(self, token_hash: str) -> None:
+        try:
+            self.client.delete(f"sess:{token_hash}")
+        except Exception:
+            pass
+
+    def clear(self) -> None:
+        pass
+
+
+class LastSeenBuffer:
+    """Coalesces last-seen updates in memory and writes them in one batched UPDATE."""
+
+    def __init__(self, resolution: float = LAST_SEEN_RESOLUTION):
+        self.resolution = resolution
+        self._pending: dict[str, datetime] = {}
+        self._written: dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def touch(self, token_hash: str) -> None:
+        now = time.monotonic()
+        with self._lock:
+            if now - self._written.get(token_hash, float("-inf")) < self.resolution:
+                return
+            self._written[token_hash] = now
+            self._pending[token_hash] = utcnow()
+
+    def forget(self, token_hash: str) -> None:
+        with self._lock:
+            self._pending.pop(token_hash, None)
+            self._written.pop(token_hash, None)
+
+    def flush(self) -> int:
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            # 오래된 기록은 버려서 dict 가 계속 커지지 않게 함
+            cutoff = time.monotonic() - self.resolution
+            self._written = {k: v for k, v in self._written.items() if v >= cutoff}
+        if not pending:
+            return 0
+        stmt = (
+            update(UserSession.__table__)
+            .where(UserSession.__table__.c.token_hash == bindparam("h"))
+            .values(last_seen_at=bindparam("ts"))
+        )
+        db = SessionLocal()
+        try:
+            db.execute(stmt, [{"h": h, "ts": ts} for h, ts in pending.items()])
+            db.commit()
+        finally:
+            db.close()
+        return len(pending)
+
+
+class SessionStore:
+    def __init__(self, cache=None, last_seen: Optional[LastSeenBuffer] = None):
+        self.cache = cache or MemorySessionCache()
+        self.last_seen = last_seen or LastSeenBuffer()
+
+    def create(self, db: Session, user_id: str, token: str, ttl: timedelta = SESSION_TTL) -> UserSession:
+        """Persist a new session for ``token``; the caller commits."""
+        now = utcnow()
+        session = UserSession(
+            token_hash=hash_token(token),
+            user_id=str(user_id),
+            created_at=now,
+            expires_at=now + ttl,
+            last_seen_at=now,
+        )
+        db.add(session)
+        return session
+
+    def lookup(self, db: Session, token: str) -> Optional[str]:
+        """Return the user id owning ``token`` or None when unknown or expired."""
+        token_hash = hash_token(token)
+        cached = self.cache.get(token_hash)
+        if cached is None:
+            row = db.get(UserSession, token_hash)
+            if row is None:
+                return None
+            cached = (row.user_id, row.expires_at.timestamp())
+            self.cache.set(token_hash, *cached)
+
+        user_id, expires_at = cached
+        if expires_at <= time.time():
+            return None
+        self.last_seen.touch(token_hash)
+        return user_id
+
+    def revoke(self, db: Session, token: str) -> None:
+        """Delete the session for ``token``; the caller commits."""
+        token_hash = hash_token(token)
+        db.execute(delete(UserSession).where(UserSession.token_hash == token_hash))
+        self.cache.delete(token_hash)
+        self.last_seen.forget(token_hash)
+
+    def purge_expired(self) -> int:
+        db = SessionLocal()
+        try:
+            result = db.execute(delete(UserSession).where(UserSession.expires_at <= utcnow()))
+            db.commit()
+            return result.rowcount
+        finally:
+            db.close()
+
+
+def _build_store() -> SessionStore:
+    client = get_redis(os.getenv("SESSION_REDIS_URL"))
+    return SessionStore(cache=RedisSessionCache(client) if client is not None else MemorySessionCache())
+
+
+session_store = _build_store()
+
+register(PeriodicWorker("session-last-seen", LAST_SEEN_FLUSH_SECONDS, session_store.last_seen.flush, run_on_stop=True))
+register(PeriodicWorker("session-purge", 60 * 60, session_store.purge_expired))
@@ -0,0 +1,94 @@
+import itertools
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Any, Callable, Hashable
+
+
+class Generations:
+    """Per-user data generation, bumped after every write.
+
+    Values come from one global counter. Past ``max_entries`` only the
+    least recently used user is evicted; users without an entry read the
+    highest evicted value, which is at least their own last generation
+    and was never another state of theirs, so a stale generation never
+    comes back.
+    """
+
+    def __init__(self, max_entries: int = 100_000):
+        self.max_entries = max_entries
+        self._counter = itertools.count(1)
+        self._values: OrderedDict[str, int] = OrderedDict()
+        self._floor = 0
+        self._lock = threading.Lock()
+
+    def get(self, user_id: str) -> int:
+        key = str(user_id)
+        with self._lock:
+            value = self._values.get(key)
+            if value is None:
+                return self._floor
+            self._values.move_to_end(key)
+            return value
+
+    def bump(self, user_id: str) -> int:
+        key = str(user_id)
+        with self._lock:
+            value = self._values[key] = next(self._counter)
+            self._values.move_to_end(key)
+            while len(self._values) > self.max_entries:
+                _, evicted = self._values.popitem(last=False)
+                self._floor = max(self._floor, evicted)
+        return value
+
+
+class SingleFlight:
+    """Collapse concurrent calls with the same key into one execution.
+
+    The first caller (leader) runs ``fn``; callers arriving while it is
+    still running wait for and share its result. Nothing is cached after
+    the leader finishes.
+    """
+
+    def __init__(self):
+        self._calls: dict[Hashable, Future] = {}
+        self._lock = threading.Lock()
+        self.leaders = 0
+        self.collapsed = 0
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> tuple[Any, bool]:
+        """Return ``(result, shared)``; ``shared`` is True for followers."""
+        with self._lock:
+            future = self._calls.get(key)
+            if future is not None:
+                self.collapsed += 1
+                leader = False
+            else:
+                future = self._calls[key] = Future()
+                self.leaders += 1
+                leader = True
+
+        if not leader:
+            return future.result(), True
+
+        try:
+            future.set_result(fn())
+        except BaseException as exc:
+            future.set_exception(exc)
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+        return future.result(), False
+
+    def stats(self) -> dict:
+        total = self.leaders + self.collapsed
+        return {
+            "executed": self.leaders,
+            "collapsed": self.collapsed,
+            "in_flight": len(self._calls),
+            "collapse_ratio": round(self.collapsed / total, 4) if total else 0.0,
+        }
+
+
+task_generations = Generations()
+list_flight = SingleFlight()
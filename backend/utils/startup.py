@@ -0,0 +1,98 @@
+import importlib
+import importlib.util
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from sqlalchemy import select, text
+from sqlalchemy.orm import configure_mappers
+
+
+# 워밍업 시 미리 열어둘 커넥션 수 (풀 크기를 넘지 않음)
+WARM_POOL_SIZE = int(os.getenv("DB_WARM_POOL_SIZE", "2"))
+
+
+def lazy_module(name: str):
+    """Return module ``name`` whose body only executes on first attribute access.
+
+    Used for heavy dependencies that only a few routes need, so importing
+    ``main`` stays cheap on a cold container.
+    """
+    if name in sys.modules:
+        return sys.modules[name]
+    spec = importlib.util.find_spec(name)
+    if spec is None or spec.loader is None:
+        raise ImportError(f"No module named {name!r}")
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
+
+
+def warm_pool(engine, size: int = WARM_POOL_SIZE) -> int:
+    """Open ``size`` connections concurrently and return them to the pool."""
+    pool_size = getattr(engine.pool, "size", lambda: 1)()
+    size = max(1, min(size, pool_size))
+
+    def _ping(_):
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+
+    if size == 1:
+        _ping(None)
+    else:
+        with ThreadPoolExecutor(max_workers=size) as executor:
+            list(executor.map(_ping, range(size)))
+    return size
+
+
+def warm_password_hasher() -> str:
+    """Resolve passlib's bcrypt backend now instead of on the first login."""
+    from utils.security import pwd_context
+
+    # get_backend() 가 backend 로딩과 passlib 의 self-test 를 모두 끝냄
+    return pwd_context.handler("bcrypt").get_backend()
+
+
+def hot_queries():
+    """Statements shaped like the ones every request runs."""
+    from models.session import UserSession
+    from models.task import Task
+    from models.user import User
+
+    return [
+        select(UserSession).where(UserSession.token_hash == "warmup"),
+        select(User).where(User.id == "warmup"),
+        select(Task).where(Task.user_id == "warmup").order_by(Task.created_at.desc()).offset(0).limit(50),
+        select(Task).where(Task.id == 0, Task.user_id == "warmup"),
+    ]
+
+
+def compile_hot_queries(engine) -> int:
+    """Execute the hot statements once so SQLAlchemy's compiled cache is filled."""
+    configure_mappers()
+    statements = hot_queries()
+    with engine.connect() as conn:
+        for stmt in statements:
+            conn.execute(stmt).all()
+    return len(statements)
+
+
+def warm_up(engine) -> dict:
+    """Run every warm-up step and return per-step timings in milliseconds."""
+    timings = {}
+    for name, step in (
+        ("pool", lambda: warm_pool(engine)),
+        ("hasher", warm_password_hasher),
+        ("queries", lambda: compile_hot_queries(engine)),
+    ):
+        started = time.perf_counter()
+        try:
+            step()
+        except Exception as exc:  # 워밍업 실패로 서버 기동을 막지 않음
+            print(f"⚠️ Warm-up step '{name}' failed: {exc}")
+        timings[name] = round((time.perf_counter() - started) * 1000, 1)
+    return timings
@@ -0,0 +1,81 @@
+import os
+from typing import List
+
+from sqlalchemy import func, literal, select
+from sqlalchemy.orm import Query, Session, with_expression
+
+from models.task import Task, TaskStatus
+
+
+# 트리 깊이 상한. 순환이 생긴 데이터에서도 재귀 CTE 가 끝나도록 함
+MAX_SUBTASK_DEPTH = int(os.getenv("MAX_SUBTASK_DEPTH", "10"))
+
+_tasks = Task.__table__
+
+
+def with_progress(query: Query, source=Task) -> Query:
+    """Fill ``subtasks_total``/``subtasks_done`` in the same SELECT.
+
+    Each is a correlated aggregate over the (parent_id, status) index, so
+    a page of parents costs no extra round trips however many it holds.
+    """
+    children = _tasks.alias("children")
+    total = (
+        select(func.count())
+        .where(children.c.parent_id == source.id)
+        .correlate_except(children)
+        .scalar_subquery()
+    )
+    done = (
+        select(func.count())
+        .where(children.c.parent_id == source.id, children.c.status == TaskStatus.done.value)
+        .correlate_except(children)
+        .scalar_subquery()
+    )
+    return query.options(
+        with_expression(source.subtasks_total, total),
+        with_expression(source.subtasks_done, done),
+    )
+
+
+def _subtree(root_id: int, user_id: str, max_depth: int):
+    tree = (
+        select(_tasks.c.id, literal(0).label("depth"))
+        .where(_tasks.c.id == root_id, _tasks.c.user_id == user_id)
+        .cte("subtree", recursive=True)
+    )
+    children = _tasks.alias("children")
+    return tree.union_all(
+        select(children.c.id, tree.c.depth + 1)
+        .where(children.c.parent_id == tree.c.id, tree.c.depth < max_depth)
+    )
+
+
+def subtree_query(db: Session, root_id: int, user_id: str, max_depth: int = MAX_SUBTASK_DEPTH) -> Query:
+    """``root_id`` and all of its descendants (with ``depth``) in one recursive CTE."""
+    tree = _subtree(root_id, user_id, max_depth)
+    return with_progress(
+        db.query(Task, tree.c.depth).join(tree, tree.c.id == Task.id).order_by(tree.c.depth, Task.rank, Task.id)
+    )
+
+
+def subtree_height(db: Session, root_id: int, user_id: str, max_depth: int = MAX_SUBTASK_DEPTH) -> int:
+    """Levels below ``root_id`` (0 for a leaf), counted up to ``max_depth``."""
+    tree = _subtree(root_id, user_id, max_depth)
+    return db.scalar(select(func.coalesce(func.max(tree.c.depth), 0)))
+
+
+def ancestor_ids(db: Session, task_id: int, max_depth: int = MAX_SUBTASK_DEPTH) -> List[int]:
+    """``task_id`` followed by its ancestors, nearest first."""
+    chain = (
+        select(_tasks.c.id, _tasks.c.parent_id, literal(0).label("depth"))
+        .where(_tasks.c.id == task_id)
+        .cte("ancestors", recursive=True)
+    )
+    parents = _tasks.alias("parents")
+    chain = chain.union_all(
+        select(parents.c.id, parents.c.parent_id, chain.c.depth + 1)
+        .where(parents.c.id == chain.c.parent_id, chain.c.depth <= max_depth)
+    )
+    return db.scalars(select(chain.c.id).order_by(chain.c.depth)).all()
+
@@ -0,0 +1,99 @@
+from typing import Iterable, List, Optional
+
+from sqlalchemy import func, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.attributes import set_committed_value
+
+from models.tag import Tag, task_tags
+
+
+MAX_TAGS_PER_TASK = 20
+
+
+def parse_tag_list(value: Optional[str]) -> List[str]:
+    """``"work, home,work"`` -> ``["home", "work"]`` (query parameter form)."""
+    if not value:
+        return []
+    return sorted({name.strip() for name in value.split(",") if name.strip()})
+
+
+def resolve_tags(db: Session, user_id: str, names: Iterable[str]) -> List[Tag]:
+    """Tag rows for ``names``, creating the missing ones; the caller commits."""
+    names = sorted(set(names))
+    if not names:
+        return []
+    existing = {
+        tag.name: tag
+        for tag in db.scalars(select(Tag).where(Tag.user_id == user_id, Tag.name.in_(names)))
+    }
+    for name in names:
+        if name in existing:
+            continue
+        # 같은 이름을 동시에 만드는 요청이 있으면 UNIQUE 위반 -> 세이브포인트만 되돌리고 다시 읽음
+        try:
+            with db.begin_nested():
+                tag = Tag(user_id=user_id, name=name)
+                db.add(tag)
+        except IntegrityError:
+            tag = db.scalars(select(Tag).where(Tag.user_id == user_id, Tag.name == name)).one()
+        existing[name] = tag
+    return [existing[name] for name in names]
+
+
+def tagged_task_ids(user_id: str, any_of: List[str] = (), all_of: List[str] = ()):
+    """Subqueries of task ids carrying any of / all of the given tag names.
+
+    Used as ``Task.id IN (...)`` semi-joins: the tag names resolve through
+    the (user_id, name) unique index and the task ids come straight from
+    the (tag_id, task_id) index, so tasks themselves are never scanned.
+    """
+    subqueries = []
+    if any_of:
+        subqueries.append(
+            select(task_tags.c.task_id)
+            .join(Tag, Tag.id == task_tags.c.tag_id)
+            .where(Tag.user_id == user_id, Tag.name.in_(any_of))
+        )
+    if all_of:
+        subqueries.append(
+            select(task_tags.c.task_id)
+            .join(Tag, Tag.id == task_tags.c.tag_id)
+            .where(Tag.user_id == user_id, Tag.name.in_(all_of))
+            .group_by(task_tags.c.task_id)
+            .having(func.count() == len(set(all_of)))
+        )
+    return subqueries
+
+
+def attach_tags(db: Session, tasks: list) -> list:
+    """Fill ``tags`` of tasks read through an alias (``tasks UNION ALL tasks_archive``) in one query.
+
+    The relationship's own loader joins back to ``tasks`` and so finds
+    nothing for archived rows; this reads the (task_id, tag_id) primary
+    key directly. Load such queries with ``noload`` on ``tags``.
+    """
+    by_task: dict[int, List[Tag]] = {task.id: [] for task in tasks}
+    if by_task:
+        rows = db.execute(
+            select(task_tags.c.task_id, Tag)
+            .join(Tag, Tag.id == task_tags.c.tag_id)
+            .where(task_tags.c.task_id.in_(by_task))
+            .order_by(Tag.name)
+        ).all()
+        for task_id, tag in rows:
+            by_task[task_id].append(tag)
+    for task in tasks:
+        set_committed_value(task, "tags", by_task[task.id])
+    return tasks
+
+
+def tag_counts(db: Session, user_id: str) -> List[tuple[str, int]]:
+    """(name, number of tasks, archived ones included) for every tag of the user, without loading any task."""
+    return db.execute(
+        select(Tag.name, func.count(task_tags.c.task_id))
+        .outerjoin(task_tags, task_tags.c.tag_id == Tag.id)
+        .where(Tag.user_id == user_id)
+        .group_by(Tag.id, Tag.name)
+        .order_by(Tag.name)
+    ).all()
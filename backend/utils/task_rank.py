@@ -0,0 +1,109 @@
+import os
+from typing import Optional
+
+from sqlalchemy import bindparam, func, select, update
+from sqlalchemy.orm import Session
+
+from database import SessionLocal
+from models.task import Task
+from utils.background import PeriodicWorker, register
+from models.fractional_index import key_between, sequential_keys
+from utils.singleflight import task_generations
+
+
+# 이 길이를 넘는 키를 가진 유저는 백그라운드에서 키를 다시 매김
+RANK_REBALANCE_LENGTH = int(os.getenv("RANK_REBALANCE_LENGTH", "24"))
+RANK_REBALANCE_INTERVAL_SECONDS = float(os.getenv("RANK_REBALANCE_INTERVAL_SECONDS", str(60 * 60)))
+# 한 번에 처리할 최대 유저 수
+RANK_REBALANCE_MAX_USERS = int(os.getenv("RANK_REBALANCE_MAX_USERS", "100"))
+
+_tasks = Task.__table__
+
+
+class NeighborOrderError(ValueError):
+    """``after`` is ranked below ``before`` (a client error, not a key collision)."""
+
+
+def _neighbor_rank(db: Session, user_id: str, rank: str, after: bool) -> Optional[str]:
+    """Rank of the task right after (or before) ``rank``, read from the (user_id, rank) index."""
+    column = _tasks.c.rank
+    stmt = select(column).where(_tasks.c.user_id == user_id)
+    if after:
+        stmt = stmt.where(column > rank).order_by(column.asc())
+    else:
+        stmt = stmt.where(column < rank).order_by(column.desc())
+    return db.scalar(stmt.limit(1))
+
+
+def rank_between(db: Session, user_id: str, after: Optional[Task], before: Optional[Task]) -> Optional[str]:
+    """New rank placing a task after ``after`` and before ``before``.
+
+    A missing neighbour is looked up so the key lands right next to the given
+    one. Returns None when the two neighbours share a key (only possible
+    after concurrent inserts), in which case the caller rebalances first.
+    Raises NeighborOrderError when ``after`` sorts after ``before``.
+    """
+    lower = after.rank if after is not None else None
+    upper = before.rank if before is not None else None
+    if lower is not None and upper is None:
+        upper = _neighbor_rank(db, user_id, lower, after=True)
+    elif upper is not None and lower is None:
+        lower = _neighbor_rank(db, user_id, upper, after=False)
+    if lower is not None and upper is not None:
+        if lower > upper:
+            raise NeighborOrderError(f"{lower!r} > {upper!r}")
+        if lower == upper:
+            return None
+    return key_between(lower, upper)
+
+
+def rebalance_user(db: Session, user_id: str) -> int:
+    """Rewrite every rank of ``user_id`` as short sequential keys, keeping the order; the caller commits.
+
+    The user's rows are locked (FOR UPDATE on PostgreSQL) and every
+    ``version`` is bumped, so a move computed from the old keys fails its
+    version check with 409 instead of landing between stale neighbours.
+    Callers holding loaded tasks of this user must refresh them.
+    """
+    ids = db.scalars(
+        select(_tasks.c.id)
+        .where(_tasks.c.user_id == user_id)
+        .order_by(_tasks.c.rank.asc(), _tasks.c.id.asc())
+        .with_for_update()
+    ).all()
+    if not ids:
+        return 0
+    stmt = (
+        update(_tasks)
+        .where(_tasks.c.id == bindparam("task_id"))
+        .values(rank=bindparam("new_rank"), version=_tasks.c.version + 1)
+    )
+    db.execute(stmt, [{"task_id": i, "new_rank": k} for i, k in zip(ids, sequential_keys(len(ids)))])
+    task_generations.bump(user_id)
+    return len(ids)
+
+
+def rebalance_long_ranks(max_length: int = RANK_REBALANCE_LENGTH, max_users: int = RANK_REBALANCE_MAX_USERS) -> int:
+    db = SessionLocal()
+    try:
+        user_ids = db.scalars(
+            select(_tasks.c.user_id)
+            .where(func.length(_tasks.c.rank) > max_length)
+            .distinct()
+            .limit(max_users)
+        ).all()
+        for user_id in user_ids:
+            # 유저 단위로 짧은 트랜잭션
+            rebalance_user(db, user_id)
+            db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+    if user_ids:
+        print(f"🔀 Rebalanced task ranks for {len(user_ids)} users")
+    return len(user_ids)
+
+
+register(PeriodicWorker("task-rank-rebalance", RANK_REBALANCE_INTERVAL_SECONDS, rebalance_long_ranks))
@@ -1,173 +1,360 @@
 #!/usr/bin/env python3
 """
 데이터베이스 관리 도구
-사용법: python3 db_manager.py [명령어]
+사용법: python3 db_manager.py [옵션] [명령어]
 
 명령어:
-  users          - 모든 유저 목록 표시
-  tasks          - 모든 태스크 목록 표시  
+  users          - 모든 유저 목록 표시 (태스크 수, 활성 세션 수 포함)
+  tasks          - 모든 태스크 목록 표시 (--user 로 특정 유저만)
   user [유저ID]  - 특정 유저의 태스크 보기
-  clean          - 익명 유저와 그들의 태스크 삭제
+  clean          - 익명 유저와 그들의 태스크/세션 삭제 (--dry-run 지원)
   stats          - 통계 정보
+  grant-admin [메일|유저ID]  - 관리자 권한 부여 (/admin/* 엔드포인트)
+  revoke-admin [메일|유저ID] - 관리자 권한 회수
+
+옵션:
+  --database-url URL     - 접속할 DB (기본: $DATABASE_URL, 없으면 backend/app.db)
+  --format table|json|csv - 출력 형식 (기본: table)
+  --limit N / --after-id ID - 페이지 단위 조회 (tasks 는 id 기준 keyset)
+  --batch-size N         - 서버 측 커서에서 한 번에 가져올 행 수
+
+SQLAlchemy 모델/엔진을 그대로 사용하므로 SQLite 와 PostgreSQL 모두에서 동작하며,
+결과는 서버 측 커서로 스트리밍해서 메모리에 전부 올리지 않는다.
 """
 
-import sqlite3
+import argparse
+import csv
+import json
+import os
 import sys
 from datetime import datetime
 
-DB_PATH = "backend/app.db"
-
-def connect_db():
-    return sqlite3.connect(DB_PATH)
-
-def show_users():
-    conn = connect_db()
-    cursor = conn.cursor()
-    
-    print("=== 등록된 유저 목록 ===")
-    cursor.execute("""
-        SELECT id, name, mail, session_id,
-               (SELECT COUNT(*) FROM tasks WHERE user_id = user_table.id) as task_count
-        FROM user_table 
-        ORDER BY name
-    """)
-    
-    print(f"{'ID':<40} {'이름':<15} {'이메일':<25} {'태스크수':<8} {'세션ID'}")
-    print("-" * 100)
-    
-    for row in cursor.fetchall():
-        user_id, name, mail, session_id, task_count = row
-        session_short = (session_id[:8] + "...") if session_id else "없음"
-        print(f"{user_id:<40} {name:<15} {mail:<25} {task_count:<8} {session_short}")
-    
-    conn.close()
-
-def show_tasks():
-    conn = connect_db()
-    cursor = conn.cursor()
-    
-    print("=== 모든 태스크 목록 ===")
-    cursor.execute("""
-        SELECT t.id, t.title, t.status, t.priority, t.due_date, 
-               u.name as user_name, t.created_at
-        FROM tasks t 
-        LEFT JOIN user_table u ON t.user_id = u.id 
-        ORDER BY t.created_at DESC
-    """)
-    
-    print(f"{'ID':<4} {'제목':<20} {'상태':<12} {'우선도':<6} {'유저':<15} {'생성일'}")
-    print("-" * 80)
-    
-    for row in cursor.fetchall():
-        task_id, title, status, priority, due_date, user_name, created_at = row
-        title_short = (title[:17] + "...") if len(title) > 20 else title
-        created_short = created_at[:10] if created_at else ""
-        print(f"{task_id:<4} {title_short:<20} {status:<12} {priority:<6} {user_name or 'Unknown':<15} {created_short}")
-    
-    conn.close()
-
-def show_user_tasks(user_id):
-    conn = connect_db()
-    cursor = conn.cursor()
-    
-    # 유저 정보 확인
-    cursor.execute("SELECT name, mail FROM user_table WHERE id = ?", (user_id,))
-    user = cursor.fetchone()
-    
+ROOT = os.path.dirname(os.path.abspath(__file__))
+BACKEND_DIR = os.path.join(ROOT, "backend")
+
+ANON_MAIL_PATTERN = "anon\\_%@local.temp"
+
+
+def _bootstrap(database_url):
+    """Point the backend's engine at the requested DB and import it."""
+    if database_url:
+        os.environ["DATABASE_URL"] = database_url
+    elif not os.getenv("DATABASE_URL"):
+        os.environ["DATABASE_URL"] = "sqlite:///" + os.path.join(BACKEND_DIR, "app.db")
+    sys.path.insert(0, BACKEND_DIR)
+
+
+class TableWriter:
+    def __init__(self, columns, out=sys.stdout):
+        self.columns = columns  # [(key, label, width)]
+        self.out = out
+        header = " ".join(f"{label:<{width}}" for _, label, width in columns)
+        print(header, file=out)
+        print("-" * len(header), file=out)
+
+    @staticmethod
+    def _cell(value, width):
+        if value is None:
+            value = ""
+        elif isinstance(value, datetime):
+            value = value.strftime("%Y-%m-%d %H:%M")
+        value = str(value)
+        return (value[: width - 3] + "...") if len(value) > width else value
+
+    def write(self, row):
+        print(" ".join(f"{self._cell(row.get(key), width):<{width}}" for key, _, width in self.columns), file=self.out)
+
+    def close(self, count):
+        print(f"\n({count}건)", file=self.out)
+
+
+class JsonWriter:
+    """Streams a JSON array one row at a time instead of building it in memory."""
+
+    def __init__(self, columns, out=sys.stdout):
+        self.out = out
+        self.first = True
+        self.out.write("[")
+
+    def write(self, row):
+        self.out.write(("\n" if self.first else ",\n") + json.dumps(row, ensure_ascii=False, default=_json_default))
+        self.first = False
+
+    def close(self, count):
+        self.out.write("\n]\n")
+
+
+class CsvWriter:
+    def __init__(self, columns, out=sys.stdout):
+        self.writer = csv.DictWriter(out, fieldnames=[key for key, _, _ in columns], extrasaction="ignore")
+        self.writer.writeheader()
+
+    def write(self, row):
+        self.writer.writerow({k: _json_default(v) if isinstance(v, datetime) else v for k, v in row.items()})
+
+    def close(self, count):
+        pass
+
+
+WRITERS = {"table": TableWriter, "json": JsonWriter, "csv": CsvWriter}
+
+
+def _json_default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+
+def stream(conn, stmt, batch_size):
+    """Yield result rows as dicts through a server-side cursor (yield_per)."""
+    result = conn.execution_options(stream_results=True, yield_per=batch_size).execute(stmt)
+    for row in result.mappings():
+        yield dict(row)
+
+
+def emit(rows, columns, fmt):
+    writer = WRITERS[fmt](columns)
+    count = 0
+    for row in rows:
+        writer.write(row)
+        count += 1
+    writer.close(count)
+    return count
+
+
+def show_users(args):
+    from sqlalchemy import func, select
+    from database import engine
+    from models import Task, User, UserSession
+    from models.types import utcnow
+
+    # 유저마다 COUNT 서브쿼리를 돌리지 않고, 한 번씩 GROUP BY 한 결과를 조인
+    task_counts = (
+        select(Task.user_id, func.count(Task.id).label("task_count"))
+        .group_by(Task.user_id)
+        .subquery()
+    )
+    session_counts = (
+        select(UserSession.user_id, func.count().label("session_count"))
+        .where(UserSession.expires_at > utcnow())
+        .group_by(UserSession.user_id)
+        .subquery()
+    )
+    stmt = (
+        select(
+            User.id,
+            User.name,
+            User.mail,
+            func.coalesce(task_counts.c.task_count, 0).label("task_count"),
+            func.coalesce(session_counts.c.session_count, 0).label("session_count"),
+        )
+        .outerjoin(task_counts, task_counts.c.user_id == User.id)
+        .outerjoin(session_counts, session_counts.c.user_id == User.id)
+        .order_by(User.name, User.id)
+    )
+    if args.limit:
+        stmt = stmt.limit(args.limit)
+
+    columns = [
+        ("id", "ID", 38), ("name", "이름", 15), ("mail", "이메일", 28),
+        ("task_count", "태스크수", 8), ("session_count", "세션수", 6),
+    ]
+    if args.format == "table":
+        print("=== 등록된 유저 목록 ===")
+    with engine.connect() as conn:
+        emit(stream(conn, stmt, args.batch_size), columns, args.format)
+
+
+def _task_statement(args, user_id=None):
+    from sqlalchemy import select
+    from models import Task, User
+
+    stmt = (
+        select(
+            Task.id, Task.title, Task.status, Task.priority, Task.due_date,
+            User.name.label("user_name"), Task.created_at,
+        )
+        .outerjoin(User, User.id == Task.user_id)
+        .order_by(Task.id)
+    )
+    if user_id:
+        stmt = stmt.where(Task.user_id == user_id)
+    if args.after_id:
+        stmt = stmt.where(Task.id > args.after_id)
+    if args.limit:
+        stmt = stmt.limit(args.limit)
+    return stmt
+
+
+TASK_COLUMNS = [
+    ("id", "ID", 6), ("title", "제목", 24), ("status", "상태", 12), ("priority", "우선도", 6),
+    ("user_name", "유저", 15), ("due_date", "마감", 16), ("created_at", "생성일", 16),
+]
+
+
+def show_tasks(args, user_id=None):
+    from database import engine
+
+    if args.format == "table":
+        print("=== 모든 태스크 목록 ===")
+    with engine.connect() as conn:
+        count = emit(stream(conn, _task_statement(args, user_id or args.user), args.batch_size), TASK_COLUMNS, args.format)
+    if args.format == "table" and args.limit and count == args.limit:
+        print(f"다음 페이지: --after-id <마지막 ID> --limit {args.limit}")
+
+
+def show_user_tasks(args):
+    from sqlalchemy import select
+    from database import engine
+    from models import User
+
+    with engine.connect() as conn:
+        user = conn.execute(select(User.name, User.mail).where(User.id == args.user_id)).first()
     if not user:
-        print(f"유저 ID '{user_id}'를 찾을 수 없습니다.")
-        conn.close()
+        print(f"유저 ID '{args.user_id}'를 찾을 수 없습니다.")
         return
-    
-    name, mail = user
-    print(f"=== {name} ({mail})의 태스크 목록 ===")
-    
-    cursor.execute("""
-        SELECT id, title, description, status, priority, due_date, created_at 
-        FROM tasks 
-        WHERE user_id = ? 
-        ORDER BY created_at DESC
-    """, (user_id,))
-    
-    tasks = cursor.fetchall()
-    if not tasks:
-        print("태스크가 없습니다.")
-    else:
-        print(f"{'ID':<4} {'제목':<25} {'상태':<12} {'우선도':<6} {'생성일'}")
-        print("-" * 60)
-        for task in tasks:
-            task_id, title, desc, status, priority, due_date, created_at = task
-            title_short = (title[:22] + "...") if len(title) > 25 else title
-            created_short = created_at[:10] if created_at else ""
-            print(f"{task_id:<4} {title_short:<25} {status:<12} {priority:<6} {created_short}")
-    
-    conn.close()
-
-def clean_anonymous_users():
-    conn = connect_db()
-    cursor = conn.cursor()
-    
-    # 익명 유저들의 태스크 삭제
-    cursor.execute("DELETE FROM tasks WHERE user_id IN (SELECT id FROM user_table WHERE name LIKE '익명사용자_%')")
-    deleted_tasks = cursor.rowcount
-    
-    # 익명 유저들 삭제
-    cursor.execute("DELETE FROM user_table WHERE name LIKE '익명사용자_%'")
-    deleted_users = cursor.rowcount
-    
-    conn.commit()
-    conn.close()
-    
+    if args.format == "table":
+        print(f"=== {user.name} ({user.mail})의 태스크 목록 ===")
+    with engine.connect() as conn:
+        emit(stream(conn, _task_statement(args, args.user_id), args.batch_size), TASK_COLUMNS, args.format)
+
+
+def clean_anonymous_users(args):
+    from sqlalchemy import delete, func, select
+    from database import engine
+    from models import Tag, Task, TaskActivity, User, UserSession, task_tags
+
+    anon_ids = select(User.id).where(User.mail.like(ANON_MAIL_PATTERN, escape="\\"))
+    deleted_users = deleted_tasks = 0
+    with engine.connect() as conn:
+        if args.dry_run:
+            users = conn.execute(select(func.count()).select_from(anon_ids.subquery())).scalar()
+            tasks = conn.execute(select(func.count(Task.id)).where(Task.user_id.in_(anon_ids))).scalar()
+            print(f"[dry-run] 삭제 대상: 익명 유저 {users}명, 태스크 {tasks}개")
+            return
+
+        # 한 번에 지우면 큰 DB 에서 락이 길어지므로 유저 단위 배치로 나눠서 커밋
+        while True:
+            batch = conn.execute(anon_ids.order_by(User.id).limit(args.batch_size)).scalars().all()
+            if not batch:
+                break
+            conn.execute(delete(task_tags).where(task_tags.c.tag_id.in_(select(Tag.id).where(Tag.user_id.in_(batch)))))
+            conn.execute(delete(Tag).where(Tag.user_id.in_(batch)))
+            deleted_tasks += conn.execute(delete(Task).where(Task.user_id.in_(batch))).rowcount
+            conn.execute(delete(UserSession).where(UserSession.user_id.in_(batch)))
+            conn.execute(delete(TaskActivity).where(TaskActivity.user_id.in_(batch)))
+            deleted_users += conn.execute(delete(User).where(User.id.in_(batch))).rowcount
+            conn.commit()
     print(f"정리 완료: 익명 유저 {deleted_users}명, 태스크 {deleted_tasks}개 삭제")
 
-def show_stats():
-    conn = connect_db()
-    cursor = conn.cursor()
-    
+
+def show_stats(args):
+    from sqlalchemy import case, func, select
+    from database import engine
+    from models import Task, User
+
+    with engine.connect() as conn:
+        is_anon = User.mail.like(ANON_MAIL_PATTERN, escape="\\")
+        total_users, anon_users = conn.execute(
+            select(func.count(User.id), func.coalesce(func.sum(case((is_anon, 1), else_=0)), 0))
+        ).one()
+        by_status = conn.execute(select(Task.status, func.count()).group_by(Task.status).order_by(Task.status)).all()
+
+    total_tasks = sum(count for _, count in by_status)
+    stats = {
+        "users": {"total": total_users, "anonymous": anon_users, "registered": total_users - anon_users},
+        "tasks": {"total": total_tasks, "by_status": {status: count for status, count in by_status}},
+    }
+    if args.format == "json":
+        print(json.dumps(stats, ensure_ascii=False, indent=2))
+        return
+    if args.format == "csv":
+        emit(
+            ({"status": status, "count": count} for status, count in by_status),
+            [("status", "status", 0), ("count", "count", 0)],
+            "csv",
+        )
+        return
+
     print("=== 데이터베이스 통계 ===")
-    
-    # 유저 통계
-    cursor.execute("SELECT COUNT(*) FROM user_table")
-    total_users = cursor.fetchone()[0]
-    
-    cursor.execute("SELECT COUNT(*) FROM user_table WHERE name LIKE '익명사용자_%'")
-    anon_users = cursor.fetchone()[0]
-    
-    # 태스크 통계
-    cursor.execute("SELECT COUNT(*) FROM tasks")
-    total_tasks = cursor.fetchone()[0]
-    
-    cursor.execute("SELECT status, COUNT(*) FROM tasks GROUP BY status")
-    task_stats = cursor.fetchall()
-    
     print(f"총 유저: {total_users}명 (익명: {anon_users}명, 등록: {total_users - anon_users}명)")
     print(f"총 태스크: {total_tasks}개")
-    
     print("\n태스크 상태별 분포:")
-    for status, count in task_stats:
+    for status, count in by_status:
         print(f"  {status}: {count}개")
-    
-    conn.close()
+
+
+def set_admin(args):
+    from sqlalchemy import delete, or_, select
+    from database import SessionLocal
+    from models import Role, User
+    from models.role import ADMIN_ROLE
+
+    db = SessionLocal()
+    try:
+        user = db.execute(
+            select(User).where(or_(User.mail == args.user, User.id == args.user))
+        ).scalars().first()
+        if not user:
+            print(f"유저 '{args.user}'를 찾을 수 없습니다.")
+            return
+        label = f"{user.name} ({user.mail})"
+        if args.grant:
+            role = db.get(Role, user.id) or Role(user_id=user.id)
+            role.admin_role = ADMIN_ROLE
+            db.add(role)
+        else:
+            db.execute(delete(Role).where(Role.user_id == user.id))
+        db.commit()
+    finally:
+        db.close()
+    print(f"{label}: 관리자 권한을 {'부여' if args.grant else '회수'}했습니다.")
+
+
+def build_parser():
+    # 옵션은 명령어 앞/뒤 어디에 써도 되도록 하위 명령에도 붙임 (SUPPRESS 로 상위 기본값 유지)
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--database-url", default=argparse.SUPPRESS)
+    common.add_argument("--format", choices=sorted(WRITERS), default=argparse.SUPPRESS)
+    common.add_argument("--batch-size", type=int, default=argparse.SUPPRESS)
+    common.add_argument("--limit", type=int, default=argparse.SUPPRESS)
+    common.add_argument("--after-id", type=int, default=argparse.SUPPRESS)
+
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter, parents=[common]
+    )
+    parser.set_defaults(database_url=None, format="table", batch_size=1000, limit=None, after_id=None)
+    sub = parser.add_subparsers(dest="command")
+
+    sub.add_parser("users", parents=[common]).set_defaults(func=show_users)
+    tasks = sub.add_parser("tasks", parents=[common])
+    tasks.add_argument("--user", default=None)
+    tasks.set_defaults(func=show_tasks)
+    user = sub.add_parser("user", parents=[common])
+    user.add_argument("user_id")
+    user.set_defaults(func=show_user_tasks)
+    clean = sub.add_parser("clean", parents=[common])
+    clean.add_argument("--dry-run", action="store_true")
+    clean.set_defaults(func=clean_anonymous_users)
+    sub.add_parser("stats", parents=[common]).set_defaults(func=show_stats)
+    grant = sub.add_parser("grant-admin", parents=[common])
+    grant.add_argument("user", help="mail or user id")
+    grant.set_defaults(func=set_admin, grant=True)
+    revoke = sub.add_parser("revoke-admin", parents=[common])
+    revoke.add_argument("user", help="mail or user id")
+    revoke.set_defaults(func=set_admin, grant=False)
+    return parser
+
 
 def main():
-    if len(sys.argv) < 2:
+    parser = build_parser()
+    args = parser.parse_args()
+    if not getattr(args, "func", None):
         print(__doc__)
         return
-    
-    command = sys.argv[1].lower()
-    
-    if command == "users":
-        show_users()
-    elif command == "tasks":
-        show_tasks()
-    elif command == "user" and len(sys.argv) > 2:
-        show_user_tasks(sys.argv[2])
-    elif command == "clean":
-        clean_anonymous_users()
-    elif command == "stats":
-        show_stats()
-    else:
-        print(__doc__)
+    _bootstrap(args.database_url)
+    args.func(args)
+
 
 if __name__ == "__main__":
     main()
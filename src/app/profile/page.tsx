@@ -51,6 +51,29 @@ export default function ProfilePage() {
     }
   }
 
+  async function uploadAvatar(file: File) {
+    setMsg(null);
+    const form = new FormData();
+    form.append("file", file);
+    try {
+      const res = await authFetch("/api/users/me/avatar", { method: "POST", body: form });
+      if (res.ok) {
+        const profile = await res.json();
+        setAvatarUrl(profile.avatar_url || "");
+        if (user) {
+          setUser({ ...user, avatar_url: profile.avatar_url || undefined });
+        }
+        setMsg("プロフィール画像を更新しました");
+      } else {
+        const errorData = await res.json().catch(() => ({}));
+        setMsg(`アップロードに失敗しました: ${errorData.detail || 'Unknown error'}`);
+      }
+    } catch (error) {
+      console.error('Avatar upload error:', error);
+      setMsg("アップロードに失敗しました: ネットワークエラー");
+    }
+  }
+
   async function changePassword() {
     setMsg(null);
     if (!currentPassword || !newPassword) {
@@ -122,6 +145,10 @@ export default function ProfilePage() {
                 ? 'bg-white border-gray-300 text-gray-900 placeholder-gray-500' 
                 : 'bg-gray-800 border-gray-600 text-white placeholder-gray-400'
             }`} placeholder="https://example.com/avatar.jpg" value={avatarUrl} onChange={(e)=>setAvatarUrl(e.target.value)} />
+            <label className={`text-sm block mb-1 ${theme === 'light' ? 'text-gray-600' : 'text-white/70'}`}>または画像をアップロード（JPEG / PNG / WebP / GIF、5MB まで）</label>
+            <input type="file" accept="image/jpeg,image/png,image/webp,image/gif" className={`block w-full mb-4 text-sm ${
+              theme === 'light' ? 'text-gray-700' : 'text-white/80'
+            }`} onChange={(e)=>{ const file = e.target.files?.[0]; if (file) uploadAvatar(file); e.target.value = ""; }} />
             <button onClick={saveProfile} className={`rounded px-3 py-2 ${
               theme === 'light' 
                 ? 'bg-blue-600 hover:bg-blue-700 text-white' 
@@ -4,7 +4,7 @@ import { useEffect, useMemo, useState, useCallback } from "react";
 import ModernDropdown from '@/components/ModernDropdown';
 import SimpleDateTimePicker from '@/components/SimpleDateTimePicker';
 import { Task } from '@/types/task';
-import { parseLocalDateTime, formatDateTimeJa } from '@/lib/date';
+import { parseServerDateTime, formatDateTimeJa, localInputToUtcIso } from '@/lib/date';
 import { authFetch } from '@/lib/auth';
 import { useRouter } from 'next/navigation';
 import { useAuth } from "@/contexts/AuthContext";
@@ -34,6 +34,8 @@ export default function TaskListClient() {
   const [newPriority, setNewPriority] = useState<number>(3);
   const [newDueDate, setNewDueDate] = useState("");
   const [isGridView, setIsGridView] = useState(false);
+  // manual ordering (drag & drop)
+  const [dragId, setDragId] = useState<number | null>(null);
 
   const hasForm = useMemo(() => newTitle.trim().length > 0, [newTitle]);
 
@@ -83,7 +85,7 @@ export default function TaskListClient() {
     const tomorrow = new Date(today.getTime() + 24 * 60 * 60 * 1000);
     return tasks.filter(t => {
       if (!t.due_date || t.status === 'done') return false;
-      const dueDate = parseLocalDateTime(t.due_date) ?? new Date(t.due_date);
+      const dueDate = parseServerDateTime(t.due_date) ?? new Date(t.due_date);
       return dueDate <= tomorrow;
     });
   }, [tasks]);
@@ -92,7 +94,7 @@ export default function TaskListClient() {
   const getTimeUntilDue = (dueDate: string | null) => {
     if (!dueDate) return null;
     const now = new Date();
-    const parsed = parseLocalDateTime(dueDate);
+    const parsed = parseServerDateTime(dueDate);
     const due = parsed ?? new Date(dueDate);
     const diffMs = due.getTime() - now.getTime();
     const diffHours = Math.floor(diffMs / (1000 * 60 * 60));
@@ -142,7 +144,7 @@ export default function TaskListClient() {
         description: newDescription.trim() || null,
         status: "todo",
         priority: Number(newPriority) || 3,
-        due_date: newDueDate || null,
+        due_date: localInputToUtcIso(newDueDate || null),
       };
       const res = await authFetch(`${API_BASE}/tasks/`, {
         method: "POST",
@@ -185,6 +187,33 @@ export default function TaskListClient() {
     }
   }
 
+  // Drop `dragged` onto `target`'s slot. Only the dragged task's rank changes on the server.
+  async function moveTask(draggedId: number, targetId: number) {
+    if (draggedId === targetId) return;
+    const from = tasks.findIndex((t) => t.id === draggedId);
+    const to = tasks.findIndex((t) => t.id === targetId);
+    if (from < 0 || to < 0) return;
+    const next = [...tasks];
+    const [dragged] = next.splice(from, 1);
+    next.splice(to, 0, dragged);
+    const after = next[to - 1];
+    const before = next[to + 1];
+    setTasks(next);
+    try {
+      const res = await authFetch(`${API_BASE}/tasks/${draggedId}/move`, {
+        method: "PATCH",
+        headers: { "Content-Type": "application/json" },
+        body: JSON.stringify({ after_id: after?.id ?? null, before_id: before?.id ?? null }),
+      });
+      if (!res.ok) throw new Error(`並び替え失敗: ${res.status}`);
+      const updated = (await res.json()) as Task;
+      setTasks((current) => current.map((t) => (t.id === updated.id ? updated : t)));
+    } catch (e: any) {
+      alert(e?.message ?? "並び替え失敗");
+      await load();
+    }
+  }
+
   // swipe helper
   function useSwipe(onDelete: () => void) {
     let startX = 0;
@@ -346,7 +375,8 @@ export default function TaskListClient() {
                 { value: "due_asc", label: "期限(早い順)" },
                 { value: "due_desc", label: "期限(遅い順)" },
                 { value: "priority_asc", label: "優先度(低→高)" },
-                { value: "priority_desc", label: "優先度(高→低)" }
+                { value: "priority_desc", label: "優先度(高→低)" },
+                { value: "manual", label: "手動(ドラッグで並び替え)" }
               ]}
               value={sort}
               onChange={setSort}
@@ -427,8 +457,16 @@ export default function TaskListClient() {
       <div className={isGridView ? "grid grid-cols-1 sm:grid-cols-2 lg:grid-cols-3 gap-4" : "grid gap-4"}>
         {tasks.map((t) => {
           const swipe = useSwipe(() => deleteTaskById(t.id, t.title));
+          const manual = sort === "manual";
           return (
-            <div key={t.id} className={`swipe-wrapper ${isGridView ? 'grid-view-card' : ''}`} onMouseDown={swipe.onMouseDown} onTouchStart={swipe.onTouchStart}>
+            <div key={t.id} className={`swipe-wrapper ${isGridView ? 'grid-view-card' : ''} ${manual ? 'cursor-move' : ''} ${dragId === t.id ? 'opacity-50' : ''}`}
+              onMouseDown={manual ? undefined : swipe.onMouseDown}
+              onTouchStart={manual ? undefined : swipe.onTouchStart}
+              draggable={manual}
+              onDragStart={manual ? () => setDragId(t.id) : undefined}
+              onDragOver={manual ? (e) => e.preventDefault() : undefined}
+              onDrop={manual ? (e) => { e.preventDefault(); if (dragId !== null) moveTask(dragId, t.id); setDragId(null); } : undefined}
+              onDragEnd={manual ? () => setDragId(null) : undefined}>
               <div className="swipe-delete-bg">
                 <span className="text-white text-lg swipe-delete-icon">🗑️ 削除</span>
               </div>
@@ -458,7 +496,7 @@ export default function TaskListClient() {
                   }`}>
                     <div>優先度: {t.priority}</div>
                     <div>作成日: {new Date(t.created_at).toLocaleString('ja-JP', { year: 'numeric', month: 'short', day: 'numeric', hour: '2-digit', minute: '2-digit' })}</div>
-                    {t.due_date && (() => { const d = parseLocalDateTime(t.due_date) ?? new Date(t.due_date); return (<div>期限: {formatDateTimeJa(d)}</div>); })()}
+                    {t.due_date && (() => { const d = parseServerDateTime(t.due_date) ?? new Date(t.due_date); return (<div>期限: {formatDateTimeJa(d)}</div>); })()}
                   </div>
                   <div className="flex gap-2 flex-wrap">
                     {t.status === "todo" && (
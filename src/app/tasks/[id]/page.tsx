@@ -1,5 +1,5 @@
 import { Task } from '@/types/task';
-import { parseLocalDateTime, formatDateTimeJa } from '@/lib/date';
+import { parseServerDateTime, formatDateTimeJa } from '@/lib/date';
 
 async function loadTask(id: string): Promise<Task | null> {
   const res = await fetch(`/api/tasks/${id}`, { cache: "no-store" });
@@ -20,7 +20,7 @@ export default async function TaskDetail({ params }: { params: Promise<{ id: str
       <div className="grid gap-2 text-sm px-1">
         <div>状態: {task.status}</div>
         <div>優先度: {task.priority}</div>
-        <div>期限: {(() => { const d = parseLocalDateTime(task.due_date) ?? (task.due_date ? new Date(task.due_date) : null); return formatDateTimeJa(d); })()}</div>
+        <div>期限: {(() => { const d = parseServerDateTime(task.due_date) ?? (task.due_date ? new Date(task.due_date) : null); return formatDateTimeJa(d); })()}</div>
         <div>作成日: {new Date(task.created_at).toLocaleString('ja-JP', { year: 'numeric', month: 'short', day: 'numeric', hour: '2-digit', minute: '2-digit' })}</div>
         <div>更新日: {new Date(task.updated_at).toLocaleString('ja-JP', { year: 'numeric', month: 'short', day: 'numeric', hour: '2-digit', minute: '2-digit' })}</div>
       </div>
@@ -90,8 +90,9 @@ export async function authFetch(input: RequestInfo | URL, init: RequestInit = {}
   }
   
   // 세션 ID를 Authorization 헤더로 전송 (CORS 환경에서 더 안정적)
+  // FormData (파일 업로드) 는 브라우저가 boundary 를 포함한 Content-Type 을 직접 붙이도록 비워 둠
   const headers: Record<string, string> = {
-    'Content-Type': 'application/json',
+    ...(init.body instanceof FormData ? {} : { 'Content-Type': 'application/json' }),
     ...(init.headers as Record<string, string>)
   };
   
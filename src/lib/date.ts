@@ -6,6 +6,22 @@ export function parseLocalDateTime(input: string | null): Date | null {
   return new Date(Number(yy), Number(mm) - 1, Number(dd), Number(hh), Number(mi));
 }
 
+// Server timestamps are UTC ISO strings ("...Z"); older naive values fall back to local parsing.
+export function parseServerDateTime(input: string | null): Date | null {
+  if (!input) return null;
+  if (/(Z|[+-]\d{2}:?\d{2})$/.test(input)) {
+    const d = new Date(input);
+    return Number.isNaN(d.getTime()) ? null : d;
+  }
+  return parseLocalDateTime(input);
+}
+
+// "YYYY-MM-DDTHH:MM" in the browser's timezone -> UTC ISO string for the API.
+export function localInputToUtcIso(input: string | null): string | null {
+  const d = parseLocalDateTime(input);
+  return d ? d.toISOString() : null;
+}
+
 export function formatDateTimeJa(date: Date | null): string {
   if (!date) return "-";
   return date.toLocaleString('ja-JP', {
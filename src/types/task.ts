@@ -6,8 +6,16 @@ export interface Task {
   description: string | null;
   status: TaskStatus;
   priority: number;
-  due_date: string | null; // local datetime string "YYYY-MM-DDTHH:MM" or ISO from server
-  created_at: string; // ISO
-  updated_at: string; // ISO
+  due_date: string | null; // UTC ISO string from server ("...Z")
+  created_at: string; // UTC ISO
+  updated_at: string; // UTC ISO
+  version: number; // send back as If-Match on PATCH
+  rank: string | null; // manual order key (sort=manual, ascending)
+  tags: string[]; // tag names, sorted
+  parent_id: number | null; // parent task (subtask) or null for top level
+  subtasks_total: number; // direct subtasks
+  subtasks_done: number; // direct subtasks that are done
+  recurrence: string | null; // RRULE subset, e.g. "FREQ=WEEKLY;BYDAY=MO,FR;TZID=Asia/Tokyo"
+  is_occurrence?: boolean; // expanded future occurrence of a recurring task (id = series)
 }
 